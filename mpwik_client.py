@@ -4,21 +4,397 @@ MPWiK Wrocław CLI Client
 Main command-line interface for fetching water consumption data from MPWiK Wrocław e-BOK system.
 """
 
+import hashlib
+import importlib
 import logging
 import json
-from datetime import datetime, timedelta
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+import os
+import time as time_module
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# orjson serializes --output files much faster than the stdlib; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Last second of a day, used as the inclusive end bound of date ranges
+END_OF_DAY = time(23, 59, 59)
+
+# Authenticated sessions are cached between runs to skip login and reCAPTCHA
+SESSION_CACHE_DIR = Path.home() / ".cache" / "mpwik"
+SESSION_CACHE_TTL = 30 * 60  # seconds
+
+# Network point numbers are listed as '0123/2021' but used as '0123-2021' in URLs
+_SLASH_TO_DASH = str.maketrans('/', '-')
+
+# Backend clients are imported on first use: Selenium and Playwright are heavy
+# and only the backend selected with --method is needed for a run
+_LAZY_IMPORTS = {
+    'MPWiKBrowserClient': ('mpwik_selenium', 'MPWiKBrowserClient'),
+    'MPWikPlaywrightClient': ('mpwik_playwright', 'MPWikPlaywrightClient'),
+    'MPWiKClient': ('mpwik_direct', 'MPWiKClient'),
+}
+
+
+def _load_client(name: str):
+    """
+    Import a backend client class and cache it in the module namespace.
+    
+    Args:
+        name: Class name from _LAZY_IMPORTS
+    
+    Returns:
+        The client class
+    
+    Raises:
+        ImportError: If the backend's optional dependencies are not installed
+    """
+    if name in globals():
+        return globals()[name]
+    module_name, attr = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def __getattr__(name):
+    """Resolve backend client classes lazily (PEP 562)."""
+    if name in _LAZY_IMPORTS:
+        return _load_client(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _ClientAdapter:
+    """
+    Uniform view of a backend client for the shared CLI pipeline.
+    
+    The direct and Selenium clients expose the same reading methods;
+    subclasses adapt backends with a different API.
+    """
+    
+    def __init__(self, client, podmiot_id: str, formatter):
+        """
+        Args:
+            client: Authenticated backend client
+            podmiot_id: Podmiot ID to fetch data for
+            formatter: Object providing print_readings / print_punkty_sieci,
+                or None to skip printing (--quiet)
+        """
+        self.client = client
+        self.podmiot_id = podmiot_id
+        self.formatter = formatter
+    
+    def get_points(self) -> Optional[List[Dict]]:
+        """Get network points (punkty sieci) for the account."""
+        return self.client.get_punkty_sieci(self.podmiot_id)
+    
+    def get_daily(self, punkt_sieci: str, date_from: datetime, date_to: datetime) -> Optional[List[Dict]]:
+        """Get daily readings for a network point."""
+        return self.client.get_daily_readings(self.podmiot_id, punkt_sieci, date_from, date_to)
+    
+    def get_hourly(self, punkt_sieci: str, date_from: datetime, date_to: datetime) -> Optional[List[Dict]]:
+        """Get hourly readings for a network point."""
+        return self.client.get_hourly_readings(self.podmiot_id, punkt_sieci, date_from, date_to)
+    
+    def get_batch(self, punkt_sieci: str, queries: List[Tuple[str, datetime, datetime]]) -> List[Optional[List[Dict]]]:
+        """
+        Fetch several (reading_type, date_from, date_to) ranges at once.
+        
+        Returns:
+            Readings (or None) per query, in query order
+        """
+        if len(queries) == 1:
+            return [self._fetch_one(punkt_sieci, *queries[0])]
+        return self.client.get_readings_batch(self.podmiot_id, punkt_sieci, queries)
+    
+    def _fetch_one(self, punkt_sieci: str, reading_type: str, date_from: datetime, date_to: datetime) -> Optional[List[Dict]]:
+        """Fetch a single range with the per-type method."""
+        fetch = self.get_daily if reading_type == 'daily' else self.get_hourly
+        return fetch(punkt_sieci, date_from, date_to)
+
+
+class _PlaywrightAdapter(_ClientAdapter):
+    """Adapter for MPWikPlaywrightClient, which takes the API reading type names."""
+    
+    def get_points(self) -> Optional[List[Dict]]:
+        return self.client.get_points()
+    
+    def get_daily(self, punkt_sieci: str, date_from: datetime, date_to: datetime) -> Optional[List[Dict]]:
+        return self.client.get_readings(punkt_sieci, 'dobowe', date_from, date_to)
+    
+    def get_hourly(self, punkt_sieci: str, date_from: datetime, date_to: datetime) -> Optional[List[Dict]]:
+        return self.client.get_readings(punkt_sieci, 'godzinowe', date_from, date_to)
+    
+    def get_batch(self, punkt_sieci: str, queries: List[Tuple[str, datetime, datetime]]) -> List[Optional[List[Dict]]]:
+        api_queries = [
+            ('dobowe' if reading_type == 'daily' else 'godzinowe', date_from, date_to)
+            for reading_type, date_from, date_to in queries
+        ]
+        return self.client.get_readings_batch(punkt_sieci, api_queries)
+
+
+def _save_json(payload, path: Optional[str], label: str):
+    """
+    Save a JSON payload to the --output file, logging the outcome.
+    
+    Args:
+        payload: Data to serialize
+        path: Output file path; nothing is written if not set
+        label: What is being saved, used in log messages (e.g. "Results")
+    """
+    if not path:
+        return
+    
+    try:
+        if orjson is not None:
+            with open(path, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+        logger.info("%s saved to %s", label, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.error("Failed to save %s: %s", label.lower(), e)
+
+
+def _session_cache_file(args) -> Optional[Path]:
+    """
+    Get the session cache file for this login and method, dropping it if expired.
+    
+    Args:
+        args: Parsed command-line arguments
+    
+    Returns:
+        Path of the cache file (which may not exist yet), or None if caching is disabled
+    """
+    if args.no_session_cache:
+        return None
+    
+    # The file is named after a hash of the login rather than the login itself,
+    # with one file per backend because each stores its session in its own format
+    digest = hashlib.sha1(args.login.encode('utf-8')).hexdigest()
+    path = SESSION_CACHE_DIR / f"{digest}-{args.method}.json"
+    try:
+        if time_module.time() - path.stat().st_mtime > SESSION_CACHE_TTL:
+            logger.info("Saved session expired, it will not be reused")
+            path.unlink()
+    except FileNotFoundError:
+        pass
+    return path
+
+
+def _load_session(path: Optional[Path]) -> Optional[Dict]:
+    """Load a cached session state, or None if there is none."""
+    if path is None or not path.exists():
+        return None
+    
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read saved session: %s", e)
+        return None
+
+
+def _save_session(path: Optional[Path], state: Dict):
+    """Save session state to the cache, readable only by the current user."""
+    if path is None:
+        return
+    
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        logger.debug("Session saved to: %s", path)
+    except OSError as e:
+        logger.warning("Could not save session: %s", e)
+
+
+def _pick_first_punkt(punkty: Optional[List[Dict]]) -> Optional[str]:
+    """
+    Pick the first available network point in API path format.
+    
+    Args:
+        punkty: Network points as returned by the backend
+    
+    Returns:
+        Network point ID (e.g. '0123-2021'), or None if there are none
+    """
+    if not punkty:
+        return None
+    
+    # Convert format from '0123/2021' to '0123-2021' for API compatibility
+    punkt_sieci = punkty[0].get('numer', '').translate(_SLASH_TO_DASH)
+    logger.info("Using first available network point: %s", punkt_sieci)
+    logger.info("Address: %s", punkty[0].get('adres', 'N/A'))
+    return punkt_sieci
+
+
+def _run_pipeline(adapter: _ClientAdapter, args, date_from: datetime, date_to: datetime) -> int:
+    """
+    List network points or fetch, print and save readings with an authenticated client.
+    
+    Args:
+        adapter: Adapter wrapping the authenticated backend client
+        args: Parsed command-line arguments
+        date_from: Start date
+        date_to: End date
+    
+    Returns:
+        Process exit code
+    """
+    # Handle list punkty sieci request
+    if args.list_punkty_sieci:
+        punkty = adapter.get_points()
+        if punkty:
+            if adapter.formatter:
+                adapter.formatter.print_punkty_sieci(punkty)
+            _save_json({'punkty': punkty}, args.output, "Network points")
+        return 0
+    
+    # Auto-fetch punkt-sieci if not provided
+    punkt_sieci = args.punkt_sieci
+    if not punkt_sieci:
+        logger.info("No --punkt-sieci provided, fetching available network points...")
+        punkt_sieci = _pick_first_punkt(adapter.get_points())
+        if not punkt_sieci:
+            logger.error("No network points available for this account")
+            return 1
+    
+    queries = []
+    if args.type in ['daily', 'both']:
+        queries.append(('daily', date_from, date_to))
+    
+    if args.type in ['hourly', 'both']:
+        # For hourly, limit to smaller time ranges to avoid too much data
+        if args.type == 'hourly':
+            queries.append(('hourly', date_from, date_to))
+        else:
+            # If fetching both, only get hourly for last day
+            queries.append(('hourly', date_to.replace(hour=0, minute=0, second=0), date_to))
+    
+    # Fetch all requested reading types in one batch (a single browser
+    # round-trip for Selenium when fetching both)
+    results = {}
+    for (reading_type, _, _), readings in zip(queries, adapter.get_batch(punkt_sieci, queries)):
+        if readings:
+            if adapter.formatter:
+                adapter.formatter.print_readings(readings, reading_type)
+            results[reading_type] = readings
+    
+    _save_json(results, args.output, "Results")
+    
+    return 0
+
+
+def _run_selenium(args, date_from: datetime, date_to: datetime) -> int:
+    """Run the CLI pipeline with Selenium browser automation."""
+    try:
+        MPWiKBrowserClient = _load_client('MPWiKBrowserClient')
+    except ImportError:
+        logger.error("Selenium client not available. Install Selenium: uv sync --extra selenium")
+        return 1
+    
+    logger.info("Using Selenium browser automation mode")
+    
+    with MPWiKBrowserClient(
+        login=args.login,
+        password=args.password,
+        headless=args.headless,
+        log_dir=args.log_dir,
+        debug=args.debug,
+        session_file=_session_cache_file(args),
+        podmiot_id=args.podmiot_id
+    ) as client:
+        if not client.authenticate():
+            logger.error("Authentication failed. Exiting.")
+            return 1
+        
+        # Browser backends print through MPWiKClient's static table helpers
+        formatter = None if args.quiet else _load_client('MPWiKClient')
+        adapter = _ClientAdapter(client, args.podmiot_id, formatter)
+        exit_code = _run_pipeline(adapter, args, date_from, date_to)
+        logger.info("Browser logs saved to: %s", client.log_dir)
+        return exit_code
+
+
+def _run_playwright(args, date_from: datetime, date_to: datetime) -> int:
+    """Run the CLI pipeline with Playwright browser automation."""
+    try:
+        MPWikPlaywrightClient = _load_client('MPWikPlaywrightClient')
+    except ImportError:
+        logger.error("Playwright client not available. Install Playwright: uv sync --extra playwright && playwright install")
+        return 1
+    
+    logger.info("Using Playwright browser automation mode")
+    
+    with MPWikPlaywrightClient(
+        login=args.login,
+        password=args.password,
+        headless=args.headless,
+        browser_type='chromium',
+        state_path=_session_cache_file(args)
+    ) as client:
+        client.login_and_establish_session()
+        
+        formatter = None if args.quiet else _load_client('MPWiKClient')
+        adapter = _PlaywrightAdapter(client, args.podmiot_id, formatter)
+        return _run_pipeline(adapter, args, date_from, date_to)
+
+
+def _run_direct(args, date_from: datetime, date_to: datetime) -> int:
+    """Run the CLI pipeline against the API directly."""
+    logger.info("Using API mode")
+    
+    MPWiKClient = _load_client('MPWiKClient')
+    
+    # Create client and authenticate
+    try:
+        client = MPWiKClient(
+            args.login, 
+            args.password, 
+            args.capmonster_api_key,
+            args.recaptcha_version,
+            debug=args.debug,
+            log_dir=args.log_dir,
+            http2=args.http2
+        )
+    except ImportError:
+        logger.error("HTTP/2 support not available. Install httpx: uv sync --extra http2")
+        return 1
+    
+    try:
+        session_file = _session_cache_file(args)
+        saved_session = _load_session(session_file)
+        if not (saved_session and client.restore_session(saved_session, args.podmiot_id)):
+            if not client.authenticate():
+                logger.error("Authentication failed. Exiting.")
+                return 1
+            _save_session(session_file, client.export_session())
+        
+        # The direct client formats its own output
+        formatter = None if args.quiet else client
+        return _run_pipeline(_ClientAdapter(client, args.podmiot_id, formatter), args, date_from, date_to)
+    finally:
+        client.close()
+
+
+# --method choice -> backend runner
+_BACKENDS = {
+    'selenium': _run_selenium,
+    'playwright': _run_playwright,
+    'direct': _run_direct,
+}
 
-def main():
-    """Main function for command-line usage."""
+
+def _build_parser():
+    """Build the command-line argument parser."""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -57,6 +433,11 @@ def main():
         '--output',
         help='Output file path (JSON format)'
     )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Do not print readings or network points to stdout (useful with --output)'
+    )
     parser.add_argument(
         '--method',
         type=str,
@@ -64,15 +445,18 @@ def main():
         default='selenium',
         help="The connection method to use: 'direct' (API), 'selenium', or 'playwright' (browser automation). Default: selenium"
     )
-    parser.add_argument(
+    headless_group = parser.add_mutually_exclusive_group()
+    headless_group.add_argument(
         '--headless',
+        dest='headless',
         action='store_true',
         default=True,
         help='Run browser in headless mode when using browser automation methods (default: True)'
     )
-    parser.add_argument(
+    headless_group.add_argument(
         '--no-headless',
-        action='store_true',
+        dest='headless',
+        action='store_false',
         help='Run browser with visible window when using browser automation methods (for manual reCAPTCHA solving)'
     )
     parser.add_argument(
@@ -89,49 +473,60 @@ def main():
         choices=[2, 3],
         help='Preferred ReCAPTCHA version (2 or 3). If not specified, tries v3 first then v2 as fallback'
     )
+    parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Fetch readings over HTTP/2 (direct method, requires the http2 extra)'
+    )
+    parser.add_argument(
+        '--force-browser-list',
+        action='store_true',
+        help='Keep using the browser for --list-punkty-sieci even when --capmonster-api-key allows direct API mode'
+    )
+    parser.add_argument(
+        '--no-session-cache',
+        action='store_true',
+        help=f'Do not reuse or save the authenticated session (cached in {SESSION_CACHE_DIR} for {SESSION_CACHE_TTL // 60} minutes)'
+    )
     parser.add_argument(
         '--debug',
         action='store_true',
         help='Enable debug logging'
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def _resolve_dates(args) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Resolve the requested date range from command-line arguments.
     
-    # Default podmiot_id to login if not provided
-    if not args.podmiot_id:
-        args.podmiot_id = args.login
-        logger.info(f"No --podmiot-id provided, using login value: {args.podmiot_id}")
+    Args:
+        args: Parsed command-line arguments
     
-    # Set logging level based on debug flag
-    if args.debug:
-        logging.getLogger().setLevel(logging.DEBUG)
-        logger.setLevel(logging.DEBUG)
-        logger.debug("Debug logging enabled")
-    
-    # Parse dates
+    Returns:
+        (date_from, date_to) tuple, or None if the range is invalid
+    """
+    # Parse dates (read the clock once; only the calendar day matters)
+    today_end = datetime.combine(date.today(), END_OF_DAY)
+    yesterday_end = today_end - timedelta(days=1)
     if args.date_from:
-        date_from = datetime.strptime(args.date_from, '%Y-%m-%d').replace(
-            hour=0, minute=0, second=0
-        )
+        date_from = datetime.combine(date.fromisoformat(args.date_from), time.min)
         # For hourly readings, if date_from is specified but date_to is not,
         # automatically set date_to to the same day to avoid API errors
         if args.type == 'hourly' and not args.date_to:
             date_to = date_from.replace(hour=23, minute=59, second=59)
-            logger.info(f"Hourly readings: Using single day {date_from.strftime('%Y-%m-%d')}")
+            logger.info("Hourly readings: Using single day %s", date_from.date())
         elif args.date_to:
-            date_to = datetime.strptime(args.date_to, '%Y-%m-%d').replace(
-                hour=23, minute=59, second=59
-            )
+            date_to = datetime.combine(date.fromisoformat(args.date_to), END_OF_DAY)
         else:
-            date_to = datetime.now().replace(hour=23, minute=59, second=59)
+            date_to = today_end
     else:
         # No date_from specified
         if args.date_to:
-            date_to = datetime.strptime(args.date_to, '%Y-%m-%d').replace(
-                hour=23, minute=59, second=59
-            )
+            date_to = datetime.combine(date.fromisoformat(args.date_to), END_OF_DAY)
         else:
-            date_to = datetime.now().replace(hour=23, minute=59, second=59)
+            date_to = today_end
         
         # For hourly readings, default to yesterday only (1 day back) because
         # hourly data is not available for the current day
@@ -139,7 +534,7 @@ def main():
         # For daily readings, use the --days parameter (default 7)
         if args.type == 'hourly':
             # For hourly: yesterday only (from 00:00:00 yesterday to 23:59:59 yesterday)
-            date_to = (datetime.now() - timedelta(days=1)).replace(hour=23, minute=59, second=59)
+            date_to = yesterday_end
             date_from = date_to.replace(hour=0, minute=0, second=0)
         else:
             # For daily: use --days parameter
@@ -150,329 +545,59 @@ def main():
     # Validation: For hourly readings, ensure both dates are the same day
     if args.type == 'hourly':
         if date_from.date() != date_to.date():
-            logger.error(f"Hourly readings require single day request. Got: {date_from.date()} to {date_to.date()}")
+            logger.error("Hourly readings require single day request. Got: %s to %s", date_from.date(), date_to.date())
             logger.error("For hourly data, use: --date-from YYYY-MM-DD (without --date-to)")
             logger.error("Or specify same day for both: --date-from YYYY-MM-DD --date-to YYYY-MM-DD")
-            return 1
-        logger.info(f"Fetching hourly readings for: {date_from.strftime('%Y-%m-%d')}")
-    
-    # Choose client based on --method argument
-    if args.method in ['selenium', 'playwright']:
-        # Use browser automation
-        if args.method == 'selenium':
-            try:
-                from mpwik_selenium import MPWiKBrowserClient
-            except ImportError:
-                logger.error("Selenium client not available. Install Selenium: uv sync --extra selenium")
-                return 1
-            
-            logger.info("Using Selenium browser automation mode")
-            headless = args.headless and not args.no_headless
-            
-            with MPWiKBrowserClient(
-                login=args.login,
-                password=args.password,
-                headless=headless,
-                log_dir=args.log_dir,
-                debug=args.debug
-            ) as client:
-                if not client.authenticate():
-                    logger.error("Authentication failed. Exiting.")
-                    return 1
-                
-                # Handle list punkty sieci request
-                if args.list_punkty_sieci:
-                    # Use browser client's get_punkty_sieci method
-                    punkty = client.get_punkty_sieci(args.podmiot_id)
-                    if punkty:
-                        # Use MPWiKClient for formatting only
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_punkty_sieci(punkty)
-                        
-                        # Save to file if requested
-                        if args.output:
-                            try:
-                                with open(args.output, 'w', encoding='utf-8') as f:
-                                    json.dump({'punkty': punkty}, f, indent=2, ensure_ascii=False)
-                                logger.info(f"Network points saved to {args.output}")
-                            except Exception as e:
-                                logger.error(f"Failed to save network points: {e}")
-                    logger.info(f"Browser logs saved to: {client.log_dir}")
-                    return 0
-                
-                # Auto-fetch punkt-sieci if not provided
-                punkt_sieci = args.punkt_sieci
-                if not punkt_sieci:
-                    logger.info("No --punkt-sieci provided, fetching available network points...")
-                    punkty = client.get_punkty_sieci(args.podmiot_id)
-                    if punkty and len(punkty) > 0:
-                        # Use the first available punkt-sieci
-                        # Convert format from '0123/2021' to '0123-2021' for API compatibility
-                        punkt_sieci = punkty[0].get('numer', '').replace('/', '-')
-                        logger.info(f"Using first available network point: {punkt_sieci}")
-                        logger.info(f"Address: {punkty[0].get('adres', 'N/A')}")
-                    else:
-                        logger.error("No network points available for this account")
-                        return 1
-                
-                results = {}
-                
-                # Fetch daily readings
-                if args.type in ['daily', 'both']:
-                    daily_readings = client.get_daily_readings(
-                        args.podmiot_id,
-                        punkt_sieci,
-                        date_from,
-                        date_to
-                    )
-                    
-                    if daily_readings:
-                        # Use the print_readings method from MPWiKClient
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_readings(daily_readings, "daily")
-                        results['daily'] = daily_readings
-                
-                # Fetch hourly readings
-                if args.type in ['hourly', 'both']:
-                    # For hourly, limit to smaller time ranges to avoid too much data
-                    if args.type == 'hourly':
-                        hourly_date_from = date_from
-                        hourly_date_to = date_to
-                    else:
-                        # If fetching both, only get hourly for last day
-                        hourly_date_from = date_to.replace(hour=0, minute=0, second=0)
-                        hourly_date_to = date_to
-                    
-                    hourly_readings = client.get_hourly_readings(
-                        args.podmiot_id,
-                        punkt_sieci,
-                        hourly_date_from,
-                        hourly_date_to
-                    )
-                    
-                    if hourly_readings:
-                        # Use the print_readings method from MPWiKClient
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_readings(hourly_readings, "hourly")
-                        results['hourly'] = hourly_readings
-                
-                # Save to file if requested
-                if args.output:
-                    try:
-                        with open(args.output, 'w', encoding='utf-8') as f:
-                            json.dump(results, f, indent=2, ensure_ascii=False)
-                        logger.info(f"Results saved to {args.output}")
-                    except Exception as e:
-                        logger.error(f"Failed to save results: {e}")
-                
-                logger.info(f"Browser logs saved to: {client.log_dir}")
-        
-        elif args.method == 'playwright':
-            try:
-                from mpwik_playwright import MPWikPlaywrightClient
-            except ImportError:
-                logger.error("Playwright client not available. Install Playwright: uv sync --extra playwright && playwright install")
-                return 1
-            
-            logger.info("Using Playwright browser automation mode")
-            headless = args.headless and not args.no_headless
-            
-            with MPWikPlaywrightClient(
-                login=args.login,
-                password=args.password,
-                headless=headless,
-                browser_type='chromium'
-            ) as client:
-                client.login_and_establish_session()
-                
-                # Handle list punkty sieci request
-                if args.list_punkty_sieci:
-                    # Use playwright client's get_points method
-                    punkty = client.get_points()
-                    if punkty:
-                        # Use MPWiKClient for formatting only
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_punkty_sieci(punkty)
-                        
-                        # Save to file if requested
-                        if args.output:
-                            try:
-                                with open(args.output, 'w', encoding='utf-8') as f:
-                                    json.dump({'punkty': punkty}, f, indent=2, ensure_ascii=False)
-                                logger.info(f"Network points saved to {args.output}")
-                            except Exception as e:
-                                logger.error(f"Failed to save network points: {e}")
-                    return 0
-                
-                # Auto-fetch punkt-sieci if not provided
-                punkt_sieci = args.punkt_sieci
-                if not punkt_sieci:
-                    logger.info("No --punkt-sieci provided, fetching available network points...")
-                    punkty = client.get_points()
-                    if punkty and len(punkty) > 0:
-                        # Use the first available punkt-sieci
-                        # Convert format from '0123/2021' to '0123-2021' for API compatibility
-                        punkt_sieci = punkty[0].get('numer', '').replace('/', '-')
-                        logger.info(f"Using first available network point: {punkt_sieci}")
-                        logger.info(f"Address: {punkty[0].get('adres', 'N/A')}")
-                    else:
-                        logger.error("No network points available for this account")
-                        return 1
-                
-                results = {}
-                
-                # Fetch daily or hourly readings
-                if args.type in ['daily', 'both']:
-                    daily_readings = client.get_readings(
-                        punkt_sieci,
-                        'dobowe',
-                        date_from,
-                        date_to
-                    )
-                    
-                    if daily_readings:
-                        # Use the print_readings method from MPWiKClient
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_readings(daily_readings, "daily")
-                        results['daily'] = daily_readings
-                
-                # Fetch hourly readings
-                if args.type in ['hourly', 'both']:
-                    # For hourly, limit to smaller time ranges to avoid too much data
-                    if args.type == 'hourly':
-                        hourly_date_from = date_from
-                        hourly_date_to = date_to
-                    else:
-                        # If fetching both, only get hourly for last day
-                        hourly_date_from = date_to.replace(hour=0, minute=0, second=0)
-                        hourly_date_to = date_to
-                    
-                    hourly_readings = client.get_readings(
-                        punkt_sieci,
-                        'godzinowe',
-                        hourly_date_from,
-                        hourly_date_to
-                    )
-                    
-                    if hourly_readings:
-                        # Use the print_readings method from MPWiKClient
-                        from mpwik_direct import MPWiKClient
-                        api_client = MPWiKClient(args.login, args.password)
-                        api_client.print_readings(hourly_readings, "hourly")
-                        results['hourly'] = hourly_readings
-                
-                # Save to file if requested
-                if args.output:
-                    try:
-                        with open(args.output, 'w', encoding='utf-8') as f:
-                            json.dump(results, f, indent=2, ensure_ascii=False)
-                        logger.info(f"Results saved to {args.output}")
-                    except Exception as e:
-                        logger.error(f"Failed to save results: {e}")
-    
-    else:  # args.method == 'direct'
-        # Use API mode
-        logger.info("Using API mode")
-        
-        from mpwik_direct import MPWiKClient
-        
-        # Create client and authenticate
-        client = MPWiKClient(
-            args.login, 
-            args.password, 
-            args.capmonster_api_key,
-            args.recaptcha_version,
-            debug=args.debug,
-            log_dir=args.log_dir
+            return None
+        logger.info("Fetching hourly readings for: %s", date_from.date())
+    
+    return date_from, date_to
+
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Main function for command-line usage.
+    
+    Args:
+        argv: Arguments to parse (default: sys.argv[1:])
+    """
+    # Configure logging for command-line use (library imports leave this to the caller)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
         )
-        
-        if not client.authenticate():
-            logger.error("Authentication failed. Exiting.")
-            return 1
-        
-        # Handle list punkty sieci request
-        if args.list_punkty_sieci:
-            punkty = client.get_punkty_sieci(args.podmiot_id)
-            if punkty:
-                client.print_punkty_sieci(punkty)
-                
-                # Save to file if requested
-                if args.output:
-                    try:
-                        with open(args.output, 'w', encoding='utf-8') as f:
-                            json.dump({'punkty': punkty}, f, indent=2, ensure_ascii=False)
-                        logger.info(f"Network points saved to {args.output}")
-                    except Exception as e:
-                        logger.error(f"Failed to save network points: {e}")
-            return 0
-        
-        # Auto-fetch punkt-sieci if not provided
-        punkt_sieci = args.punkt_sieci
-        if not punkt_sieci:
-            logger.info("No --punkt-sieci provided, fetching available network points...")
-            punkty = client.get_punkty_sieci(args.podmiot_id)
-            if punkty and len(punkty) > 0:
-                # Use the first available punkt-sieci
-                # Convert format from '0123/2021' to '0123-2021' for API compatibility
-                punkt_sieci = punkty[0].get('numer', '').replace('/', '-')
-                logger.info(f"Using first available network point: {punkt_sieci}")
-                logger.info(f"Address: {punkty[0].get('adres', 'N/A')}")
-            else:
-                logger.error("No network points available for this account")
-                return 1
-        
-        results = {}
-        
-        # Fetch daily readings
-        if args.type in ['daily', 'both']:
-            daily_readings = client.get_daily_readings(
-                args.podmiot_id,
-                punkt_sieci,
-                date_from,
-                date_to
-            )
-            
-            if daily_readings:
-                client.print_readings(daily_readings, "daily")
-                results['daily'] = daily_readings
-        
-        # Fetch hourly readings
-        if args.type in ['hourly', 'both']:
-            # For hourly, limit to smaller time ranges to avoid too much data
-            if args.type == 'hourly':
-                hourly_date_from = date_from
-                hourly_date_to = date_to
-            else:
-                # If fetching both, only get hourly for last day
-                hourly_date_from = date_to.replace(hour=0, minute=0, second=0)
-                hourly_date_to = date_to
-            
-            hourly_readings = client.get_hourly_readings(
-                args.podmiot_id,
-                punkt_sieci,
-                hourly_date_from,
-                hourly_date_to
-            )
-            
-            if hourly_readings:
-                client.print_readings(hourly_readings, "hourly")
-                results['hourly'] = hourly_readings
-        
-        # Save to file if requested
-        if args.output:
-            try:
-                with open(args.output, 'w', encoding='utf-8') as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
-                logger.info(f"Results saved to {args.output}")
-            except Exception as e:
-                logger.error(f"Failed to save results: {e}")
     
-    return 0
+    args = _build_parser().parse_args(argv)
+    
+    # Default podmiot_id to login if not provided
+    if not args.podmiot_id:
+        args.podmiot_id = args.login
+        logger.info("No --podmiot-id provided, using login value: %s", args.podmiot_id)
+    
+    # Listing meters is a single JSON API call: when a CapMonster key lets the
+    # direct client get past reCAPTCHA, skip starting a browser for it
+    if (args.list_punkty_sieci and args.method in ('selenium', 'playwright')
+            and args.capmonster_api_key and not args.force_browser_list):
+        logger.info(
+            "Listing network points only: switching from --method %s to direct API mode "
+            "(pass --force-browser-list to keep the browser)", args.method
+        )
+        args.method = 'direct'
+    
+    # Set logging level based on debug flag
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+        logger.setLevel(logging.DEBUG)
+        logger.debug("Debug logging enabled")
+    
+    dates = _resolve_dates(args)
+    if dates is None:
+        return 1
+    date_from, date_to = dates
+    
+    return _BACKENDS[args.method](args, date_from, date_to)
 
 
 if __name__ == '__main__':
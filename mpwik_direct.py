@@ -4,33 +4,199 @@ MPWiK Wrocław Direct API Client
 Client for fetching water consumption data from MPWiK Wrocław e-BOK system using direct API calls.
 """
 
+import copy
+import inspect
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import random
 import re
 import time
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# ijson parses readings incrementally while the body downloads; optional
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson decodes API responses and writes debug logs faster than the stdlib; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# httpx multiplexes concurrent reading requests over one HTTP/2 connection; optional
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
+# CSRF token patterns in the login page HTML, in order of preference, fused
+# into one alternation (one capture group per alternative) to scan the page once
+CSRF_PATTERN = re.compile('|'.join((
+    r'<meta[^>]*name=["\']csrf["\'][^>]*content=["\']([^"\']+)["\']',  # MPWiK specific: name="csrf"
+    r'<meta[^>]*name=["\']csrf-token["\'][^>]*content=["\']([^"\']+)["\']',
+    r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\']csrf-token["\']',
+    r'csrf["\']?\s*:\s*["\']([^"\']+)["\']',
+    r'X-CSRF-TOKEN["\']?\s*:\s*["\']([^"\']+)["\']',
+)), re.IGNORECASE)
+
+# ReCAPTCHA site key patterns in the login page HTML, in order of preference
+SITEKEY_PATTERN = re.compile('|'.join((
+    r'<meta\s+name=["\']recaptcha\.site\.key["\']\s+content=["\']([^"\']+)["\']',  # MPWiK specific
+    r'data-sitekey=["\']([^"\']+)["\']',
+    r'sitekey["\']?\s*:\s*["\']([^"\']+)["\']',
+    r'grecaptcha\.execute\(["\']([^"\']+)["\']',
+    r'render["\']?\s*:\s*["\']([^"\']+)["\']',
+)), re.IGNORECASE)
+
+# Anything that looks like a ReCAPTCHA site key (last resort)
+GENERIC_SITEKEY_PATTERN = re.compile(r'6[A-Za-z0-9_-]{39}')
+
+# Characters replaced when turning a URL into a log filename
+_URL_FILENAME_TABLE = str.maketrans({'/': '_', ':': '_'})
+
+# Request headers masked in the debug request logs (compared lowercased)
+_SENSITIVE_HEADERS = frozenset(('cookie', 'authorization', 'x-recaptcha-token'))
+
+# Row formats for the printed tables, parsed once
+_READING_ROW = "{:<20} {:<15} {:<15.3f} {:<15.3f} {:<10}".format
+_POINT_ROW = "{:<12} {:<15} {:<40} {:<10} {:<20}".format
+
+
+def _search_preferred(pattern: re.Pattern, text: str) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Scan text once with a fused alternation and pick the most preferred match.
+    
+    Each alternative has exactly one capture group, so the matched group index
+    is the alternative's rank; earlier alternatives win over earlier positions.
+    
+    Args:
+        pattern: Compiled alternation of single-group patterns
+        text: Text to scan
+    
+    Returns:
+        Tuple of (captured value, 1-based alternative number), or (None, None)
+    """
+    best_value, best_rank = None, None
+    for match in pattern.finditer(text):
+        rank = match.lastindex
+        if best_rank is None or rank < best_rank:
+            best_value, best_rank = match.group(rank), rank
+            if rank == 1:
+                break
+    return best_value, best_rank
+
+
+def _response_json(response: requests.Response):
+    """
+    Decode a JSON response body, with orjson when it is installed.
+    
+    Args:
+        response: Response with a JSON body
+    
+    Returns:
+        Decoded JSON value
+    
+    Raises:
+        requests.exceptions.InvalidJSONError: If the body is not valid JSON
+    """
+    if orjson is None:
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Same exception type response.json() raises
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+def _read_prefix(response: requests.Response, limit: int) -> str:
+    """
+    Read and decode at most limit bytes of a streamed response body.
+    
+    The connection is released afterwards, discarding the unread remainder.
+    
+    Args:
+        response: Response fetched with stream=True
+        limit: Maximum number of (decompressed) bytes to read
+    
+    Returns:
+        Decoded body prefix
+    """
+    chunks = []
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=limit):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= limit:
+                break
+    finally:
+        response.close()
+    return b''.join(chunks)[:limit].decode('utf-8', errors='replace')
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Header value, either delta-seconds or an HTTP-date
+    
+    Returns:
+        Seconds to wait (never negative), or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
 
 class MPWiKClient:
     """Client for MPWiK Wrocław API."""
     
     BASE_URL = "https://ebok.mpwik.wroc.pl/frontend-api/v1"
     SITE_URL = "https://ebok.mpwik.wroc.pl"
+    # Upper bound on concurrent requests in get_readings_batch() and get_readings_bulk()
+    MAX_PARALLEL_REQUESTS = 4
+    CAPMONSTER_URL = "https://api.capmonster.cloud"
+    # Give up polling CapMonster after this many seconds (token validity window)
+    RECAPTCHA_SOLVE_TIMEOUT = 120
+    # Solves rarely finish sooner, so the first result poll waits this long
+    RECAPTCHA_FIRST_POLL_DELAY = 3.0
+    # Only this much of the login page is scanned; the CSRF and site key tags live in <head>
+    LOGIN_PAGE_SCAN_BYTES = 32768
+    # Seconds a fetched network points list is reused by get_punkty_sieci()
+    POINTS_CACHE_TTL = 300.0
+    # Seconds a fetched readings list is reused for an identical request,
+    # and the most such lists kept
+    READINGS_CACHE_TTL = 30.0
+    READINGS_CACHE_SIZE = 128
     
     def __init__(self, login: str, password: str, recaptcha_api_key: Optional[str] = None, 
-                 recaptcha_version: Optional[int] = None, debug: bool = False, log_dir: Optional[str] = None):
+                 recaptcha_version: Optional[int] = None, debug: bool = False, log_dir: Optional[str] = None,
+                 retry_base_delay: float = 1.0, retry_max_delay: float = 30.0, retry_jitter: float = 0.5,
+                 http2: bool = False):
         """
         Initialize the MPWiK client.
         
@@ -41,6 +207,13 @@ class MPWiKClient:
             recaptcha_version: Optional preferred ReCAPTCHA version (2 or 3). If None, tries v3 first then v2.
             debug: Enable debug mode (saves request/response logs to files)
             log_dir: Directory to save logs (default: ./logs)
+            retry_base_delay: Initial delay in seconds between login retries, doubled per retry
+            retry_max_delay: Upper bound in seconds for the login retry delay
+            retry_jitter: Random extra fraction (0..jitter) added to each retry delay
+            http2: Fetch readings over HTTP/2 with httpx (requires the http2 extra)
+        
+        Raises:
+            ImportError: If http2 is requested but httpx is not installed
         """
         self.login = login
         self.password = password
@@ -48,21 +221,91 @@ class MPWiKClient:
         self.recaptcha_version = recaptcha_version
         self.debug = debug
         self.log_dir = log_dir or "./logs"
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.retry_jitter = retry_jitter
+        # (podmiot_id, status) -> (fetched at, network points)
+        self._points_cache: Dict[Tuple[str, str], Tuple[float, List[Dict]]] = {}
+        # Identical concurrent reading requests share one fetch: request key ->
+        # in-flight future, and request key -> (fetched at, readings)
+        self._readings_lock = threading.Lock()
+        self._readings_inflight: Dict[tuple, Future] = {}
+        self._readings_cache: Dict[tuple, Tuple[float, List[Dict]]] = {}
+        # Fixed endpoint URLs, built once
+        self._login_url = f"{self.BASE_URL}/login"
+        self._site_login_url = f"{self.SITE_URL}/login"
+        self._session_info_url = f"{self.BASE_URL}/session/info"
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
             'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
             'Origin': self.SITE_URL,
-            'Referer': f'{self.SITE_URL}/login',
+            'Referer': self._site_login_url,
             'DNT': '1',
             'Sec-Fetch-Dest': 'empty',
             'Sec-Fetch-Mode': 'cors',
             'Sec-Fetch-Site': 'same-origin'
         })
+        # Keep-alive pool sized for the get_readings_batch() and get_readings_bulk()
+        # workers. Gateway errors and connection resets on idempotent GETs are
+        # retried with short backoff; 429 and 500 are not, so they are not retried
+        # on top of authenticate()'s own attempts. Retry-After is not honoured here,
+        # as urllib3 would sleep for whatever the server asks; the capped
+        # _sleep_for_retry_after() handles it. The login POST is not retried here:
+        # its ReCAPTCHA token is single-use, so authenticate() retries it
+        self.session.mount(self.SITE_URL, HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self.MAX_PARALLEL_REQUESTS,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(['GET']),
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
+        ))
         self.token = None
         self.csrf_token = None
         self.recaptcha_token = None
+        
+        # Optional HTTP/2 client for the reading GETs: concurrent batch requests
+        # share one multiplexed TLS connection. It uses the requests session's
+        # cookie jar directly and takes its headers per request, so login and
+        # restore_session() need no syncing
+        if http2 and httpx is None:
+            raise ImportError("HTTP/2 support requires httpx: pip install 'httpx[http2]'")
+        self._http2_client = (
+            httpx.Client(http2=True, cookies=self.session.cookies, timeout=30.0)
+            if http2 else None
+        )
+        
+        # Separate keep-alive session for CapMonster polling, so the task
+        # create and result polls reuse one TLS connection without sending
+        # the e-BOK headers and cookies to a third party
+        self._capmonster_session = requests.Session()
+        self._capmonster_session.mount(
+            self.CAPMONSTER_URL, HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        )
+        
+        # Event loop and CapMonster client library instance, created on the
+        # first v2 solve and reused across authenticate() retries
+        self._loop = None
+        self._capmonster_client = None
+        
+        # Single background writer for debug request logs, so file I/O and
+        # JSON serialization stay off the request path (FIFO, joined at exit)
+        self._log_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="mpwik-log") if debug else None
+        )
+        # Request log directory, resolved and created once
+        self._request_log_dir = Path(self.log_dir) / "requests"
+        if debug:
+            try:
+                self._request_log_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.error(f"Failed to create request log directory: {e}")
     
     def _save_request_log(self, request_type: str, url: str, method: str, 
                           headers: dict, payload: Optional[dict], response: Optional[requests.Response]):
@@ -82,23 +325,17 @@ class MPWiKClient:
             return
         
         try:
-            # Create log directory if it doesn't exist
-            log_dir = Path(self.log_dir) / "requests"
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
             # Generate filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             # Sanitize URL for filename
-            url_part = url.replace("https://", "").replace("http://", "").replace("/", "_")
+            url_part = url.removeprefix("https://").removeprefix("http://").translate(_URL_FILENAME_TABLE)
             filename = f"{timestamp}_{method}_{url_part}_{request_type}.json"
-            filepath = log_dir / filename
+            filepath = self._request_log_dir / filename
             
-            # Sanitize payload (remove password)
-            sanitized_payload = None
-            if payload:
-                sanitized_payload = payload.copy()
-                if 'password' in sanitized_payload:
-                    sanitized_payload['password'] = '***'
+            # Sanitize payload (mask password) without mutating the caller's dict
+            sanitized_payload = {
+                k: ('***' if k == 'password' else v) for k, v in payload.items()
+            } if payload else None
             
             # Build log data
             log_data = {
@@ -106,7 +343,9 @@ class MPWiKClient:
                 "request_type": request_type,
                 "url": url,
                 "method": method,
-                "headers": dict(headers),
+                "headers": {
+                    k: ('***' if k.lower() in _SENSITIVE_HEADERS else v) for k, v in headers.items()
+                },
                 "payload": sanitized_payload
             }
             
@@ -125,15 +364,78 @@ class MPWiKClient:
                 except:
                     log_data["response"]["body_text"] = response.text[:500] if response.text else None
             
-            # Write to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(log_data, f, indent=2, ensure_ascii=False)
+            # Write to file in the background
+            self._log_executor.submit(self._write_request_log, filepath, log_data)
+        
+        except Exception as e:
+            logger.error(f"Failed to save request log: {e}")
+    
+    @staticmethod
+    def _write_request_log(filepath: Path, log_data: Dict):
+        """
+        Write a request log entry to disk (runs on the log writer thread).
+        
+        Args:
+            filepath: Target log file
+            log_data: Log entry to serialize
+        """
+        try:
+            if orjson is not None:
+                filepath.write_bytes(orjson.dumps(log_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(log_data, f, indent=2, ensure_ascii=False)
             
-            logger.debug(f"Request log saved to: {filepath}")
+            logger.debug("Request log saved to: %s", filepath)
             
         except Exception as e:
             logger.error(f"Failed to save request log: {e}")
     
+    def flush_logs(self):
+        """Block until all queued debug request logs have been written."""
+        if self._log_executor is not None:
+            self._log_executor.submit(lambda: None).result()
+    
+    def close(self):
+        """Write pending request logs and release the sessions, HTTP/2 client and event loop."""
+        if self._log_executor is not None:
+            self._log_executor.shutdown(wait=True)
+            self._log_executor = None
+        if self._loop is not None and not self._loop.is_closed():
+            # The CapMonster client's HTTP session lives on this loop
+            self._close_capmonster_client()
+            self._loop.close()
+        self._loop = None
+        self._capmonster_client = None
+        if self._http2_client is not None:
+            self._http2_client.close()
+            self._http2_client = None
+        self._capmonster_session.close()
+        self.session.close()
+    
+    def _close_capmonster_client(self):
+        """Close the CapMonster client's HTTP session on the still-open event loop."""
+        client, self._capmonster_client = self._capmonster_client, None
+        try:
+            if client is not None:
+                close = getattr(client, 'close', None) or getattr(getattr(client, 'session', None), 'close', None)
+                if close is not None:
+                    result = close()
+                    if inspect.isawaitable(result):
+                        self._loop.run_until_complete(result)
+            self._loop.run_until_complete(self._loop.shutdown_asyncgens())
+        except Exception as e:
+            logger.debug("Error closing CapMonster client: %s", e)
+    
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+        return False
+    
     def solve_recaptcha(self, site_key: str, recaptcha_version: int = 3) -> Optional[str]:
         """
         Solve ReCAPTCHA using CapMonster Cloud service.
@@ -171,18 +473,14 @@ class MPWiKClient:
             
             logger.info(f"Attempting to solve ReCAPTCHA v{recaptcha_version} using CapMonster client...")
             logger.info(f"ReCAPTCHA site key: {site_key}")
-            logger.debug(f"Target URL: {self.SITE_URL}/login")
+            logger.debug("Target URL: %s", self._site_login_url)
             
             # Get the User-Agent from session headers
             # This is critical: CapMonster must use the same User-Agent that will be used
             # in the actual login request to avoid token validation failures
             user_agent = self.session.headers.get('User-Agent', 
                 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36')
-            logger.debug(f"Using User-Agent for CapMonster: {user_agent}")
-            
-            # Create CapMonster client
-            client_options = ClientOptions(api_key=self.recaptcha_api_key)
-            cap_monster_client = CapMonsterClient(options=client_options)
+            logger.debug("Using User-Agent for CapMonster: %s", user_agent)
             
             # Create request based on version
             if recaptcha_version == 3:
@@ -193,23 +491,29 @@ class MPWiKClient:
             else:
                 # ReCAPTCHA v2 - supports userAgent parameter
                 recaptcha_request = RecaptchaV2Request(
-                    websiteUrl=f"{self.SITE_URL}/login",
+                    websiteUrl=self._site_login_url,
                     websiteKey=site_key,
                     userAgent=user_agent  # Pass User-Agent to match login request
                 )
                 
                 logger.debug("Solving ReCAPTCHA v2 with CapMonster client...")
                 
-                # Solve captcha asynchronously
-                async def solve():
-                    return await cap_monster_client.solve_captcha(recaptcha_request)
+                # Create the loop and CapMonster client once, so retries reuse
+                # the client's HTTP session instead of rebuilding it per call
+                if self._loop is None or self._loop.is_closed():
+                    self._loop = asyncio.new_event_loop()
+                if self._capmonster_client is None:
+                    client_options = ClientOptions(api_key=self.recaptcha_api_key)
+                    self._capmonster_client = CapMonsterClient(options=client_options)
                 
-                response = asyncio.run(solve())
+                response = self._loop.run_until_complete(
+                    self._capmonster_client.solve_captcha(recaptcha_request)
+                )
                 
                 if response and 'gRecaptchaResponse' in response:
                     token = response['gRecaptchaResponse']
                     logger.info("ReCAPTCHA solved successfully")
-                    logger.debug(f"Token length: {len(token)} characters")
+                    logger.debug("Token length: %s characters", len(token))
                     return token
                 else:
                     logger.error(f"Unexpected response from CapMonster: {response}")
@@ -241,39 +545,25 @@ class MPWiKClient:
                 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36')
             
             # CapMonster API endpoint
-            capmonster_url = "https://api.capmonster.cloud/createTask"
+            capmonster_url = f"{self.CAPMONSTER_URL}/createTask"
             
-            # Create task based on version
+            # Create task based on version; v3 adds score and action
+            task = {
+                "type": "RecaptchaV3TaskProxyless" if recaptcha_version == 3 else "NoCaptchaTaskProxyless",
+                "websiteURL": self._site_login_url,
+                "websiteKey": site_key,
+                "userAgent": user_agent  # Pass User-Agent to match login request
+            }
             if recaptcha_version == 3:
-                task_payload = {
-                    "clientKey": self.recaptcha_api_key,
-                    "task": {
-                        "type": "RecaptchaV3TaskProxyless",
-                        "websiteURL": f"{self.SITE_URL}/login",
-                        "websiteKey": site_key,
-                        "minScore": 0.7,
-                        "pageAction": "login",
-                        "userAgent": user_agent  # Pass User-Agent to match login request
-                    }
-                }
-            else:
-                # ReCAPTCHA v2
-                task_payload = {
-                    "clientKey": self.recaptcha_api_key,
-                    "task": {
-                        "type": "NoCaptchaTaskProxyless",
-                        "websiteURL": f"{self.SITE_URL}/login",
-                        "websiteKey": site_key,
-                        "userAgent": user_agent  # Pass User-Agent to match login request
-                    }
-                }
+                task.update(minScore=0.7, pageAction="login")
+            task_payload = {"clientKey": self.recaptcha_api_key, "task": task}
             
-            logger.debug(f"Creating ReCAPTCHA task at {capmonster_url}")
-            response = requests.post(capmonster_url, json=task_payload)
+            logger.debug("Creating ReCAPTCHA task at %s", capmonster_url)
+            response = self._capmonster_session.post(capmonster_url, json=task_payload)
             response.raise_for_status()
             task_data = response.json()
             
-            logger.debug(f"CapMonster createTask response: {task_data}")
+            logger.debug("CapMonster createTask response: %s", task_data)
             
             if task_data.get("errorId") != 0:
                 logger.error(f"CapMonster error: {task_data.get('errorDescription')}")
@@ -283,38 +573,45 @@ class MPWiKClient:
             task_id = task_data.get("taskId")
             logger.info(f"ReCAPTCHA task created: {task_id}")
             
-            # Poll for result
-            result_url = "https://api.capmonster.cloud/getTaskResult"
-            max_attempts = 60  # 60 attempts * 2 seconds = 120 seconds (2 minutes)
+            # Poll for result: CapMonster has no long-poll, so one delayed first
+            # request replaces the early polls that would only see "processing",
+            # then back off from 0.5 s to the 2 s maximum
+            result_url = f"{self.CAPMONSTER_URL}/getTaskResult"
+            deadline = time.monotonic() + self.RECAPTCHA_SOLVE_TIMEOUT
+            attempt = 0
             
-            for attempt in range(max_attempts):
-                time.sleep(2)
+            while time.monotonic() < deadline:
+                if attempt == 0:
+                    time.sleep(self.RECAPTCHA_FIRST_POLL_DELAY)
+                else:
+                    time.sleep(min(2.0, 0.5 * (1.5 ** (attempt - 1))))
+                attempt += 1
                 
                 result_payload = {
                     "clientKey": self.recaptcha_api_key,
                     "taskId": task_id
                 }
                 
-                logger.debug(f"Polling ReCAPTCHA result (attempt {attempt + 1}/{max_attempts})...")
-                result_response = requests.post(result_url, json=result_payload)
+                logger.debug("Polling ReCAPTCHA result (attempt %s)...", attempt)
+                result_response = self._capmonster_session.post(result_url, json=result_payload)
                 result_response.raise_for_status()
                 result_data = result_response.json()
                 
                 status = result_data.get("status")
-                logger.info(f"ReCAPTCHA status: {status} (attempt {attempt + 1}/{max_attempts})")
+                logger.info(f"ReCAPTCHA status: {status} (attempt {attempt})")
                 
                 if status == "ready":
                     token = result_data.get("solution", {}).get("gRecaptchaResponse")
                     if token:
                         logger.info("ReCAPTCHA solved successfully")
-                        logger.debug(f"Token length: {len(token)} characters")
+                        logger.debug("Token length: %s characters", len(token))
                         return token
                     else:
                         logger.error("ReCAPTCHA marked as ready but no token in response")
                         logger.error(f"Full response: {result_data}")
                         return None
                 elif status == "processing":
-                    logger.debug(f"ReCAPTCHA solving in progress...")
+                    logger.debug("ReCAPTCHA solving in progress...")
                 else:
                     logger.error(f"Unexpected ReCAPTCHA status: {status}")
                     logger.error(f"Full response: {result_data}")
@@ -322,7 +619,7 @@ class MPWiKClient:
                         logger.error(f"Error: {result_data.get('errorDescription')}")
                     return None
             
-            logger.error(f"ReCAPTCHA solving timeout after {max_attempts * 2} seconds")
+            logger.error(f"ReCAPTCHA solving timeout after {self.RECAPTCHA_SOLVE_TIMEOUT} seconds")
             return None
             
         except Exception as e:
@@ -352,10 +649,10 @@ class MPWiKClient:
             if recaptcha_token:
                 login_headers['X-RECAPTCHA-TOKEN'] = recaptcha_token
                 logger.info("Using ReCAPTCHA token for authentication (in X-RECAPTCHA-TOKEN header)")
-                logger.debug(f"ReCAPTCHA token (first 20 chars): {recaptcha_token[:20]}...")
+                logger.debug("ReCAPTCHA token (first 20 chars): %s...", recaptcha_token[:20])
             
             # Prepare login payload - only login and password (verified from browser logs)
-            url = f"{self.BASE_URL}/login"
+            url = self._login_url
             payload = {
                 "login": self.login,
                 "password": self.password
@@ -363,29 +660,28 @@ class MPWiKClient:
             
             # Log detailed request information
             logger.info("Attempting to authenticate...")
-            logger.debug(f"POST {url}")
-            logger.debug(f"Payload: {json.dumps({'login': self.login, 'password': '***'})}")
-            logger.debug(f"Headers: {list(login_headers.keys())}")
-            logger.debug(f"Session cookies: {list(self.session.cookies.keys())}")
-            
-            # Merge session headers with login-specific headers to ensure all headers are sent
-            # This explicitly includes Origin and Referer from session headers
-            temp_headers = self.session.headers.copy()
-            temp_headers.update(login_headers)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("POST %s", url)
+                logger.debug("Payload: %s", json.dumps({'login': self.login, 'password': '***'}))
+                logger.debug("Headers: %s", list(login_headers.keys()))
+                logger.debug("Session cookies: %s", list(self.session.cookies.keys()))
             
-            response = self.session.post(url, json=payload, headers=temp_headers)
+            # requests merges session headers (including Origin and Referer)
+            # with the login-specific ones, so only the extras are passed here
+            response = self.session.post(url, json=payload, headers=login_headers)
             
             # Save request/response log if debug mode is enabled
-            self._save_request_log("login", url, "POST", temp_headers, payload, response)
+            self._save_request_log("login", url, "POST", {**self.session.headers, **login_headers}, payload, response)
             
             # Log response details
-            logger.debug(f"Response status: {response.status_code}")
-            logger.debug(f"Response headers: {dict(response.headers)}")
+            logger.debug("Response status: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response headers: %s", dict(response.headers))
             
             # Check for successful authentication
             if response.status_code == 200:
                 data = response.json()
-                logger.debug(f"Login response keys: {list(data.keys())}")
+                logger.debug("Login response keys: %s", list(data.keys()))
                 return True, data, response
             else:
                 # Authentication failed
@@ -394,7 +690,7 @@ class MPWiKClient:
                     error_data = response.json()
                     logger.error(f"Error response: {json.dumps(error_data, indent=2)}")
                 except:
-                    logger.error(f"Error response (raw): {response.text[:500]}")
+                    logger.error("Error response (raw): %s", response.text[:500])
                 return False, None, response
                 
         except requests.exceptions.RequestException as e:
@@ -411,25 +707,30 @@ class MPWiKClient:
         Returns:
             True if authentication successful, False otherwise
         """
+        # Readings cached for an earlier session may belong to another login
+        self.invalidate_readings()
         try:
             # Step 1: Visit the login page to get cookies and CSRF token
             logger.info("Fetching login page to get CSRF token...")
-            login_page_url = f"{self.SITE_URL}/login"
-            logger.debug(f"GET {login_page_url}")
-            page_response = self.session.get(login_page_url)
+            login_page_url = self._site_login_url
+            logger.debug("GET %s", login_page_url)
+            page_response = self.session.get(login_page_url, stream=True)
             page_response.raise_for_status()
             
             # Save request/response log for initial GET if debug mode is enabled
             self._save_request_log("get_login_page", login_page_url, "GET", self.session.headers, None, page_response)
             
-            logger.debug(f"Login page response status: {page_response.status_code}")
-            logger.debug(f"Cookies received: {list(self.session.cookies.keys())}")
+            logger.debug("Login page response status: %s", page_response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cookies received: %s", list(self.session.cookies.keys()))
+            # Decode a bounded prefix of the body once for all regex fallbacks below
+            page_html = _read_prefix(page_response, self.LOGIN_PAGE_SCAN_BYTES)
             
             # Step 1.5: Call session/info endpoint to get CSRF token (matches browser behavior)
             # The browser JavaScript calls this endpoint before login to retrieve the CSRF token
             logger.info("Fetching session info to get CSRF token...")
-            session_info_url = f"{self.BASE_URL}/session/info"
-            logger.debug(f"GET {session_info_url}")
+            session_info_url = self._session_info_url
+            logger.debug("GET %s", session_info_url)
             session_response = self.session.get(session_info_url)
             
             # Save request/response log if debug mode is enabled
@@ -443,21 +744,26 @@ class MPWiKClient:
                     csrf_token = session_data.get('csrfToken')
                     if csrf_token:
                         logger.info("Found CSRF token in session/info response")
-                        logger.debug(f"CSRF token: {csrf_token[:20]}...")
+                        logger.debug("CSRF token: %s...", csrf_token[:20])
                     else:
                         logger.debug("No CSRF token in session/info response, will try other sources")
                 except Exception as e:
-                    logger.debug(f"Could not parse session/info response: {e}")
+                    logger.debug("Could not parse session/info response: %s", e)
             else:
-                logger.debug(f"Session info request failed with status {session_response.status_code}")
+                logger.debug("Session info request failed with status %s", session_response.status_code)
             
             # If no CSRF token from session/info, try to extract from HTML or cookies
             # The token might be in a meta tag or script in the HTML
             if not csrf_token:
                 # Check if CSRF token is in cookies
                 logger.debug("Searching for CSRF token in cookies...")
+                debug_enabled = logger.isEnabledFor(logging.DEBUG)
                 for cookie in self.session.cookies:
-                    logger.debug(f"Cookie: {cookie.name} = {cookie.value[:20]}..." if len(cookie.value) > 20 else f"Cookie: {cookie.name} = {cookie.value}")
+                    if debug_enabled:
+                        logger.debug(
+                            "Cookie: %s = %s", cookie.name,
+                            f"{cookie.value[:20]}..." if len(cookie.value) > 20 else cookie.value
+                        )
                     if 'csrf' in cookie.name.lower() or 'xsrf' in cookie.name.lower():
                         csrf_token = cookie.value
                         logger.info(f"Found CSRF token in cookie: {cookie.name}")
@@ -467,25 +773,14 @@ class MPWiKClient:
             if not csrf_token:
                 logger.debug("No CSRF token in cookies, searching in HTML...")
                 # Look for common CSRF token patterns in HTML
-                csrf_patterns = [
-                    r'<meta[^>]*name=["\']csrf["\'][^>]*content=["\']([^"\']+)["\']',  # MPWiK specific: name="csrf"
-                    r'<meta[^>]*name=["\']csrf-token["\'][^>]*content=["\']([^"\']+)["\']',
-                    r'<meta[^>]*content=["\']([^"\']+)["\'][^>]*name=["\']csrf-token["\']',
-                    r'csrf["\']?\s*:\s*["\']([^"\']+)["\']',
-                    r'X-CSRF-TOKEN["\']?\s*:\s*["\']([^"\']+)["\']'
-                ]
-                
-                for i, pattern in enumerate(csrf_patterns):
-                    match = re.search(pattern, page_response.text, re.IGNORECASE)
-                    if match:
-                        csrf_token = match.group(1)
-                        logger.info(f"Found CSRF token in HTML (pattern {i+1})")
-                        logger.debug(f"CSRF token: {csrf_token[:20]}...")
-                        break
+                csrf_token, rank = _search_preferred(CSRF_PATTERN, page_html)
+                if csrf_token:
+                    logger.info(f"Found CSRF token in HTML (pattern {rank})")
+                    logger.debug("CSRF token: %s...", csrf_token[:20])
                 
-                if not csrf_token:
-                    logger.debug(f"HTML page length: {len(page_response.text)} characters")
-                    logger.debug(f"First 500 chars of HTML: {page_response.text[:500]}")
+                if not csrf_token and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Scanned HTML length: %s characters", len(page_html))
+                    logger.debug("First 500 chars of HTML: %s", page_html[:500])
             
             if csrf_token:
                 self.csrf_token = csrf_token
@@ -496,35 +791,23 @@ class MPWiKClient:
             recaptcha_site_key = None
             if self.recaptcha_api_key:
                 logger.info("Searching for ReCAPTCHA site key in login page...")
-                # Common patterns for ReCAPTCHA site key
-                sitekey_patterns = [
-                    r'<meta\s+name=["\']recaptcha\.site\.key["\']\s+content=["\']([^"\']+)["\']',  # MPWiK specific
-                    r'data-sitekey=["\']([^"\']+)["\']',
-                    r'sitekey["\']?\s*:\s*["\']([^"\']+)["\']',
-                    r'grecaptcha\.execute\(["\']([^"\']+)["\']',
-                    r'render["\']?\s*:\s*["\']([^"\']+)["\']'
-                ]
-                
-                for i, pattern in enumerate(sitekey_patterns):
-                    match = re.search(pattern, page_response.text, re.IGNORECASE)
-                    if match:
-                        recaptcha_site_key = match.group(1)
-                        logger.info(f"Found ReCAPTCHA site key (pattern {i+1}): {recaptcha_site_key}")
-                        break
-                
-                if not recaptcha_site_key:
-                    logger.warning("Could not find ReCAPTCHA site key in HTML")
-                    logger.debug("Searching for 'recaptcha' in HTML...")
-                    if 'recaptcha' in page_response.text.lower():
+                # Skip the site key patterns entirely if the page never mentions ReCAPTCHA
+                if 'recaptcha' not in page_html.casefold():
+                    logger.debug("No 'recaptcha' string found in HTML")
+                    logger.info("ReCAPTCHA may not be required for this login attempt")
+                else:
+                    # Common patterns for ReCAPTCHA site key
+                    recaptcha_site_key, rank = _search_preferred(SITEKEY_PATTERN, page_html)
+                    if recaptcha_site_key:
+                        logger.info(f"Found ReCAPTCHA site key (pattern {rank}): {recaptcha_site_key}")
+                    else:
+                        logger.warning("Could not find ReCAPTCHA site key in HTML")
                         logger.debug("Found 'recaptcha' string in HTML, but couldn't extract site key")
                         # Try to find any 6L string that looks like a site key
-                        generic_match = re.search(r'6[A-Za-z0-9_-]{39}', page_response.text)
+                        generic_match = GENERIC_SITEKEY_PATTERN.search(page_html)
                         if generic_match:
                             recaptcha_site_key = generic_match.group(0)
                             logger.info(f"Found potential ReCAPTCHA site key using generic pattern: {recaptcha_site_key}")
-                    else:
-                        logger.debug("No 'recaptcha' string found in HTML")
-                        logger.info("ReCAPTCHA may not be required for this login attempt")
             
             # Step 3: Solve ReCAPTCHA if API key provided and site key found
             recaptcha_token = None
@@ -547,7 +830,7 @@ class MPWiKClient:
                 if recaptcha_token:
                     self.recaptcha_token = recaptcha_token
                     logger.info("ReCAPTCHA token obtained successfully")
-                    logger.debug(f"ReCAPTCHA token length: {len(recaptcha_token)}")
+                    logger.debug("ReCAPTCHA token length: %s", len(recaptcha_token))
                 else:
                     logger.warning("Failed to obtain ReCAPTCHA token")
             elif self.recaptcha_api_key and not recaptcha_site_key:
@@ -558,6 +841,7 @@ class MPWiKClient:
             # Step 4: Attempt login with retry mechanism
             for attempt in range(max_retries + 1):
                 if attempt > 0:
+                    self._sleep_for_retry_after(response, attempt)
                     logger.info(f"Retry attempt {attempt}/{max_retries}...")
                     
                     # Get fresh ReCAPTCHA token for retry
@@ -606,6 +890,11 @@ class MPWiKClient:
                                         continue
                             except:
                                 pass
+                        elif response.status_code == 429:
+                            logger.error("Authentication failed: Rate limited (429)")
+                            if attempt < max_retries:
+                                logger.info("Will retry after the server's Retry-After delay...")
+                                continue
                         elif response.status_code == 403:
                             logger.error("Authentication failed: Access forbidden (403)")
                             logger.error("This may indicate:")
@@ -626,15 +915,97 @@ class MPWiKClient:
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Authentication failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Response status: {e.response.status_code}")
-                logger.error(f"Response headers: {dict(e.response.headers)}")
+            if getattr(e, 'response', None) is not None and logger.isEnabledFor(logging.ERROR):
+                # Lazy %s args: the headers' repr and body slice are only built when emitted
+                logger.error("Response status: %s", e.response.status_code)
+                logger.error("Response headers: %s", e.response.headers)
                 try:
-                    logger.error(f"Response body: {e.response.text[:500]}")
+                    logger.error("Response body: %s", e.response.text[:500])
                 except:
                     pass
             return False
     
+    def _sleep_for_retry_after(self, response: Optional[requests.Response], attempt: int):
+        """
+        Wait before a login retry.
+        
+        Honours Retry-After on a 429/503 response. Otherwise uses exponential
+        backoff with jitter, so retries do not hammer the server into a harder block.
+        
+        Args:
+            response: Response of the failed attempt, if any
+            attempt: Number of the upcoming retry (1-based)
+        """
+        delay = None
+        if response is not None and response.status_code in (429, 503):
+            delay = _retry_after_seconds(response.headers.get('Retry-After'))
+        if delay is None:
+            delay = self.retry_base_delay * (2 ** (attempt - 1)) * (1 + random.random() * self.retry_jitter)
+        delay = min(self.retry_max_delay, delay)
+        logger.info(f"Backing off {delay:.1f}s before retry")
+        time.sleep(delay)
+    
+    def export_session(self) -> Dict:
+        """
+        Export the authenticated session so a later run can skip login.
+        
+        Returns:
+            Dictionary with the auth token, CSRF token and session cookies
+        """
+        return {
+            'token': self.token,
+            'csrf_token': self.csrf_token,
+            'cookies': requests.utils.dict_from_cookiejar(self.session.cookies),
+        }
+    
+    def restore_session(self, state: Dict, podmiot_id: Optional[str] = None) -> bool:
+        """
+        Restore a session saved with export_session() and check that it is still valid.
+        
+        Args:
+            state: Session state from export_session()
+            podmiot_id: Podmiot ID the session will query (default: the login)
+        
+        Returns:
+            True if the API accepts the restored session, False otherwise
+        """
+        # Readings cached for an earlier session may belong to another login
+        self.invalidate_readings()
+        self.token = state.get('token')
+        self.csrf_token = state.get('csrf_token')
+        self.session.cookies.update(state.get('cookies') or {})
+        if self.token:
+            self.session.headers.update({
+                'Authorization': f'Bearer {self.token}'
+            })
+        
+        # Probe a cheap authenticated endpoint for the podmiot that will be queried
+        podmiot_id = podmiot_id or self.login
+        try:
+            response = self.session.get(
+                f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci",
+                params={'status': 'AKTYWNE'}
+            )
+            if response.status_code == 200:
+                logger.info("Restored saved session, skipping login")
+                # The probe is the active points list, so keep it for get_punkty_sieci()
+                try:
+                    punkty = _response_json(response).get('punkty')
+                except (ValueError, AttributeError):
+                    punkty = None
+                if isinstance(punkty, list):
+                    self._points_cache[(podmiot_id, 'AKTYWNE')] = (time.monotonic(), punkty)
+                return True
+            logger.info(f"Saved session rejected (HTTP {response.status_code}), logging in again")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not verify saved session: {e}")
+        
+        self.token = None
+        self.csrf_token = None
+        self.session.headers.pop('Authorization', None)
+        self.session.cookies.clear()
+        return False
+    
     def get_daily_readings(
         self,
         podmiot_id: str,
@@ -654,27 +1025,42 @@ class MPWiKClient:
         Returns:
             List of daily readings or None if failed
         """
-        url = f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci/{punkt_sieci}/odczyty/dobowe"
-        
-        params = {
-            'dataOd': date_from.strftime('%Y-%m-%dT%H:%M:%S'),
-            'dataDo': date_to.strftime('%Y-%m-%dT%H:%M:%S')
-        }
-        
         try:
-            logger.info(f"Fetching daily readings from {date_from} to {date_to}...")
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            readings = data.get('odczyty', [])
-            logger.info(f"Retrieved {len(readings)} daily readings")
+            logger.info("Fetching daily readings from %s to %s...", date_from, date_to)
+            readings = self._fetch_readings_coalesced(
+                ('dobowe', podmiot_id, punkt_sieci, date_from, date_to),
+                lambda: list(self.iter_daily_readings(podmiot_id, punkt_sieci, date_from, date_to))
+            )
+            logger.info("Retrieved %s daily readings", len(readings))
             return readings
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch daily readings: {e}")
             return None
     
+    def iter_daily_readings(
+        self,
+        podmiot_id: str,
+        punkt_sieci: str,
+        date_from: datetime,
+        date_to: datetime
+    ) -> Iterator[Dict]:
+        """
+        Stream daily water consumption readings as they are parsed.
+        
+        Args:
+            podmiot_id: Entity ID (podmiot)
+            punkt_sieci: Network point ID
+            date_from: Start date
+            date_to: End date
+        
+        Returns:
+            Iterator over daily readings; iterating raises
+            requests.exceptions.RequestException if the request fails
+        """
+        url = f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci/{punkt_sieci}/odczyty/dobowe"
+        return self._iter_readings(url, date_from, date_to)
+    
     def get_hourly_readings(
         self,
         podmiot_id: str,
@@ -694,26 +1080,240 @@ class MPWiKClient:
         Returns:
             List of hourly readings or None if failed
         """
+        try:
+            logger.info("Fetching hourly readings from %s to %s...", date_from, date_to)
+            readings = self._fetch_readings_coalesced(
+                ('godzinowe', podmiot_id, punkt_sieci, date_from, date_to),
+                lambda: list(self.iter_hourly_readings(podmiot_id, punkt_sieci, date_from, date_to))
+            )
+            logger.info("Retrieved %s hourly readings", len(readings))
+            return readings
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to fetch hourly readings: {e}")
+            return None
+    
+    def iter_hourly_readings(
+        self,
+        podmiot_id: str,
+        punkt_sieci: str,
+        date_from: datetime,
+        date_to: datetime
+    ) -> Iterator[Dict]:
+        """
+        Stream hourly water consumption readings as they are parsed.
+        
+        Args:
+            podmiot_id: Entity ID (podmiot)
+            punkt_sieci: Network point ID
+            date_from: Start date
+            date_to: End date
+        
+        Returns:
+            Iterator over hourly readings; iterating raises
+            requests.exceptions.RequestException if the request fails
+        """
         url = f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci/{punkt_sieci}/odczyty/godzinowe"
+        return self._iter_readings(url, date_from, date_to)
+    
+    def _fetch_readings_coalesced(self, key: tuple, fetch) -> List[Dict]:
+        """
+        Run a readings fetch, sharing it with identical concurrent requests.
+        
+        A caller asking for a key that is already being fetched waits for that
+        fetch instead of sending the same GET again; results are then reused
+        for READINGS_CACHE_TTL seconds.
+        
+        Args:
+            key: Hashable identity of the request (endpoint, IDs and dates)
+            fetch: Callable performing the request and returning the readings
+        
+        Returns:
+            A deep copy of the readings, so callers cannot change each other's
+            (or the cached) reading dicts
+        
+        Raises:
+            requests.exceptions.RequestException: If the shared fetch fails
+        """
+        with self._readings_lock:
+            cached = self._readings_cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.READINGS_CACHE_TTL:
+                logger.debug("Using cached readings for %s", key)
+                return copy.deepcopy(cached[1])
+            future = self._readings_inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._readings_inflight[key] = Future()
+        
+        if not owner:
+            logger.debug("Waiting for identical in-flight request %s", key)
+            return copy.deepcopy(future.result())
+        
+        try:
+            readings = fetch()
+        except BaseException as e:
+            with self._readings_lock:
+                del self._readings_inflight[key]
+            future.set_exception(e)
+            raise
+        
+        with self._readings_lock:
+            del self._readings_inflight[key]
+            if len(self._readings_cache) >= self.READINGS_CACHE_SIZE:
+                # Dicts keep insertion order, so this drops the oldest entry
+                del self._readings_cache[next(iter(self._readings_cache))]
+            self._readings_cache[key] = (time.monotonic(), readings)
+        future.set_result(readings)
+        return copy.deepcopy(readings)
+    
+    def _iter_readings(self, url: str, date_from: datetime, date_to: datetime) -> Iterator[Dict]:
+        """
+        Stream the readings list of a readings endpoint.
         
+        With ijson installed the body is parsed incrementally from the socket,
+        so there is no full text copy of it and parsing overlaps the download;
+        otherwise the whole body is decoded at once (with orjson if installed).
+        
+        Args:
+            url: Readings endpoint URL
+            date_from: Start date
+            date_to: End date
+        
+        Yields:
+            Readings in API order
+        """
         params = {
             'dataOd': date_from.strftime('%Y-%m-%dT%H:%M:%S'),
             'dataDo': date_to.strftime('%Y-%m-%dT%H:%M:%S')
         }
+        if self._http2_client is not None:
+            yield from self._get_json_http2(url, params).get('odczyty', [])
+            return
         
+        response = self.session.get(url, params=params, stream=True)
         try:
-            logger.info(f"Fetching hourly readings from {date_from} to {date_to}...")
-            response = self.session.get(url, params=params)
             response.raise_for_status()
+            if ijson is None:
+                yield from _response_json(response).get('odczyty', [])
+                return
             
-            data = response.json()
-            readings = data.get('odczyty', [])
-            logger.info(f"Retrieved {len(readings)} hourly readings")
-            return readings
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to fetch hourly readings: {e}")
-            return None
+            # Let urllib3 undo any gzip transfer encoding while ijson reads
+            response.raw.decode_content = True
+            try:
+                # use_float keeps numbers as floats, like response.json(), not Decimal
+                yield from ijson.items(response.raw, 'odczyty.item', use_float=True)
+            except ijson.JSONError as e:
+                raise requests.exceptions.InvalidJSONError(f"Invalid readings response: {e}") from e
+        finally:
+            response.close()
+    
+    def _get_json_http2(self, url: str, params: Dict[str, str]):
+        """
+        GET a JSON endpoint over the HTTP/2 client with the session's headers.
+        
+        Args:
+            url: Endpoint URL
+            params: Query parameters
+        
+        Returns:
+            Decoded JSON value
+        
+        Raises:
+            requests.exceptions.RequestException: If the request fails or the
+                body is not valid JSON, like the requests code path
+        """
+        try:
+            response = self._http2_client.get(url, params=params, headers=dict(self.session.headers))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+        try:
+            return _response_json(response)
+        except requests.exceptions.RequestException:
+            raise
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(f"Invalid response: {e}") from e
+    
+    def get_readings_batch(
+        self,
+        podmiot_id: str,
+        punkt_sieci: str,
+        queries: List[Tuple[str, datetime, datetime]]
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Fetch several reading ranges over the authenticated session.
+        
+        The API has no batch endpoint, so each range is a separate request;
+        they are issued concurrently so the total wait is that of the
+        slowest request rather than the sum.
+        
+        Args:
+            podmiot_id: Entity ID (podmiot)
+            punkt_sieci: Network point ID
+            queries: List of (reading_type, date_from, date_to) tuples,
+                where reading_type is "daily" or "hourly"
+        
+        Returns:
+            List of readings (or None for a failed query), in the same order as queries
+        """
+        fetchers = {
+            'daily': self.get_daily_readings,
+            'hourly': self.get_hourly_readings,
+        }
+        if len(queries) <= 1:
+            return [
+                fetchers[reading_type](podmiot_id, punkt_sieci, date_from, date_to)
+                for reading_type, date_from, date_to in queries
+            ]
+        
+        # I/O bound: requests.Session's connection pool is shared by the threads
+        with ThreadPoolExecutor(max_workers=min(len(queries), self.MAX_PARALLEL_REQUESTS)) as executor:
+            futures = [
+                executor.submit(fetchers[reading_type], podmiot_id, punkt_sieci, date_from, date_to)
+                for reading_type, date_from, date_to in queries
+            ]
+            return [future.result() for future in futures]
+    
+    def get_readings_bulk(
+        self,
+        podmiot_id: str,
+        punkty_sieci: List[str],
+        reading_type: str,
+        date_from: datetime,
+        date_to: datetime
+    ) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Fetch the same reading range for several meters concurrently.
+        
+        Like get_readings_batch(), the requests overlap over the session's
+        keep-alive connections, so N meters take about one round trip.
+        
+        Args:
+            podmiot_id: Entity ID (podmiot)
+            punkty_sieci: Network point IDs
+            reading_type: "daily" or "hourly"
+            date_from: Start date
+            date_to: End date
+        
+        Returns:
+            Readings (or None for a failed meter) keyed by network point ID
+        """
+        fetch = {
+            'daily': self.get_daily_readings,
+            'hourly': self.get_hourly_readings,
+        }[reading_type]
+        if len(punkty_sieci) <= 1:
+            return {
+                punkt_sieci: fetch(podmiot_id, punkt_sieci, date_from, date_to)
+                for punkt_sieci in punkty_sieci
+            }
+        
+        with ThreadPoolExecutor(max_workers=min(len(punkty_sieci), self.MAX_PARALLEL_REQUESTS)) as executor:
+            futures = {
+                punkt_sieci: executor.submit(fetch, podmiot_id, punkt_sieci, date_from, date_to)
+                for punkt_sieci in punkty_sieci
+            }
+            return {punkt_sieci: future.result() for punkt_sieci, future in futures.items()}
     
     def get_punkty_sieci(
         self,
@@ -730,6 +1330,12 @@ class MPWiKClient:
         Returns:
             List of network points or None if failed
         """
+        key = (podmiot_id, status)
+        cached = self._points_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.POINTS_CACHE_TTL:
+            logger.debug("Using cached network points for podmiot %s", podmiot_id)
+            return list(cached[1])
+        
         url = f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci"
         
         params = {
@@ -737,20 +1343,31 @@ class MPWiKClient:
         }
         
         try:
-            logger.info(f"Fetching network points for podmiot {podmiot_id}...")
+            logger.info("Fetching network points for podmiot %s...", podmiot_id)
             response = self.session.get(url, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = _response_json(response)
             punkty = data.get('punkty', [])
-            logger.info(f"Retrieved {len(punkty)} network points")
-            return punkty
+            logger.info("Retrieved %s network points", len(punkty))
+            self._points_cache[key] = (time.monotonic(), punkty)
+            return list(punkty)
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch network points: {e}")
             return None
     
-    def print_punkty_sieci(self, punkty: List[Dict]):
+    def invalidate_points(self):
+        """Drop cached network points, e.g. after a meter was added to the account."""
+        self._points_cache.clear()
+    
+    def invalidate_readings(self):
+        """Drop recently fetched readings, so the next request goes to the API."""
+        with self._readings_lock:
+            self._readings_cache.clear()
+    
+    @staticmethod
+    def print_punkty_sieci(punkty: List[Dict]):
         """
         Print network points (meters) in a formatted way.
         
@@ -761,11 +1378,14 @@ class MPWiKClient:
             logger.warning("No network points to display")
             return
         
-        print(f"\n{'='*100}")
-        print(f"AVAILABLE NETWORK POINTS (METERS)")
-        print(f"{'='*100}")
-        print(f"{'ID':<12} {'Number':<15} {'Address':<40} {'Status':<10} {'Coordinates':<20}")
-        print(f"{'-'*100}")
+        # Build the whole table and emit it with a single print call
+        lines = [
+            f"\n{'='*100}",
+            "AVAILABLE NETWORK POINTS (METERS)",
+            f"{'='*100}",
+            f"{'ID':<12} {'Number':<15} {'Address':<40} {'Status':<10} {'Coordinates':<20}",
+            f"{'-'*100}",
+        ]
         
         for punkt in punkty:
             id_punktu = punkt.get('id_punktu', 'N/A')
@@ -786,13 +1406,15 @@ class MPWiKClient:
             if len(adres) > 38:
                 adres = adres[:35] + "..."
             
-            print(f"{str(id_punktu):<12} {numer:<15} {adres:<40} {aktywny:<10} {coords:<20}")
+            lines.append(_POINT_ROW(str(id_punktu), numer, adres, aktywny, coords))
         
-        print(f"{'-'*100}")
-        print(f"Total network points: {len(punkty)}")
-        print(f"{'='*100}\n")
+        lines.append(f"{'-'*100}")
+        lines.append(f"Total network points: {len(punkty)}")
+        lines.append(f"{'='*100}\n")
+        print("\n".join(lines))
     
-    def print_readings(self, readings: List[Dict], reading_type: str = "daily"):
+    @staticmethod
+    def print_readings(readings: List[Dict], reading_type: str = "daily"):
         """
         Print readings in a formatted way.
         
@@ -804,23 +1426,30 @@ class MPWiKClient:
             logger.warning("No readings to display")
             return
         
-        print(f"\n{'='*80}")
-        print(f"{reading_type.upper()} WATER CONSUMPTION READINGS")
-        print(f"{'='*80}")
-        print(f"{'Date/Time':<20} {'Meter':<15} {'Reading (m³)':<15} {'Usage (m³)':<15} {'Type':<10}")
-        print(f"{'-'*80}")
+        # Build the whole table and emit it with a single print call
+        lines = [
+            f"\n{'='*80}",
+            f"{reading_type.upper()} WATER CONSUMPTION READINGS",
+            f"{'='*80}",
+            f"{'Date/Time':<20} {'Meter':<15} {'Reading (m³)':<15} {'Usage (m³)':<15} {'Type':<10}",
+            f"{'-'*80}",
+        ]
         
+        # Accumulate the total while formatting rows (single pass over readings)
+        total_usage = 0.0
         for reading in readings:
-            date_str = reading.get('data', 'N/A')
-            meter = reading.get('licznik', 'N/A')
-            wskazanie = reading.get('wskazanie', 0.0)
-            zuzycie = reading.get('zuzycie', 0.0)
-            typ = reading.get('typ', 'N/A')
-            
-            print(f"{date_str:<20} {meter:<15} {wskazanie:<15.3f} {zuzycie:<15.3f} {typ:<10}")
-        
-        # Calculate totals
-        total_usage = sum(r.get('zuzycie', 0.0) for r in readings)
-        print(f"{'-'*80}")
-        print(f"Total usage: {total_usage:.3f} m³")
-        print(f"{'='*80}\n")
+            # Bound once per row rather than looked up for every field
+            get = reading.get
+            date_str = get('data', 'N/A')
+            meter = get('licznik', 'N/A')
+            wskazanie = get('wskazanie', 0.0)
+            zuzycie = get('zuzycie', 0.0)
+            typ = get('typ', 'N/A')
+            total_usage += zuzycie
+            
+            lines.append(_READING_ROW(date_str, meter, wskazanie, zuzycie, typ))
+        
+        lines.append(f"{'-'*80}")
+        lines.append(f"Total usage: {total_usage:.3f} m³")
+        lines.append(f"{'='*80}\n")
+        print("\n".join(lines))
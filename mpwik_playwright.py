@@ -7,73 +7,270 @@ This script demonstrates how to automate interactions with the MPWiK Wrocław e-
 It is an alternative to the Selenium-based client, often proving to be faster and more reliable.
 
 The process includes:
-1. Launching a browser.
+1. Launching a browser (shared by all clients in the process) and opening a context.
 2. Navigating to the login page.
 3. Filling in credentials and handling reCAPTCHA by relying on the browser's trusted status.
 4. Navigating to the water consumption page to establish a full session context.
-5. Using the browser's `fetch` API to directly call the backend API for data.
+5. Calling the backend API with the browser context's cookies (Playwright's request API,
+   or the browser's `fetch` for batches).
 6. Parsing and returning the data.
 """
 
+import atexit
 import logging
 import json
+import os
+import random
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Literal, Optional
-from urllib.parse import quote
+from pathlib import Path
+from typing import List, Dict, Any, Literal, Optional, Tuple
 
-from playwright.sync_api import sync_playwright, Browser, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeoutError
+
+from mpwik_direct import _retry_after_seconds
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://ebok.mpwik.wroc.pl"
 API_BASE_URL = f"{BASE_URL}/frontend-api/v1"
 
+# Retries per URL on 429/503, and the longest wait between them
+FETCH_MAX_RETRIES = 3
+FETCH_MAX_RETRY_DELAY_MS = 30000
+
+# Seconds a fetched network points list is reused by get_points()
+POINTS_CACHE_TTL = 300.0
+
+# Headers sent with backend API calls
+API_HEADERS = {
+    'Accept': 'application/json',
+    'Content-Type': 'application/json'
+}
+
+# Fetches all given URLs concurrently in the page, in one evaluate round trip.
+# URLs are passed as an argument rather than formatted into the script.
+# 429/503 responses are retried in the page, honouring Retry-After (seconds
+# or HTTP-date, parsed like mpwik_direct._retry_after_seconds) and falling
+# back to exponential backoff with jitter.
+FETCH_MANY_JS = """
+async ({urls, maxRetries, maxDelayMs}) => {
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const retryDelayMs = (response, attempt) => {
+        const retryAfter = response.headers.get('Retry-After');
+        let delay = NaN;
+        if (retryAfter) {
+            delay = /^\\d+(\\.\\d+)?$/.test(retryAfter.trim())
+                ? parseFloat(retryAfter) * 1000
+                : Date.parse(retryAfter) - Date.now();
+        }
+        if (Number.isNaN(delay)) {
+            delay = (2 ** attempt + Math.random()) * 1000;
+        }
+        return Math.min(maxDelayMs, Math.max(0, delay));
+    };
+    return Promise.all(urls.map(async (url) => {
+        for (let attempt = 0; ; attempt++) {
+            const response = await fetch(url, {
+                headers: {
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json'
+                },
+                credentials: 'include'
+            });
+            if ((response.status === 429 || response.status === 503) && attempt < maxRetries) {
+                await sleep(retryDelayMs(response, attempt));
+                continue;
+            }
+            if (!response.ok) {
+                throw new Error(`HTTP error! status: ${response.status} for ${url}`);
+            }
+            return await response.json();
+        }
+    }));
+}
+"""
+
+# Installed into every document of the context, so the fetch helper is compiled
+# once per page load; calls then only pass their arguments to it. The call
+# returns null where the helper is missing, and the full script is sent instead.
+INSTALL_FETCH_MANY_JS = "window.__mpwikFetchMany = " + FETCH_MANY_JS.strip() + ";"
+CALL_FETCH_MANY_JS = "(args) => window.__mpwikFetchMany ? window.__mpwikFetchMany(args) : null"
+
+
+# Playwright driver and launched browsers shared by all clients in the process,
+# so only the first client pays for the driver start and browser launch.
+# The sync API is bound to the thread that started it.
+_shared_lock = threading.Lock()
+_shared_playwright = None
+_shared_browsers: Dict[Tuple[str, bool], Browser] = {}
+
+
+def _get_browser(browser_type: str, headless: bool) -> Browser:
+    """Returns the shared browser for (browser_type, headless), launching it on first use."""
+    global _shared_playwright
+    with _shared_lock:
+        key = (browser_type, headless)
+        browser = _shared_browsers.get(key)
+        if browser is not None and browser.is_connected():
+            return browser
+        if _shared_playwright is None:
+            _shared_playwright = sync_playwright().start()
+            atexit.register(_close_shared_browsers)
+        logger.info(f"Launching shared {browser_type} browser (headless={headless})")
+        browser = getattr(_shared_playwright, browser_type).launch(headless=headless)
+        _shared_browsers[key] = browser
+        return browser
+
+
+def _close_shared_browsers():
+    """Closes the shared browsers and stops the Playwright driver."""
+    global _shared_playwright
+    with _shared_lock:
+        for browser in _shared_browsers.values():
+            try:
+                browser.close()
+            except Exception as e:
+                logger.debug("Error closing shared browser: %s", e)
+        _shared_browsers.clear()
+        if _shared_playwright is not None:
+            try:
+                _shared_playwright.stop()
+            except Exception as e:
+                logger.debug("Error stopping Playwright: %s", e)
+            _shared_playwright = None
+
+
+def _retry_delay_seconds(retry_after: Optional[str], attempt: int) -> float:
+    """Returns the wait before retrying a rate-limited call, honouring Retry-After."""
+    delay = _retry_after_seconds(retry_after)
+    if delay is None:
+        delay = 2 ** attempt + random.random()
+    return min(FETCH_MAX_RETRY_DELAY_MS / 1000, delay)
+
+
+def _format_api_datetime(value: datetime) -> str:
+    """Formats a datetime the way the readings API expects it (local time, no offset)."""
+    return value.strftime('%Y-%m-%dT%H:%M:%S')
+
 
 class MPWikPlaywrightClient:
     """A client for interacting with the MPWiK e-BOK using Playwright."""
 
-    def __init__(self, login, password, headless=True, browser_type: Literal['chromium', 'firefox', 'webkit'] = 'chromium'):
+    def __init__(self, login, password, headless=True, browser_type: Literal['chromium', 'firefox', 'webkit'] = 'chromium',
+                 state_path: Optional[str] = None):
+        """
+        Initializes the client. `state_path` is an optional JSON file for the browser
+        context's storage state (cookies, localStorage): a saved session there is tried
+        before logging in, and the file is rewritten after every successful login.
+        """
         self.login = login
         self.password = password
         self.headless = headless
         self.browser_type = browser_type
-        self.playwright = None
+        self.state_path = Path(state_path) if state_path else None
+        self._state_loaded = False
         self.browser: Optional[Browser] = None
+        # Pages and API requests share this context's cookie jar
+        self.context: Optional[BrowserContext] = None
         self._podmiot_id: Optional[str] = None
         self.session_headers: Dict[str, str] = {}
+        # Long-lived page kept open after login and reused for all API fetches
+        self._page: Optional[Page] = None
+        # podmiot_id -> (fetched at, network points)
+        self._points_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
 
     def __enter__(self):
-        """Initializes the Playwright instance and browser."""
+        """Opens a browser context on the shared browser (launched on first use)."""
         logger.info("Starting Playwright client...")
-        self.playwright = sync_playwright().start()
-        browser_launcher = getattr(self.playwright, self.browser_type)
-        self.browser = browser_launcher.launch(headless=self.headless)
+        self.browser = _get_browser(self.browser_type, self.headless)
+        self.context = None
+        if self.state_path and self.state_path.exists():
+            try:
+                self.context = self.browser.new_context(storage_state=self.state_path)
+                self._state_loaded = True
+                logger.info("Loaded saved browser state from %s", self.state_path)
+            except Exception as e:
+                logger.warning(f"Could not load saved browser state: {e}")
+        if self.context is None:
+            self.context = self.browser.new_context()
+        self.context.add_init_script(INSTALL_FETCH_MANY_JS)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Cleans up resources by closing the browser and stopping Playwright."""
+        """Closes the client's page and context; the shared browser stays up until process exit."""
         logger.info("Closing Playwright client.")
-        if self.browser:
-            self.browser.close()
-        if self.playwright:
-            self.playwright.stop()
+        if self._page and not self._page.is_closed():
+            self._page.close()
+        self._page = None
+        if self.context:
+            self.context.close()
+        self.context = None
+        self.browser = None
 
     def _get_page(self) -> Page:
-        """Gets a new browser page, creating a browser if necessary."""
-        if not self.browser:
+        """Gets a new page in the client's browser context."""
+        if not self.context:
             raise ConnectionError("Browser is not initialized. Please use the client as a context manager.")
-        return self.browser.new_page()
+        return self.context.new_page()
+
+    def _get_api_page(self) -> Page:
+        """Returns the cached session page, reopening it if it has been closed."""
+        if self._page is None or self._page.is_closed():
+            self._page = self._get_page()
+        return self._page
+
+    def save_state(self):
+        """Saves the context's storage state to state_path, readable only by the current user."""
+        if not self.state_path or not self.context:
+            return
+        try:
+            state = self.context.storage_state()
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.state_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            logger.info("Browser state saved to %s", self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save browser state: {e}")
+
+    def _probe_session(self) -> bool:
+        """
+        Checks whether the saved session is still accepted with one cheap API call.
+        On success the fetched active points list is cached for get_points().
+        """
+        url = f"{API_BASE_URL}/podmioty/{self.login}/punkty-sieci?status=AKTYWNE"
+        try:
+            response = self.context.request.get(url, headers=API_HEADERS)
+        except Exception as e:
+            logger.warning(f"Could not verify saved session: {e}")
+            return False
+        if response.status != 200:
+            logger.info(f"Saved session rejected (HTTP {response.status}), logging in again")
+            return False
+        try:
+            self._points_cache[self.login] = (time.monotonic(), response.json().get('punkty', []))
+        except Exception:
+            pass
+        return True
 
     def login_and_establish_session(self):
         """
         Logs into the e-BOK portal and navigates to the necessary page to establish a full API session.
+        A still-valid saved session (see state_path) skips the login entirely.
         """
-        page = self._get_page()
+        if self._state_loaded and self._probe_session():
+            logger.info("Restored saved session, skipping login")
+            # The podmiot_id is the account ID, which is the same as the login ID
+            self._podmiot_id = self.login
+            return
+
+        page = self._get_api_page()
         try:
             logger.info(f"Navigating to login page at {BASE_URL}/login")
-            page.goto(f"{BASE_URL}/login")
+            # page.fill() waits for the inputs itself, no need for the full load event
+            page.goto(f"{BASE_URL}/login", wait_until="domcontentloaded")
 
             logger.info("Filling login credentials.")
             page.fill('input[name="login"]', self.login)
@@ -92,56 +289,99 @@ class MPWikPlaywrightClient:
             # Navigate to the water consumption page to establish API session context
             water_consumption_url = f"{BASE_URL}/trust/zuzycie-wody?p={self._podmiot_id}"
             logger.info(f"Navigating to water consumption page to establish session: {water_consumption_url}")
-            page.goto(water_consumption_url)
-            page.wait_for_load_state('networkidle')
+            # The page's own first API call answering means the session is live;
+            # waiting for it is much shorter than networkidle's 500 ms quiet period
+            # Only a timeout of the response wait is tolerated; a navigation timeout
+            # is re-raised to the handler below
+            navigated = False
+            try:
+                with page.expect_response(
+                    lambda r: '/frontend-api/v1/podmioty/' in r.url and r.ok, timeout=15000
+                ):
+                    page.goto(water_consumption_url, wait_until="domcontentloaded")
+                    navigated = True
+            except PlaywrightTimeoutError:
+                if not navigated:
+                    raise
+                logger.warning("No API response seen on the water consumption page, continuing anyway.")
             logger.info("Session established.")
+            self.save_state()
 
         except PlaywrightTimeoutError:
             logger.error("Timeout during login or session establishment. The page might have a reCAPTCHA challenge that could not be bypassed.")
             raise ConnectionError("Failed to log in. A timeout occurred, possibly due to an unsolved reCAPTCHA.")
-        finally:
-            page.close()
 
-    def _fetch_api_data(self, url: str) -> Dict[str, Any]:
+    def _fetch_api_data(self, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Calls the backend API through the browser context's APIRequestContext,
+        which encodes the optional query `params` into the URL.
+        The request is sent straight from the Playwright driver with the
+        context's authenticated cookies, without a page.evaluate round trip
+        into the renderer. Rate-limited (429/503) calls are retried after the
+        server's Retry-After.
+        """
+        if not self.context:
+            raise ConnectionError("Browser is not initialized. Please use the client as a context manager.")
+        logger.info("Fetching API data from: %s", url)
+        for attempt in range(FETCH_MAX_RETRIES + 1):
+            response = self.context.request.get(url, headers=API_HEADERS, params=params)
+            if response.status in (429, 503) and attempt < FETCH_MAX_RETRIES:
+                delay = _retry_delay_seconds(response.headers.get('retry-after'), attempt)
+                logger.info(f"Rate limited (HTTP {response.status}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            if not response.ok:
+                logger.error(f"Failed to fetch API data: HTTP {response.status}")
+                raise ConnectionError(f"HTTP error! status: {response.status} for {url}")
+            logger.info("API data fetched successfully.")
+            return response.json()
+
+    def _fetch_api_data_many(self, urls: List[str]) -> List[Dict[str, Any]]:
         """
-        Uses the browser's fetch API to make a direct call to the backend API.
-        This reuses the browser's authenticated session (cookies, headers).
+        Fetches several API URLs concurrently with a single page.evaluate call
+        into the helper the init script installed in the page.
+        The browser pipelines the requests over its keep-alive connections and
+        retries rate-limited (429/503) ones after the server's Retry-After.
+        One evaluate beats one APIRequestContext round trip per URL here.
+        Returns the JSON bodies in URL order; any failed request raises.
         """
-        page = self._get_page()
+        page = self._get_api_page()
         try:
-            logger.info(f"Fetching API data from: {url}")
-            # Use `page.evaluate` to run JavaScript's fetch in the browser context
-            js_script = f"""
-            async () => {{
-                const response = await fetch('{url}', {{
-                    headers: {{
-                        'Accept': 'application/json',
-                        'Content-Type': 'application/json'
-                    }},
-                    credentials: 'include'
-                }});
-                if (!response.ok) {{
-                    throw new Error(`HTTP error! status: ${{response.status}}`);
-                }}
-                return await response.json();
-            }}()
-            """
-            result = page.evaluate(js_script)
+            if not page.url.startswith(BASE_URL):
+                # In-page fetch() needs the site origin for its cookies (e.g. after a
+                # restored session); the committed navigation is enough for that
+                page.goto(f"{BASE_URL}/", wait_until="commit")
+            logger.info("Fetching API data from %s URL(s): %s", len(urls), urls)
+            args = {
+                'urls': urls,
+                'maxRetries': FETCH_MAX_RETRIES,
+                'maxDelayMs': FETCH_MAX_RETRY_DELAY_MS,
+            }
+            result = page.evaluate(CALL_FETCH_MANY_JS, args)
+            if result is None:
+                result = page.evaluate(FETCH_MANY_JS, args)
             logger.info("API data fetched successfully.")
             return result
         except Exception as e:
             logger.error(f"Failed to fetch API data using browser's fetch: {e}")
             raise
-        finally:
-            page.close()
 
     def get_points(self) -> List[Dict[str, Any]]:
         """Retrieves the list of active network points (meters)."""
         if not self._podmiot_id:
             raise ValueError("Must log in and establish session before getting points.")
+        cached = self._points_cache.get(self._podmiot_id)
+        if cached and time.monotonic() - cached[0] < POINTS_CACHE_TTL:
+            return list(cached[1])
         url = f"{API_BASE_URL}/podmioty/{self._podmiot_id}/punkty-sieci?status=AKTYWNE"
         response_json = self._fetch_api_data(url)
-        return response_json.get('punkty', [])
+        points = response_json.get('punkty', [])
+        self._points_cache[self._podmiot_id] = (time.monotonic(), points)
+        return list(points)
+
+    def invalidate_points(self):
+        """Drops cached network points, e.g. after a meter was added to the account."""
+        self._points_cache.clear()
 
     def get_readings(
         self,
@@ -158,17 +398,64 @@ class MPWikPlaywrightClient:
         if not self._podmiot_id:
             raise ValueError("Must log in and establish session before getting readings.")
 
+        url = self._readings_path(point_id, reading_type)
+        params = {'dataOd': _format_api_datetime(date_from), 'dataDo': _format_api_datetime(date_to)}
+        response_json = self._fetch_api_data(url, params)
+        return response_json.get('odczyty', [])
+
+    def get_readings_batch(
+        self,
+        point_id: str,
+        queries: List[Tuple[Literal['dobowe', 'godzinowe'], datetime, datetime]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieves several (reading_type, date_from, date_to) ranges for one meter
+        in a single browser round trip. Returns readings per query, in query order.
+        """
+        if not self._podmiot_id:
+            raise ValueError("Must log in and establish session before getting readings.")
+
+        urls = [self._readings_url(point_id, *query) for query in queries]
+        return [response_json.get('odczyty', []) for response_json in self._fetch_api_data_many(urls)]
+
+    def get_readings_bulk(
+        self,
+        point_ids: List[str],
+        reading_type: Literal['dobowe', 'godzinowe'],
+        date_from: datetime,
+        date_to: datetime
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieves the same reading type and range for many meters in a single
+        browser round trip. Returns readings keyed by meter number.
+        """
+        if not self._podmiot_id:
+            raise ValueError("Must log in and establish session before getting readings.")
+
+        urls = [self._readings_url(point_id, reading_type, date_from, date_to) for point_id in point_ids]
+        responses = self._fetch_api_data_many(urls)
+        return {
+            point_id: response_json.get('odczyty', [])
+            for point_id, response_json in zip(point_ids, responses)
+        }
+
+    def _readings_path(self, point_id: str, reading_type: Literal['dobowe', 'godzinowe']) -> str:
+        """Builds the readings API URL for a meter and reading type, without the query."""
         # API expects meter numbers with '/' replaced by '-'
         formatted_point_id = point_id.replace('/', '-')
+        return f"{API_BASE_URL}/podmioty/{self._podmiot_id}/punkty-sieci/{formatted_point_id}/odczyty/{reading_type}"
 
-        # URL-encode the datetime strings, as the API requires it
-        start_str = quote(date_from.strftime('%Y-%m-%dT%H:%M:%S'))
-        end_str = quote(date_to.strftime('%Y-%m-%dT%H:%M:%S'))
-
-        url = (
-            f"{API_BASE_URL}/podmioty/{self._podmiot_id}/punkty-sieci/{formatted_point_id}"
-            f"/odczyty/{reading_type}?dataOd={start_str}&dataDo={end_str}"
+    def _readings_url(
+        self,
+        point_id: str,
+        reading_type: Literal['dobowe', 'godzinowe'],
+        date_from: datetime,
+        date_to: datetime
+    ) -> str:
+        """Builds the full readings API URL for a meter, reading type and date range."""
+        # The formatted datetimes contain only digits, '-', ':' and 'T', all
+        # valid in a query value, so they need no percent-encoding
+        return (
+            f"{self._readings_path(point_id, reading_type)}"
+            f"?dataOd={_format_api_datetime(date_from)}&dataDo={_format_api_datetime(date_to)}"
         )
-
-        response_json = self._fetch_api_data(url)
-        return response_json.get('odczyty', [])
@@ -5,31 +5,266 @@ Browser automation client for fetching water consumption data from MPWiK Wrocła
 Uses Selenium to handle reCAPTCHA and extract data directly from the web interface.
 """
 
+import atexit
+import base64
+import binascii
+import hashlib
 import logging
+import threading
 import time
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+from urllib.parse import quote
 
+import requests
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import (
+    TimeoutException, WebDriverException, InvalidSessionIdException
+)
 from webdriver_manager.chrome import ChromeDriverManager
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
+# orjson serializes the debug log files much faster than the stdlib; optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Chrome command-line switches used for every session
+CHROME_ARGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+)
+
+# User agent to avoid detection
+CHROME_USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
+)
+
+# Per-command WebDriver timeouts in seconds (navigation and in-page API fetches)
+PAGE_LOAD_TIMEOUT = 30
+SCRIPT_TIMEOUT = 30
+
+# Login form steps as JS functions, each returning 'success' or a failure reason.
+# k-login-field has no shadow DOM; the password input sits in nested shadow roots
+# (k-current-password > mwc-textfield > input) and the button in k-button's.
+FILL_LOGIN_JS = """(value) => {
+    const loginField = document.querySelector('k-login-field');
+    if (!loginField) {
+        return 'login_field_not_found';
+    }
+    
+    const input = loginField.querySelector('input.mdc-text-field__input');
+    if (!input) {
+        return 'input_not_found';
+    }
+    
+    input.removeAttribute('readonly');
+    input.removeAttribute('disabled');
+    input.value = value;
+    input.dispatchEvent(new Event('input', { bubbles: true }));
+    input.dispatchEvent(new Event('change', { bubbles: true }));
+    return 'success';
+}"""
+
+FILL_PASSWORD_JS = """(value) => {
+    const passwordField = document.querySelector('k-current-password');
+    if (!passwordField) {
+        return 'password_field_not_found';
+    }
+    
+    if (!passwordField.shadowRoot) {
+        return 'password_field_no_shadow_root';
+    }
+    
+    const mwcTextField = passwordField.shadowRoot.querySelector('mwc-textfield');
+    if (!mwcTextField) {
+        return 'mwc_textfield_not_found';
+    }
+    
+    if (!mwcTextField.shadowRoot) {
+        return 'mwc_textfield_no_shadow_root';
+    }
+    
+    const input = mwcTextField.shadowRoot.querySelector('input.mdc-text-field__input');
+    if (!input) {
+        return 'input_not_found';
+    }
+    
+    input.removeAttribute('readonly');
+    input.removeAttribute('disabled');
+    input.value = value;
+    input.dispatchEvent(new Event('input', { bubbles: true }));
+    input.dispatchEvent(new Event('change', { bubbles: true }));
+    return 'success';
+}"""
+
+CLICK_LOGIN_JS = """() => {
+    const loginButton = document.querySelector('k-button#login-button');
+    if (!loginButton) {
+        return 'login_button_not_found';
+    }
+    
+    if (!loginButton.shadowRoot) {
+        return 'login_button_no_shadow_root';
+    }
+    
+    const button = loginButton.shadowRoot.querySelector('button#button');
+    if (!button) {
+        return 'button_not_found';
+    }
+    
+    button.click();
+    return 'success';
+}"""
+
+# Resolves as soon as the cookie consent overlay is gone or hidden, observed
+# with a MutationObserver instead of WebDriver polling; 'timeout' after
+# arguments[0] ms.
+OVERLAY_DISMISSED_JS = """
+const callback = arguments[arguments.length - 1];
+const cc = document.querySelector('k-cookie-consent');
+const dismissed = () => {
+    if (!cc || !cc.shadowRoot) return true;
+    const overlay = cc.shadowRoot.querySelector('div.overlay');
+    return !overlay || overlay.offsetParent === null;
+};
+if (dismissed()) {
+    return callback('dismissed');
+}
+let timer;
+const observer = new MutationObserver(() => {
+    if (dismissed()) {
+        observer.disconnect();
+        clearTimeout(timer);
+        callback('dismissed');
+    }
+});
+// Overlay removal shows up in the shadow root, hiding in attribute changes
+observer.observe(cc.shadowRoot, { childList: true, subtree: true, attributes: true });
+observer.observe(cc, { attributes: true });
+timer = setTimeout(() => {
+    observer.disconnect();
+    callback(dismissed() ? 'dismissed' : 'timeout');
+}, arguments[0]);
+"""
+
+# All three login steps in one WebDriver round trip. The click runs in a later
+# task, so the components have processed the input events before submitting.
+PERFORM_LOGIN_JS = f"""
+const callback = arguments[arguments.length - 1];
+const result = {{ login: ({FILL_LOGIN_JS})(arguments[0]) }};
+if (result.login !== 'success') {{
+    return callback(result);
+}}
+result.password = ({FILL_PASSWORD_JS})(arguments[1]);
+if (result.password !== 'success') {{
+    return callback(result);
+}}
+setTimeout(() => {{
+    result.click = ({CLICK_LOGIN_JS})();
+    callback(result);
+}}, 0);
+"""
+
+# Logged-in browsers handed back by clients created with keep_browser=True,
+# keyed by (login, password digest, headless, block_resources, debug); quit at
+# process exit. The digest keeps a wrong password from resuming a kept session
+_browser_pool_lock = threading.Lock()
+_browser_pool: Dict[Tuple[str, str, bool, bool, bool], webdriver.Chrome] = {}
+
+
+def _quit_pooled_browsers():
+    """Quit every browser left in the pool."""
+    with _browser_pool_lock:
+        drivers = list(_browser_pool.values())
+        _browser_pool.clear()
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug("Error quitting pooled browser: %s", e)
+
+
+atexit.register(_quit_pooled_browsers)
+
+# Upper bound on concurrent HTTP requests in get_readings_batch() after handover
+MAX_PARALLEL_REQUESTS = 4
+
+# Threads writing the per-request debug log files
+LOG_WRITE_WORKERS = 8
+
+# Resources that are not needed to log in or call the API (blocked via CDP)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+
+# Network.enable buffers in debug mode, large enough that API response bodies are
+# still held by Chrome when the debug saver asks for them with getResponseBody
+NETWORK_ENABLE_DEBUG_PARAMS = {
+    "maxResourceBufferSize": 1 << 24,
+    "maxTotalBufferSize": 1 << 26,
+}
+
+def _write_json_file(filepath: Path, data):
+    """
+    Write data as indented UTF-8 JSON, with orjson when it is installed.
+    
+    Args:
+        filepath: Target file
+        data: JSON-serializable value
+    """
+    if orjson is not None:
+        filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _write_log_file(filepath: Path, payload):
+    """
+    Write one debug log file: bytes as they are, anything else as JSON.
+    
+    Args:
+        filepath: Target file
+        payload: Raw bytes or a JSON-serializable value
+    """
+    if isinstance(payload, bytes):
+        filepath.write_bytes(payload)
+    else:
+        _write_json_file(filepath, payload)
+
+
+# Characters replaced when turning a URL into a log filename
+_URL_FILENAME_TABLE = str.maketrans({'/': '_', '?': '_', '&': '_', ':': '_'})
+
+# Network events that contribute to the detailed per-request logs
+_DETAILED_NETWORK_METHODS = frozenset({
+    "Network.requestWillBeSent",
+    "Network.responseReceived",
+    "Network.loadingFinished",
+    "Network.loadingFailed",
+    "Network.getResponseBodyResult",
+})
+
+# Row formats for the printed tables, parsed once
+_READING_ROW = "{:<20} {:<15} {:<15.3f} {:<15.3f} {:<10}".format
+
 
 class MPWiKBrowserClient:
     """Browser automation client for MPWiK Wrocław."""
@@ -37,6 +272,10 @@ class MPWiKBrowserClient:
     SITE_URL = "https://ebok.mpwik.wroc.pl"
     BASE_URL = "https://ebok.mpwik.wroc.pl/frontend-api/v1"
     
+    # ChromeDriver binary resolved by webdriver-manager, reused by later clients
+    _cached_driver_path: Optional[str] = None
+    _driver_path_lock = threading.Lock()
+    
     def __init__(
         self,
         login: str,
@@ -44,7 +283,12 @@ class MPWiKBrowserClient:
         headless: bool = True,
         log_dir: Optional[str] = None,
         browser: str = "chrome",
-        debug: bool = False
+        debug: bool = False,
+        session_file: Optional[str] = None,
+        block_resources: bool = True,
+        http_api: bool = False,
+        keep_browser: bool = False,
+        podmiot_id: Optional[str] = None
     ):
         """
         Initialize the browser-based MPWiK client.
@@ -56,14 +300,36 @@ class MPWiKBrowserClient:
             log_dir: Directory to save logs, HTML, and screenshots (default: ./logs)
             browser: Browser to use (currently only 'chrome' supported)
             debug: Enable debug mode (saves screenshots, HTML, and network logs) (default: False)
+            session_file: Optional JSON file to persist session cookies between runs.
+                When set, authenticate() first tries to restore the saved cookies and
+                only falls back to the full login flow if they are no longer valid.
+            block_resources: Skip loading images, fonts and analytics scripts (default: True)
+            http_api: After logging in, copy the session cookies into a requests.Session,
+                make all API calls over plain HTTPS and quit the browser (it is kept
+                open in debug mode) (default: False)
+            keep_browser: On close(), keep a logged-in browser for the next client with
+                the same login instead of quitting it; that client checks the session
+                with one API call and skips the login form (default: False)
+            podmiot_id: Podmiot ID that will be queried; saved and kept sessions are
+                validated against it and the HTTP session refers to its page (default: login)
         """
         self.login = login
+        self.podmiot_id = podmiot_id or login
         self.password = password
         self.headless = headless
         self.browser_type = browser
         self.driver = None
         self.authenticated = False
         self.debug = debug
+        self.session_file = Path(session_file) if session_file else None
+        self._session_recovered = False
+        self.block_resources = block_resources
+        self.http_api = http_api
+        self.keep_browser = keep_browser
+        # Whether the driver was taken from the browser pool (possibly still logged in)
+        self._driver_from_pool = False
+        # HTTP session holding the browser's cookies once http_api hands over
+        self._api_session: Optional[requests.Session] = None
         
         # Setup logging directory
         if log_dir is None:
@@ -75,7 +341,7 @@ class MPWiKBrowserClient:
         if self.debug:
             self.requests_log_dir = self.log_dir / "requests"
             self.requests_log_dir.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Request logs will be saved to: {self.requests_log_dir}")
+            logger.debug("Request logs will be saved to: %s", self.requests_log_dir)
         else:
             self.requests_log_dir = None
         
@@ -85,7 +351,13 @@ class MPWiKBrowserClient:
         # Counter for request logging
         self.request_counter = 0
         
-        logger.debug(f"Browser client initialized with log directory: {self.log_dir}")
+        # Parsed Network.* performance log events, shared by the network log savers:
+        # get_log() drains Chrome's buffer, so it is read once into here and each
+        # saver keeps its own read position
+        self._network_events: List[Dict] = []
+        self._network_event_cursors = {"summary": 0, "detailed": 0}
+        
+        logger.debug("Browser client initialized with log directory: %s", self.log_dir)
         
         # Configure verbose logging to go to files when debug is enabled
         if self.debug:
@@ -129,37 +401,33 @@ class MPWiKBrowserClient:
             logger.warning("Driver already initialized")
             return
         
+        if self.keep_browser:
+            with _browser_pool_lock:
+                self.driver = _browser_pool.pop(self._pool_key(), None)
+            if self.driver is not None:
+                logger.info("Reusing kept browser")
+                self._driver_from_pool = True
+                return
+        
         try:
             logger.info(f"Setting up {self.browser_type} driver...")
             
             if self.browser_type == "chrome":
-                options = Options()
-                
+                options = self._build_chrome_options()
                 if self.headless:
-                    options.add_argument("--headless=new")
                     logger.info("Running in headless mode")
                 
-                # Essential Chrome options for stability
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--window-size=1920,1080")
-                
-                # User agent to avoid detection
-                options.add_argument(
-                    "user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                    "(KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36"
-                )
-                
-                # Enable logging
-                options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
-                
                 # Install and setup ChromeDriver
-                service = Service(ChromeDriverManager().install())
+                service = Service(self._chromedriver_path())
                 self.driver = webdriver.Chrome(service=service, options=options)
+                self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+                self.driver.set_script_timeout(SCRIPT_TIMEOUT)
+                
+                # No implicit wait: element lookups use explicit WebDriverWait where
+                # waiting is needed, and optional elements are probed with find_elements()
                 
-                # Set implicit wait
-                self.driver.implicitly_wait(10)
+                if self.block_resources or self.debug:
+                    self._configure_network()
                 
                 logger.info("Chrome driver initialized successfully")
             else:
@@ -169,6 +437,80 @@ class MPWiKBrowserClient:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
     
+    def _pool_key(self) -> Tuple[str, str, bool, bool, bool]:
+        """Key of this client's browsers in the pool (debug decides the logging capability)."""
+        password_digest = hashlib.sha256(self.password.encode('utf-8')).hexdigest()
+        return (self.login, password_digest, self.headless, self.block_resources, self.debug)
+    
+    @classmethod
+    def _chromedriver_path(cls) -> str:
+        """
+        Resolve the ChromeDriver binary, asking webdriver-manager only once per process.
+        
+        ChromeDriverManager().install() checks its cache and may query the network
+        for version metadata, so the resolved path is kept while the file exists.
+        
+        Returns:
+            Path to the ChromeDriver executable
+        """
+        # Locked so concurrent clients (see MPWiKBrowserPool) resolve it only once
+        with cls._driver_path_lock:
+            path = cls._cached_driver_path
+            if path and os.path.isfile(path):
+                return path
+            path = ChromeDriverManager().install()
+            if isinstance(path, str):
+                cls._cached_driver_path = path
+            return path
+    
+    def _build_chrome_options(self) -> Options:
+        """
+        Build Chrome options from the module-level switch list.
+        
+        Returns:
+            Fresh Options instance for a new driver session
+        """
+        options = Options()
+        # Return from driver.get() at DOMContentLoaded; the login flow and API
+        # calls wait explicitly for what they need, not for every subresource
+        options.page_load_strategy = "eager"
+        if self.headless:
+            options.add_argument("--headless=new")
+        for arg in CHROME_ARGS:
+            options.add_argument(arg)
+        options.add_argument(f"user-agent={CHROME_USER_AGENT}")
+        
+        # Performance and console logs are only read by the debug savers; without
+        # them Chrome does not serialize every DevTools event into chromedriver's buffer
+        if self.debug:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+            # Only Network events are parsed; Page events are dropped by chromedriver
+            options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
+        # Don't download images - the login form and API calls don't need them
+        if self.block_resources:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option(
+                "prefs", {"profile.managed_default_content_settings.images": 2}
+            )
+        return options
+    
+    def _configure_network(self):
+        """
+        Enable the DevTools Network domain for resource blocking and debug capture.
+        
+        Blocked fonts, images and analytics requests never reach the performance
+        log, and debug mode enlarges the body buffers for the response saver.
+        """
+        try:
+            params = NETWORK_ENABLE_DEBUG_PARAMS if self.debug else {}
+            self.driver.execute_cdp_cmd("Network.enable", params)
+            if self.block_resources:
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+                logger.debug("Blocking %s resource URL patterns", len(BLOCKED_URL_PATTERNS))
+        except WebDriverException as e:
+            logger.warning(f"Could not configure network domain: {e}")
+    
     def _save_page_source(self, prefix: str = "page"):
         """Save current page HTML to log directory (only in debug mode)."""
         if not self.debug:
@@ -181,7 +523,7 @@ class MPWiKBrowserClient:
             with open(filepath, "w", encoding="utf-8") as f:
                 f.write(self.driver.page_source)
             
-            logger.debug(f"Page source saved to: {filepath}")
+            logger.debug("Page source saved to: %s", filepath)
             return filepath
         except Exception as e:
             logger.error(f"Failed to save page source: {e}")
@@ -197,12 +539,53 @@ class MPWiKBrowserClient:
             filepath = self.log_dir / filename
             
             self.driver.save_screenshot(str(filepath))
-            logger.debug(f"Screenshot saved to: {filepath}")
+            logger.debug("Screenshot saved to: %s", filepath)
             return filepath
         except Exception as e:
             logger.error(f"Failed to save screenshot: {e}")
             return None
     
+    def _drain_network_events(self, consumer: str) -> List[Dict]:
+        """
+        Read new performance log entries and return the Network events the consumer has not seen.
+        
+        Entries are only JSON-decoded when their raw text contains a quoted
+        "Network. prefix, which skips most Page/Runtime/DOM frames unparsed.
+        
+        Args:
+            consumer: Key of the reader in _network_event_cursors
+        
+        Returns:
+            List of {timestamp, level, method, params} dicts
+        """
+        for log_entry in self.driver.get_log("performance"):
+            raw = log_entry.get("message", "")
+            if '"Network.' not in raw:
+                continue
+            try:
+                msg = json.loads(raw)["message"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+            method = msg.get("method", "")
+            if method.startswith("Network."):
+                self._network_events.append({
+                    "timestamp": log_entry.get("timestamp"),
+                    "level": log_entry.get("level"),
+                    "method": method,
+                    "params": msg.get("params", {})
+                })
+        
+        events = self._network_events[self._network_event_cursors[consumer]:]
+        self._network_event_cursors[consumer] = len(self._network_events)
+        
+        # Drop events every consumer has read
+        consumed = min(self._network_event_cursors.values())
+        if consumed:
+            del self._network_events[:consumed]
+            for key in self._network_event_cursors:
+                self._network_event_cursors[key] -= consumed
+        return events
+    
     def _save_network_logs(self, prefix: str = "network"):
         """Save browser network logs to log directory (only in debug mode)."""
         if not self.debug:
@@ -212,34 +595,11 @@ class MPWiKBrowserClient:
             filename = f"{prefix}_{self.session_timestamp}.json"
             filepath = self.log_dir / filename
             
-            # Get performance logs
-            logs = self.driver.get_log("performance")
+            network_events = self._drain_network_events("summary")
             
-            # Process and filter relevant network events
-            network_events = []
-            for log_entry in logs:
-                try:
-                    message = json.loads(log_entry["message"])
-                    if "message" in message:
-                        msg = message["message"]
-                        method = msg.get("method", "")
-                        
-                        # Filter for network events
-                        if method.startswith("Network."):
-                            network_events.append({
-                                "timestamp": log_entry["timestamp"],
-                                "level": log_entry["level"],
-                                "method": method,
-                                "params": msg.get("params", {})
-                            })
-                except (json.JSONDecodeError, KeyError) as e:
-                    continue
+            _write_json_file(filepath, network_events)
             
-            # Save to file
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(network_events, f, indent=2)
-            
-            logger.debug(f"Network logs saved to: {filepath} ({len(network_events)} events)")
+            logger.debug("Network logs saved to: %s (%s events)", filepath, len(network_events))
             return filepath
         except Exception as e:
             logger.error(f"Failed to save network logs: {e}")
@@ -250,13 +610,13 @@ class MPWiKBrowserClient:
         try:
             # Execute JavaScript to get some header information
             user_agent = self.driver.execute_script("return navigator.userAgent;")
-            logger.debug(f"User-Agent: {user_agent}")
+            logger.debug("User-Agent: %s", user_agent)
             
             # Log cookies
             cookies = self.driver.get_cookies()
-            logger.debug(f"Cookies: {len(cookies)} cookie(s)")
+            logger.debug("Cookies: %s cookie(s)", len(cookies))
             for cookie in cookies:
-                logger.debug(f"  {cookie['name']} = {cookie['value'][:20]}...")
+                logger.debug("  %s = %s...", cookie['name'], cookie['value'][:20])
             
         except Exception as e:
             logger.error(f"Failed to log request headers: {e}")
@@ -271,21 +631,15 @@ class MPWiKBrowserClient:
             return []
         
         try:
-            # Get performance logs
-            logs = self.driver.get_log("performance")
-            
             # Create a mapping of request IDs to their data
             requests_map = {}
             
-            for log_entry in logs:
+            for event in self._drain_network_events("detailed"):
+                method = event["method"]
+                if method not in _DETAILED_NETWORK_METHODS:
+                    continue
                 try:
-                    message = json.loads(log_entry["message"])
-                    if "message" not in message:
-                        continue
-                    
-                    msg = message["message"]
-                    method = msg.get("method", "")
-                    params = msg.get("params", {})
+                    params = event["params"]
                     
                     # Handle Network.requestWillBeSent - captures request details
                     if method == "Network.requestWillBeSent":
@@ -295,7 +649,7 @@ class MPWiKBrowserClient:
                         if request_id not in requests_map:
                             requests_map[request_id] = {
                                 "request_id": request_id,
-                                "timestamp": log_entry["timestamp"],
+                                "timestamp": event["timestamp"],
                                 "url": request.get("url", ""),
                                 "method": request.get("method", ""),
                                 "headers": request.get("headers", {}),
@@ -353,7 +707,7 @@ class MPWiKBrowserClient:
                             requests_map[request_id]["response_body"] = params.get("body", "")
                             requests_map[request_id]["base64_encoded"] = params.get("base64Encoded", False)
                 
-                except (json.JSONDecodeError, KeyError) as e:
+                except (KeyError, AttributeError):
                     continue
             
             # Fetch response bodies for completed API requests
@@ -370,6 +724,7 @@ class MPWiKBrowserClient:
                     
                     mime_type = response.get("mime_type", "")
                     if "json" in mime_type or "text" in mime_type:
+                        short_url = url[:80]
                         try:
                             # Use Chrome DevTools Protocol to get response body
                             body_result = self.driver.execute_cdp_cmd("Network.getResponseBody", {
@@ -378,21 +733,24 @@ class MPWiKBrowserClient:
                             if body_result:
                                 request_data["response_body"] = body_result.get("body", "")
                                 request_data["base64_encoded"] = body_result.get("base64Encoded", False)
-                                logger.debug(f"Captured response body for: {url[:80]}")
+                                logger.debug("Captured response body for: %s", short_url)
                         except WebDriverException as e:
                             # This is expected when response body is no longer in Chrome's cache
                             # It commonly happens with the error "No resource with given identifier found"
                             # We can safely ignore this as the response was successful (status 200)
-                            error_msg = str(e)
-                            if "No resource with given identifier found" in error_msg:
-                                logger.debug(f"Response body already cleared from cache for: {url[:80]}")
-                            else:
-                                logger.debug(f"Could not get response body for {url[:80]}: {error_msg.split(chr(10))[0]}")
+                            if logger.isEnabledFor(logging.DEBUG):
+                                error_msg = str(e)
+                                if "No resource with given identifier found" in error_msg:
+                                    logger.debug("Response body already cleared from cache for: %s", short_url)
+                                else:
+                                    logger.debug("Could not get response body for %s: %s", short_url, error_msg.split(chr(10))[0])
                         except Exception as e:
-                            logger.debug(f"Could not get response body for {url[:80]}: {str(e).split(chr(10))[0]}")
+                            # Skip just this body; the remaining requests are still saved
+                            logger.debug("Could not get response body for %s: %r", short_url, e)
             
-            # Save each request to a separate file
-            saved_files = []
+            # Save each request to a separate file; the files are independent,
+            # so they are written concurrently once all names are assigned
+            pending_writes = []
             for request_id, request_data in requests_map.items():
                 # Only save requests to the MPWiK API or site
                 url = request_data.get("url", "")
@@ -402,18 +760,24 @@ class MPWiKBrowserClient:
                 self.request_counter += 1
                 
                 # Create a sanitized filename from the URL
-                url_path = url.replace("https://", "").replace("http://", "")
-                url_path = url_path.replace("/", "_").replace("?", "_").replace("&", "_")
-                url_path = url_path[:100]  # Limit length
+                url_path = url.split("://", 1)[-1].translate(_URL_FILENAME_TABLE)[:100]  # Limit length
                 
                 filename = f"{self.session_timestamp}_{self.request_counter:04d}_{request_data.get('method', 'GET')}_{url_path}.json"
                 filepath = self.requests_log_dir / filename
                 
-                # Save to file
-                with open(filepath, "w", encoding="utf-8") as f:
-                    json.dump(request_data, f, indent=2, ensure_ascii=False)
+                # Bodies go to their own file as raw bytes, referenced from the
+                # record, instead of being re-encoded inside the JSON
+                body = request_data.pop("response_body", None)
+                if body is not None:
+                    base64_encoded = request_data.pop("base64_encoded", False)
+                    body_bytes = self._decode_response_body(body, base64_encoded)
+                    body_path = self.requests_log_dir / "bodies" / f"{filepath.stem}.bin"
+                    request_data["response_body_ref"] = f"bodies/{body_path.name}"
+                    request_data["response_body_size"] = len(body_bytes)
+                    request_data["base64_encoded"] = base64_encoded
+                    pending_writes.append((body_path, body_bytes))
                 
-                saved_files.append(filepath)
+                pending_writes.append((filepath, request_data))
                 
                 # Log summary
                 method = request_data.get("method", "UNKNOWN")
@@ -421,9 +785,20 @@ class MPWiKBrowserClient:
                 if request_data.get("response"):
                     status = request_data["response"].get("status", "N/A")
                 
-                logger.debug(f"Saved request log: {method} {url[:80]} -> {status}")
+                logger.debug("Saving request log: %s %s -> %s", method, url[:80], status)
             
-            logger.debug(f"Saved {len(saved_files)} detailed request logs to: {self.requests_log_dir}")
+            if any(isinstance(payload, bytes) for _, payload in pending_writes):
+                (self.requests_log_dir / "bodies").mkdir(exist_ok=True)
+            if len(pending_writes) > 1:
+                with ThreadPoolExecutor(max_workers=min(len(pending_writes), LOG_WRITE_WORKERS)) as executor:
+                    # list() re-raises the first failed write
+                    list(executor.map(lambda item: _write_log_file(*item), pending_writes))
+            else:
+                for filepath, payload in pending_writes:
+                    _write_log_file(filepath, payload)
+            saved_files = [filepath for filepath, payload in pending_writes if not isinstance(payload, bytes)]
+            
+            logger.debug("Saved %s detailed request logs to: %s", len(saved_files), self.requests_log_dir)
             return saved_files
             
         except Exception as e:
@@ -431,6 +806,216 @@ class MPWiKBrowserClient:
             logger.exception("Exception details:")
             return []
     
+    @staticmethod
+    def _decode_response_body(body: str, base64_encoded: bool) -> bytes:
+        """
+        Turn a CDP response body into the bytes that were received.
+        
+        Args:
+            body: Body as returned by Network.getResponseBody
+            base64_encoded: Whether Chrome base64-encoded it (binary content)
+        
+        Returns:
+            Raw body bytes (the base64 text itself if it does not decode)
+        """
+        if base64_encoded:
+            try:
+                return base64.b64decode(body, validate=True)
+            except (binascii.Error, ValueError):
+                pass
+        return body.encode("utf-8")
+    
+    def _save_session(self):
+        """Save current browser cookies to the session file (if configured)."""
+        if self.session_file is None:
+            return
+        
+        try:
+            cookies = self.driver.get_cookies()
+            self.session_file.parent.mkdir(parents=True, exist_ok=True)
+            # Session cookies are credentials: keep the file private to the user
+            fd = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cookies, f, indent=2)
+            logger.debug("Session cookies saved to: %s (%s cookies)", self.session_file, len(cookies))
+        except Exception as e:
+            logger.warning(f"Failed to save session cookies: {e}")
+    
+    def _restore_session(self) -> bool:
+        """
+        Restore cookies from the session file and verify that the session is still valid.
+        
+        Returns:
+            True if the restored session is authenticated, False otherwise
+        """
+        if self.session_file is None or not self.session_file.exists():
+            return False
+        
+        try:
+            with open(self.session_file, "r", encoding="utf-8") as f:
+                cookies = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read session file {self.session_file}: {e}")
+            return False
+        
+        try:
+            logger.info("Restoring saved session cookies...")
+            # Cookies can only be added for the domain that is currently loaded
+            self.driver.get(self.SITE_URL)
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except WebDriverException as e:
+                    logger.debug("Skipping cookie %s: %s", cookie.get('name'), e)
+            
+            status = self._probe_session()
+            if status == 200:
+                logger.info("✓ Saved session is still valid, skipping login")
+                self.authenticated = True
+                return True
+            
+            logger.info(f"Saved session is no longer valid (status {status}), logging in again")
+            self.driver.delete_all_cookies()
+            return False
+        
+        except WebDriverException as e:
+            logger.warning(f"Failed to restore saved session: {e}")
+            return False
+    
+    def _finish_login(self) -> bool:
+        """
+        Complete a successful login, handing the session over to HTTP if http_api is set.
+        
+        Returns:
+            True (the login itself has succeeded)
+        """
+        if self.http_api:
+            try:
+                self._start_api_session()
+            except WebDriverException as e:
+                logger.warning(f"Could not hand the session over to HTTP, keeping the browser: {e}")
+        return True
+    
+    def _start_api_session(self):
+        """
+        Copy the browser's cookies into a requests.Session used for all later API calls.
+        Unless debug is on, the browser is quit afterwards.
+        """
+        # The consumption page sets up the server-side API session context
+        self._ensure_consumption_page(self.podmiot_id)
+        session = requests.Session()
+        session.headers.update({
+            'Accept': 'application/json',
+            'Content-Type': 'application/json',
+            'User-Agent': CHROME_USER_AGENT,
+            'Origin': self.SITE_URL,
+            'Referer': f"{self.SITE_URL}/trust/zuzycie-wody?p={self.podmiot_id}",
+        })
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain'), path=cookie.get('path', '/')
+            )
+        self._api_session = session
+        logger.info("Session handed over to HTTP client (%s cookies)", len(session.cookies))
+        if not self.debug:
+            self._quit_driver()
+    
+    def _api_get_json(self, url: str, recover: bool = True) -> Optional[Dict]:
+        """
+        GET an API URL over the handed-over HTTP session.
+        
+        Args:
+            url: Full API URL
+            recover: Log in again once if the session was rejected (401/403)
+        
+        Returns:
+            Decoded JSON response, or None if the request failed
+        """
+        try:
+            response = self._api_session.get(url, timeout=SCRIPT_TIMEOUT)
+            if response.status_code in (401, 403) and recover:
+                logger.warning(f"HTTP session rejected (status {response.status_code})")
+                if self._recover_session() and self._api_session is not None:
+                    return self._api_get_json(url, recover=False)
+                return None
+            response.raise_for_status()
+            data = response.json()
+            self._session_recovered = False
+            return data
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"API request failed: {e}")
+            logger.error(f"Request URL was: {url}")
+            return None
+    
+    def _probe_session(self) -> int:
+        """
+        Load the page that establishes API session context, then probe the API.
+        
+        Returns:
+            HTTP status of the probe (0 if it failed, 401 if redirected to the login page)
+        """
+        self.driver.get(f"{self.SITE_URL}/trust/zuzycie-wody?p={self.podmiot_id}")
+        status = self.driver.execute_async_script("""
+            const callback = arguments[arguments.length - 1];
+            fetch(arguments[0], {
+                method: 'GET',
+                credentials: 'include',
+                headers: {
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json'
+                }
+            })
+            .then(response => callback(response.status))
+            .catch(() => callback(0));
+        """, f"{self.BASE_URL}/podmioty/{self.podmiot_id}/punkty-sieci?status=AKTYWNE")
+        if status == 200 and "/login" in self.driver.current_url:
+            return 401
+        return status
+    
+    def _resume_pooled_session(self) -> bool:
+        """
+        Check whether a browser taken from the pool is still logged in.
+        
+        Returns:
+            True if its session is still valid, False otherwise
+        """
+        if not self._driver_from_pool:
+            return False
+        self._driver_from_pool = False
+        try:
+            status = self._probe_session()
+        except WebDriverException as e:
+            logger.info(f"Kept browser is no longer usable, starting a new one: {e}")
+            self._quit_driver()
+            self._setup_driver()
+            return False
+        if status == 200:
+            logger.info("✓ Kept browser is still logged in, skipping login")
+            self.authenticated = True
+            return True
+        logger.info(f"Kept browser session expired (status {status}), logging in again")
+        return False
+    
+    def _recover_session(self) -> bool:
+        """
+        Restart the browser and re-authenticate after the WebDriver session was lost.
+        Only one recovery is attempted until the next successful API call.
+        
+        Returns:
+            True if a new authenticated session was established, False otherwise
+        """
+        if self._session_recovered:
+            logger.error("Browser session lost again right after recovery, giving up")
+            return False
+        
+        logger.warning("Browser session lost, restarting browser and re-authenticating...")
+        self._session_recovered = True
+        # Not authenticated any more, so close() quits the browser instead of keeping it
+        self.authenticated = False
+        self.close()
+        return self.authenticate()
+    
     def _fill_login_field(self, login_value: str) -> bool:
         """
         Fill the login field with the provided value.
@@ -442,27 +1027,8 @@ class MPWiKBrowserClient:
         Returns:
             True if successful, False otherwise
         """
-        script = """
-        const loginField = document.querySelector('k-login-field');
-        if (!loginField) {
-            return 'login_field_not_found';
-        }
-        
-        const input = loginField.querySelector('input.mdc-text-field__input');
-        if (!input) {
-            return 'input_not_found';
-        }
-        
-        input.removeAttribute('readonly');
-        input.removeAttribute('disabled');
-        input.value = arguments[0];
-        input.dispatchEvent(new Event('input', { bubbles: true }));
-        input.dispatchEvent(new Event('change', { bubbles: true }));
-        return 'success';
-        """
-        
         try:
-            result = self.driver.execute_script(script, login_value)
+            result = self.driver.execute_script(f"return ({FILL_LOGIN_JS})(arguments[0]);", login_value)
             if result == 'success':
                 logger.info("✓ Login entered successfully")
                 return True
@@ -489,40 +1055,8 @@ class MPWiKBrowserClient:
         Returns:
             True if successful, False otherwise
         """
-        script = """
-        const passwordField = document.querySelector('k-current-password');
-        if (!passwordField) {
-            return 'password_field_not_found';
-        }
-        
-        if (!passwordField.shadowRoot) {
-            return 'password_field_no_shadow_root';
-        }
-        
-        const mwcTextField = passwordField.shadowRoot.querySelector('mwc-textfield');
-        if (!mwcTextField) {
-            return 'mwc_textfield_not_found';
-        }
-        
-        if (!mwcTextField.shadowRoot) {
-            return 'mwc_textfield_no_shadow_root';
-        }
-        
-        const input = mwcTextField.shadowRoot.querySelector('input.mdc-text-field__input');
-        if (!input) {
-            return 'input_not_found';
-        }
-        
-        input.removeAttribute('readonly');
-        input.removeAttribute('disabled');
-        input.value = arguments[0];
-        input.dispatchEvent(new Event('input', { bubbles: true }));
-        input.dispatchEvent(new Event('change', { bubbles: true }));
-        return 'success';
-        """
-        
         try:
-            result = self.driver.execute_script(script, password_value)
+            result = self.driver.execute_script(f"return ({FILL_PASSWORD_JS})(arguments[0]);", password_value)
             if result == 'success':
                 logger.info("✓ Password entered successfully via nested shadow DOM")
                 return True
@@ -546,27 +1080,8 @@ class MPWiKBrowserClient:
         Returns:
             True if successful, False otherwise
         """
-        script = """
-        const loginButton = document.querySelector('k-button#login-button');
-        if (!loginButton) {
-            return 'login_button_not_found';
-        }
-        
-        if (!loginButton.shadowRoot) {
-            return 'login_button_no_shadow_root';
-        }
-        
-        const button = loginButton.shadowRoot.querySelector('button#button');
-        if (!button) {
-            return 'button_not_found';
-        }
-        
-        button.click();
-        return 'success';
-        """
-        
         try:
-            result = self.driver.execute_script(script)
+            result = self.driver.execute_script(f"return ({CLICK_LOGIN_JS})();")
             if result == 'success':
                 logger.info("✓ Login button clicked successfully via shadow DOM")
                 return True
@@ -581,11 +1096,56 @@ class MPWiKBrowserClient:
             self._save_screenshot("login_button_click_exception")
             return False
     
+    def _perform_login_dom(self, login_value: str, password_value: str) -> bool:
+        """
+        Fill both credentials and click the login button in a single script call.
+        
+        Args:
+            login_value: The login value to enter
+            password_value: The password value to enter
+        
+        Returns:
+            True if all three steps succeeded, False otherwise
+        """
+        try:
+            result = self.driver.execute_async_script(PERFORM_LOGIN_JS, login_value, password_value)
+        except Exception as e:
+            logger.error(f"Exception while submitting the login form: {e}")
+            self._save_page_source("login_form_exception")
+            self._save_screenshot("login_form_exception")
+            return False
+        
+        for step in ("login", "password", "click"):
+            outcome = (result or {}).get(step)
+            if outcome != 'success':
+                logger.error(f"Failed to submit the login form at the {step} step - {outcome}")
+                self._save_page_source(f"login_form_{step}_failed")
+                self._save_screenshot(f"login_form_{step}_failed")
+                return False
+        logger.info("✓ Credentials entered and login button clicked")
+        return True
+    
+    def _wait_for_overlay_dismissed(self, timeout_ms: int = 10000) -> bool:
+        """
+        Wait in the page for the cookie consent overlay to go away.
+        
+        Args:
+            timeout_ms: How long the page-side observer waits, in milliseconds
+        
+        Returns:
+            True if the overlay is gone or hidden, False if it is still visible
+        """
+        return self.driver.execute_async_script(OVERLAY_DISMISSED_JS, timeout_ms) == 'dismissed'
+    
     def authenticate(self, max_wait: int = 120) -> bool:
         """
         Authenticate with the MPWiK website using browser automation.
         Allows time for manual reCAPTCHA solving if needed.
         
+        The driver does not use an implicit wait, so optional elements (reCAPTCHA,
+        error banners) are checked without blocking and max_wait is the only budget
+        spent waiting for the post-login navigation.
+        
         Args:
             max_wait: Maximum time to wait for authentication (seconds)
             
@@ -597,12 +1157,15 @@ class MPWiKBrowserClient:
             if self.driver is None:
                 self._setup_driver()
             
+            # Try a kept browser or a previously saved session before doing the full login
+            if self._resume_pooled_session() or self._restore_session():
+                return self._finish_login()
+            
             logger.info("Navigating to login page...")
+            # driver.get() returns once the document has loaded; the elements
+            # used below are waited for explicitly
             self.driver.get(f"{self.SITE_URL}/login")
             
-            # Wait for page to load
-            time.sleep(2)
-            
             # Save initial page state
             self._save_page_source("login_page_initial")
             self._save_screenshot("login_page_initial")
@@ -625,8 +1188,14 @@ class MPWiKBrowserClient:
                     )
                     logger.info("Cookie consent component detected")
                     
-                    # Wait a bit for shadow DOM to be ready
-                    time.sleep(1)
+                    # Wait until the accept button is rendered in the shadow DOM
+                    try:
+                        wait_overlay.until(lambda d: d.execute_script("""
+                            const cc = document.querySelector('k-cookie-consent');
+                            return !!(cc && cc.shadowRoot && cc.shadowRoot.querySelector('k-button[label="Akceptuj"]'));
+                        """))
+                    except TimeoutException:
+                        logger.debug("Cookie consent button did not render in time")
                     
                     # Use JavaScript to access shadow DOM and click the button
                     try:
@@ -653,20 +1222,11 @@ class MPWiKBrowserClient:
                             logger.info("✓ Cookie button clicked via shadow DOM")
                             
                             # Wait for overlay to disappear
-                            try:
-                                logger.info("Waiting for overlay to disappear...")
-                                # Check if overlay is gone by trying to find it
-                                WebDriverWait(self.driver, 10).until(
-                                    lambda d: d.execute_script("""
-                                        const cc = document.querySelector('k-cookie-consent');
-                                        if (!cc || !cc.shadowRoot) return true;
-                                        const overlay = cc.shadowRoot.querySelector('div.overlay');
-                                        return !overlay || overlay.offsetParent === null;
-                                    """)
-                                )
+                            logger.info("Waiting for overlay to disappear...")
+                            if self._wait_for_overlay_dismissed():
                                 logger.info("✓ Cookie consent overlay dismissed successfully")
                                 self._save_screenshot("after_cookie_consent")
-                            except TimeoutException:
+                            else:
                                 logger.warning("Overlay still visible after clicking - continuing anyway")
                                 self._save_screenshot("overlay_still_visible")
                         else:
@@ -696,31 +1256,22 @@ class MPWiKBrowserClient:
                 self._save_screenshot("login_field_not_found")
                 return False
             
-            # Wait a bit for components to be ready
-            time.sleep(2)
-            
-            logger.info("Entering credentials...")
-            
-            # Enter login using helper method
-            if not self._fill_login_field(self.login):
-                return False
-            
-            time.sleep(0.5)
-            
-            # Enter password using helper method
-            if not self._fill_password_field(self.password):
-                return False
-            
-            time.sleep(0.5)
-            
-            self._save_screenshot("credentials_entered")
+            # Wait until both inputs are rendered (the password one inside nested shadow roots)
+            try:
+                wait.until(lambda d: d.execute_script("""
+                    const pw = document.querySelector('k-current-password');
+                    const tf = pw && pw.shadowRoot && pw.shadowRoot.querySelector('mwc-textfield');
+                    return !!(document.querySelector('k-login-field input.mdc-text-field__input')
+                        && tf && tf.shadowRoot && tf.shadowRoot.querySelector('input.mdc-text-field__input'));
+                """))
+            except TimeoutException:
+                logger.warning("Login inputs not ready in time - trying anyway")
             
             # Check for reCAPTCHA
-            try:
-                recaptcha_element = self.driver.find_element(By.CLASS_NAME, "g-recaptcha")
+            if self.driver.find_elements(By.CLASS_NAME, "g-recaptcha"):
                 logger.warning("reCAPTCHA detected on page")
                 logger.info("If running in non-headless mode, please solve the reCAPTCHA manually")
-            except NoSuchElementException:
+            else:
                 logger.info("No visible reCAPTCHA element found")
             
             # Wait for k-button element to be present
@@ -733,10 +1284,15 @@ class MPWiKBrowserClient:
                 self._save_screenshot("login_button_not_found")
                 return False
             
-            time.sleep(0.5)
-            
-            # Click login button using helper method
-            if not self._click_login_button():
+            logger.info("Entering credentials...")
+            if self.debug:
+                # Step by step, so the filled form can be captured before submitting
+                if not (self._fill_login_field(self.login) and self._fill_password_field(self.password)):
+                    return False
+                self._save_screenshot("credentials_entered")
+                if not self._click_login_button():
+                    return False
+            elif not self._perform_login_dom(self.login, self.password):
                 return False
             
             # Give the browser a moment to send the POST request before navigation
@@ -755,7 +1311,7 @@ class MPWiKBrowserClient:
             while time.time() - start_time < max_wait:
                 # Check if we're on a different page (successful login)
                 current_url = self.driver.current_url
-                logger.debug(f"Current URL: {current_url}")
+                logger.debug("Current URL: %s", current_url)
                 
                 # Success indicators
                 if "/login" not in current_url or "dashboard" in current_url or "podmioty" in current_url:
@@ -769,29 +1325,27 @@ class MPWiKBrowserClient:
                     self._save_detailed_network_logs("post_login")
                     
                     # Check for error messages
-                    try:
-                        error_element = self.driver.find_element(By.CSS_SELECTOR, ".error, .alert-danger, [class*='error']")
-                        error_text = error_element.text
+                    error_elements = self.driver.find_elements(By.CSS_SELECTOR, ".error, .alert-danger, [class*='error']")
+                    if error_elements:
+                        error_text = error_elements[0].text
                         logger.error(f"Login error detected: {error_text}")
                         self._save_screenshot("login_error")
                         return False
-                    except NoSuchElementException:
-                        # No error found - likely successful
-                        logger.info("Authentication successful!")
-                        self.authenticated = True
-                        return True
+                    
+                    # No error found - likely successful
+                    logger.info("Authentication successful!")
+                    self.authenticated = True
+                    self._save_session()
+                    return self._finish_login()
                 
                 # Check for error messages on login page
-                try:
-                    error_element = self.driver.find_element(By.CSS_SELECTOR, ".error, .alert-danger, [class*='error']")
-                    error_text = error_element.text
-                    if error_text:
-                        logger.error(f"Login error: {error_text}")
-                        self._save_page_source("login_error")
-                        self._save_screenshot("login_error")
-                        return False
-                except NoSuchElementException:
-                    pass
+                error_elements = self.driver.find_elements(By.CSS_SELECTOR, ".error, .alert-danger, [class*='error']")
+                if error_elements and error_elements[0].text:
+                    error_text = error_elements[0].text
+                    logger.error(f"Login error: {error_text}")
+                    self._save_page_source("login_error")
+                    self._save_screenshot("login_error")
+                    return False
                 
                 time.sleep(2)
             
@@ -811,6 +1365,45 @@ class MPWiKBrowserClient:
                 pass
             return False
     
+    def _ensure_consumption_page(self, podmiot_id: str):
+        """
+        Navigate to the water consumption page if the browser is not already there.
+        This sets up X-AccountId, X-Nav-Id, X-SessionId headers needed for API calls.
+        """
+        current_url = self.driver.current_url
+        consumption_page_url = f"{self.SITE_URL}/trust/zuzycie-wody?p={podmiot_id}"
+        
+        if "zuzycie-wody" not in current_url or f"p={podmiot_id}" not in current_url:
+            logger.debug("Navigating to water consumption page: %s", consumption_page_url)
+            self.driver.get(consumption_page_url)
+            
+            # Wait for page to load and session to be established
+            # Give it more time to ensure all session headers are set
+            time.sleep(3)
+            logger.debug("Page loaded, current URL: %s", self.driver.current_url)
+        else:
+            logger.debug("Already on water consumption page: %s", current_url)
+    
+    def _build_readings_url(
+        self,
+        podmiot_id: str,
+        punkt_sieci: str,
+        date_from: datetime,
+        date_to: datetime,
+        reading_type: str
+    ) -> str:
+        """Construct the readings API URL with properly encoded parameters."""
+        endpoint = "dobowe" if reading_type == "daily" else "godzinowe"
+        date_from_str = date_from.strftime('%Y-%m-%dT%H:%M:%S')
+        date_to_str = date_to.strftime('%Y-%m-%dT%H:%M:%S')
+        
+        # URL encode the datetime parameters (colons become %3A)
+        return (
+            f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci/{punkt_sieci}"
+            f"/odczyty/{endpoint}?dataOd={quote(date_from_str)}"
+            f"&dataDo={quote(date_to_str)}"
+        )
+    
     def get_readings_from_api(
         self,
         podmiot_id: str,
@@ -836,40 +1429,22 @@ class MPWiKBrowserClient:
             logger.error("Not authenticated. Call authenticate() first.")
             return None
         
+        if self._api_session is not None:
+            api_url = self._build_readings_url(podmiot_id, punkt_sieci, date_from, date_to, reading_type)
+            logger.info("Fetching %s readings over HTTP...", reading_type)
+            data = self._api_get_json(api_url)
+            if data is None:
+                return None
+            readings = data.get("odczyty", [])
+            logger.info("Retrieved %s %s readings", len(readings), reading_type)
+            return readings
+        
         try:
-            from urllib.parse import quote
-            import time
+            self._ensure_consumption_page(podmiot_id)
+            api_url = self._build_readings_url(podmiot_id, punkt_sieci, date_from, date_to, reading_type)
             
-            # Navigate to water consumption page if not already there
-            # This sets up X-AccountId, X-Nav-Id, X-SessionId headers needed for API calls
-            current_url = self.driver.current_url
-            consumption_page_url = f"{self.SITE_URL}/trust/zuzycie-wody?p={podmiot_id}"
-            
-            if "zuzycie-wody" not in current_url or f"p={podmiot_id}" not in current_url:
-                logger.debug(f"Navigating to water consumption page: {consumption_page_url}")
-                self.driver.get(consumption_page_url)
-                
-                # Wait for page to load and session to be established
-                # Give it more time to ensure all session headers are set
-                time.sleep(3)
-                logger.debug(f"Page loaded, current URL: {self.driver.current_url}")
-            else:
-                logger.debug(f"Already on water consumption page: {current_url}")
-            
-            # Construct API URL with properly encoded parameters
-            endpoint = "dobowe" if reading_type == "daily" else "godzinowe"
-            date_from_str = date_from.strftime('%Y-%m-%dT%H:%M:%S')
-            date_to_str = date_to.strftime('%Y-%m-%dT%H:%M:%S')
-            
-            # URL encode the datetime parameters (colons become %3A)
-            api_url = (
-                f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci/{punkt_sieci}"
-                f"/odczyty/{endpoint}?dataOd={quote(date_from_str)}"
-                f"&dataDo={quote(date_to_str)}"
-            )
-            
-            logger.info(f"Fetching {reading_type} readings via browser...")
-            logger.info(f"API URL: {api_url}")
+            logger.info("Fetching %s readings via browser...", reading_type)
+            logger.info("API URL: %s", api_url)
             
             # Use JavaScript fetch API to get JSON directly instead of navigating
             # This avoids Chrome's JSON viewer HTML wrapper
@@ -912,35 +1487,37 @@ class MPWiKBrowserClient:
                 });
             """, api_url)
             
-            # Log browser console output for debugging
-            try:
-                browser_logs = self.driver.get_log('browser')
-                if browser_logs:
-                    logger.debug("Browser console logs:")
-                    for log_entry in browser_logs[-10:]:  # Last 10 entries
-                        logger.debug(f"  [{log_entry['level']}] {log_entry['message']}")
-            except Exception as e:
-                logger.debug(f"Could not retrieve browser logs: {e}")
+            # Log browser console output for debugging (an extra WebDriver round-trip,
+            # so only done in debug mode)
+            if self.debug:
+                try:
+                    browser_logs = self.driver.get_log('browser')
+                    if browser_logs:
+                        logger.debug("Browser console logs:")
+                        for log_entry in browser_logs[-10:]:  # Last 10 entries
+                            logger.debug("  [%s] %s", log_entry['level'], log_entry['message'])
+                except Exception as e:
+                    logger.debug("Could not retrieve browser logs: %s", e)
             
             # Save detailed network logs for this API call (including failed requests)
             try:
-                logger.debug(f"Saving detailed request/response logs for {reading_type} API call...")
+                logger.debug("Saving detailed request/response logs for %s API call...", reading_type)
                 self._save_detailed_network_logs(f"api_{reading_type}")
             except Exception as e:
-                logger.debug(f"Could not save detailed network logs: {e}")
+                logger.debug("Could not save detailed network logs: %s", e)
             
             if result.get('success'):
                 data = result.get('data', {})
                 
                 # Extract readings
                 readings = data.get("odczyty", [])
-                logger.info(f"Retrieved {len(readings)} {reading_type} readings")
+                logger.info("Retrieved %s %s readings", len(readings), reading_type)
+                self._session_recovered = False
                 
                 # Save the readings to a file (debug mode only)
                 if self.debug:
                     readings_file = self.log_dir / f"readings_{reading_type}_{self.session_timestamp}.json"
-                    with open(readings_file, "w", encoding="utf-8") as f:
-                        json.dump(readings, f, indent=2, ensure_ascii=False)
+                    _write_json_file(readings_file, readings)
                     logger.info(f"Readings saved to: {readings_file}")
                 
                 return readings
@@ -954,6 +1531,10 @@ class MPWiKBrowserClient:
                 
                 return None
                 
+        except InvalidSessionIdException:
+            if self._recover_session():
+                return self.get_readings_from_api(podmiot_id, punkt_sieci, date_from, date_to, reading_type)
+            return None
         except Exception as e:
             logger.error(f"Failed to fetch readings: {e}")
             logger.exception("Full exception details:")
@@ -983,6 +1564,15 @@ class MPWiKBrowserClient:
             logger.error("Not authenticated. Call authenticate() first.")
             return None
         
+        if self._api_session is not None:
+            logger.info("Fetching network points for podmiot %s over HTTP...", podmiot_id)
+            data = self._api_get_json(f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci?status={status}")
+            if data is None:
+                return None
+            punkty = data.get("punkty", [])
+            logger.info("Retrieved %s network points", len(punkty))
+            return punkty
+        
         try:
             import time
             
@@ -991,15 +1581,15 @@ class MPWiKBrowserClient:
             current_url = self.driver.current_url
             if "zuzycie-wody" not in current_url and "trust" not in current_url:
                 consumption_page_url = f"{self.SITE_URL}/trust/zuzycie-wody?p={podmiot_id}"
-                logger.debug(f"Navigating to water consumption page: {consumption_page_url}")
+                logger.debug("Navigating to water consumption page: %s", consumption_page_url)
                 self.driver.get(consumption_page_url)
                 time.sleep(2)
             
             # Construct API URL
             api_url = f"{self.BASE_URL}/podmioty/{podmiot_id}/punkty-sieci?status={status}"
             
-            logger.info(f"Fetching network points for podmiot {podmiot_id} via browser...")
-            logger.debug(f"API URL: {api_url}")
+            logger.info("Fetching network points for podmiot %s via browser...", podmiot_id)
+            logger.debug("API URL: %s", api_url)
             
             # Use JavaScript fetch API to get JSON directly instead of navigating
             # This avoids Chrome's JSON viewer HTML wrapper
@@ -1033,13 +1623,13 @@ class MPWiKBrowserClient:
                 
                 # Extract punkty
                 punkty = data.get("punkty", [])
-                logger.info(f"Retrieved {len(punkty)} network points")
+                logger.info("Retrieved %s network points", len(punkty))
+                self._session_recovered = False
                 
                 # Save the punkty to a file (debug mode only)
                 if self.debug:
                     punkty_file = self.log_dir / f"punkty_sieci_{self.session_timestamp}.json"
-                    with open(punkty_file, "w", encoding="utf-8") as f:
-                        json.dump(punkty, f, indent=2, ensure_ascii=False)
+                    _write_json_file(punkty_file, punkty)
                     logger.info(f"Network points saved to: {punkty_file}")
                 
                 return punkty
@@ -1048,6 +1638,10 @@ class MPWiKBrowserClient:
                 logger.error(f"Failed to fetch network points via JavaScript: {error}")
                 return None
                 
+        except InvalidSessionIdException:
+            if self._recover_session():
+                return self.get_punkty_sieci(podmiot_id, status)
+            return None
         except Exception as e:
             logger.error(f"Failed to fetch network points: {e}")
             logger.exception("Full exception details:")
@@ -1082,16 +1676,128 @@ class MPWiKBrowserClient:
             podmiot_id, punkt_sieci, date_from, date_to, "hourly"
         )
     
+    def get_readings_batch(
+        self,
+        podmiot_id: str,
+        punkt_sieci: str,
+        queries: List[Tuple[str, datetime, datetime]]
+    ) -> List[Optional[List[Dict]]]:
+        """
+        Fetch several reading ranges in a single browser round-trip.
+        All requests are issued concurrently from the page with Promise.all.
+        
+        Args:
+            podmiot_id: Entity ID
+            punkt_sieci: Network point ID
+            queries: List of (reading_type, date_from, date_to) tuples,
+                where reading_type is "daily" or "hourly"
+        
+        Returns:
+            List of readings (or None for a failed query), in the same order as queries
+        """
+        if not self.authenticated:
+            logger.error("Not authenticated. Call authenticate() first.")
+            return [None] * len(queries)
+        
+        if self._api_session is not None:
+            api_urls = [
+                self._build_readings_url(podmiot_id, punkt_sieci, date_from, date_to, reading_type)
+                for reading_type, date_from, date_to in queries
+            ]
+            logger.info("Fetching %s reading ranges over HTTP...", len(api_urls))
+            # Concurrent requests share the session's keep-alive pool; a rejected
+            # session is not recovered from the worker threads
+            with ThreadPoolExecutor(max_workers=min(len(api_urls), MAX_PARALLEL_REQUESTS) or 1) as executor:
+                results = list(executor.map(lambda url: self._api_get_json(url, recover=False), api_urls))
+            return [data.get("odczyty", []) if data is not None else None for data in results]
+        
+        try:
+            self._ensure_consumption_page(podmiot_id)
+            api_urls = [
+                self._build_readings_url(podmiot_id, punkt_sieci, date_from, date_to, reading_type)
+                for reading_type, date_from, date_to in queries
+            ]
+            
+            logger.info("Fetching %s reading ranges via browser...", len(api_urls))
+            for api_url in api_urls:
+                logger.debug("API URL: %s", api_url)
+            
+            results = self.driver.execute_async_script("""
+                const callback = arguments[arguments.length - 1];
+                const urls = arguments[0];
+                
+                Promise.all(urls.map(url =>
+                    fetch(url, {
+                        method: 'GET',
+                        credentials: 'include',
+                        headers: {
+                            'Accept': 'application/json',
+                            'Content-Type': 'application/json'
+                        }
+                    })
+                    .then(response => {
+                        if (!response.ok) {
+                            return response.text().then(text => {
+                                throw new Error('HTTP error ' + response.status + ': ' + text);
+                            });
+                        }
+                        return response.json();
+                    })
+                    .then(data => ({ success: true, data: data }))
+                    .catch(error => ({ success: false, error: error.message }))
+                )).then(callback);
+            """, api_urls)
+            
+            self._save_detailed_network_logs("api_batch")
+            
+            readings_list = []
+            for (reading_type, _, _), api_url, result in zip(queries, api_urls, results):
+                if result.get('success'):
+                    readings = result.get('data', {}).get("odczyty", [])
+                    logger.info("Retrieved %s %s readings", len(readings), reading_type)
+                    readings_list.append(readings)
+                else:
+                    logger.error(f"Failed to fetch {reading_type} readings via JavaScript: {result.get('error', 'Unknown error')}")
+                    logger.error(f"Request URL was: {api_url}")
+                    readings_list.append(None)
+            
+            self._session_recovered = False
+            return readings_list
+        
+        except InvalidSessionIdException:
+            if self._recover_session():
+                return self.get_readings_batch(podmiot_id, punkt_sieci, queries)
+            return [None] * len(queries)
+        except Exception as e:
+            logger.error(f"Failed to fetch readings batch: {e}")
+            logger.exception("Full exception details:")
+            return [None] * len(queries)
+    
     def close(self):
-        """Close the browser and cleanup."""
+        """Close the browser (or keep it for reuse with keep_browser) and cleanup."""
+        if self.keep_browser and self.authenticated and self.driver is not None:
+            with _browser_pool_lock:
+                if self._pool_key() not in _browser_pool:
+                    _browser_pool[self._pool_key()] = self.driver
+                    self.driver = None
+                    logger.info("Keeping browser for reuse")
+        self._quit_driver()
+        if self._api_session is not None:
+            self._api_session.close()
+            self._api_session = None
+        self.authenticated = False
+    
+    def _quit_driver(self):
+        """Quit the browser, keeping any handed-over HTTP session."""
         if self.driver is not None:
             try:
                 logger.info("Closing browser...")
                 self.driver.quit()
-                self.driver = None
-                self.authenticated = False
             except Exception as e:
                 logger.error(f"Error closing browser: {e}")
+            finally:
+                # Drop the driver even if quit() failed (e.g. the session was already gone)
+                self.driver = None
     
     def print_readings(self, readings: List[Dict], reading_type: str = "daily"):
         """
@@ -1105,26 +1811,33 @@ class MPWiKBrowserClient:
             logger.warning("No readings to display")
             return
         
-        print(f"\n{'='*80}")
-        print(f"{reading_type.upper()} WATER CONSUMPTION READINGS")
-        print(f"{'='*80}")
-        print(f"{'Date/Time':<20} {'Meter':<15} {'Reading (m³)':<15} {'Usage (m³)':<15} {'Type':<10}")
-        print(f"{'-'*80}")
+        # Build the whole table and emit it with a single print call
+        lines = [
+            f"\n{'='*80}",
+            f"{reading_type.upper()} WATER CONSUMPTION READINGS",
+            f"{'='*80}",
+            f"{'Date/Time':<20} {'Meter':<15} {'Reading (m³)':<15} {'Usage (m³)':<15} {'Type':<10}",
+            f"{'-'*80}",
+        ]
         
+        # Accumulate the total while formatting rows (single pass over readings)
+        total_usage = 0.0
         for reading in readings:
-            date_str = reading.get('data', 'N/A')
-            meter = reading.get('licznik', 'N/A')
-            wskazanie = reading.get('wskazanie', 0.0)
-            zuzycie = reading.get('zuzycie', 0.0)
-            typ = reading.get('typ', 'N/A')
+            # Bound once per row rather than looked up for every field
+            get = reading.get
+            date_str = get('data', 'N/A')
+            meter = get('licznik', 'N/A')
+            wskazanie = get('wskazanie', 0.0)
+            zuzycie = get('zuzycie', 0.0)
+            typ = get('typ', 'N/A')
+            total_usage += zuzycie
             
-            print(f"{date_str:<20} {meter:<15} {wskazanie:<15.3f} {zuzycie:<15.3f} {typ:<10}")
+            lines.append(_READING_ROW(date_str, meter, wskazanie, zuzycie, typ))
         
-        # Calculate totals
-        total_usage = sum(r.get('zuzycie', 0.0) for r in readings)
-        print(f"{'-'*80}")
-        print(f"Total usage: {total_usage:.3f} m³")
-        print(f"{'='*80}\n")
+        lines.append(f"{'-'*80}")
+        lines.append(f"Total usage: {total_usage:.3f} m³")
+        lines.append(f"{'='*80}\n")
+        print("\n".join(lines))
     
     def __enter__(self):
         """Context manager entry."""
@@ -1136,6 +1849,58 @@ class MPWiKBrowserClient:
         return False
 
 
+class MPWiKBrowserPool:
+    """Logs several accounts in concurrently, each in its own browser."""
+    
+    def __init__(self, max_browsers: int = 3, **client_kwargs):
+        """
+        Initialize the pool.
+        
+        Browsers are not shared between accounts: tabs of one browser share the
+        site's cookies, so one session would overwrite another.
+        
+        Args:
+            max_browsers: Maximum number of browsers logging in at the same time
+            **client_kwargs: Extra MPWiKBrowserClient arguments (headless, log_dir, ...).
+                http_api defaults to True, so each browser is quit right after its
+                login and the returned clients fetch data over plain HTTPS.
+        """
+        self.max_browsers = max_browsers
+        self.client_kwargs = {'http_api': True, **client_kwargs}
+    
+    def _authenticate_account(self, login: str, password: str) -> Optional[MPWiKBrowserClient]:
+        """Log one account in; returns its client, or None if the login failed."""
+        client = MPWiKBrowserClient(login=login, password=password, **self.client_kwargs)
+        try:
+            if client.authenticate():
+                return client
+            logger.error(f"Authentication failed for account {login}")
+        except Exception as e:
+            logger.error(f"Authentication failed for account {login}: {e}")
+        client.close()
+        return None
+    
+    def authenticate_accounts(self, accounts: Dict[str, str]) -> Dict[str, Optional[MPWiKBrowserClient]]:
+        """
+        Log all accounts in, up to max_browsers at a time.
+        
+        Args:
+            accounts: Password keyed by login
+        
+        Returns:
+            Authenticated client (or None if its login failed) keyed by login;
+            the caller closes the clients
+        """
+        if not accounts:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(accounts), self.max_browsers)) as executor:
+            futures = {
+                login: executor.submit(self._authenticate_account, login, password)
+                for login, password in accounts.items()
+            }
+            return {login: future.result() for login, future in futures.items()}
+
+
 def main():
     """Main function for command-line usage."""
     import argparse
@@ -1171,15 +1936,18 @@ def main():
         '--output',
         help='Output file path (JSON format)'
     )
-    parser.add_argument(
+    headless_group = parser.add_mutually_exclusive_group()
+    headless_group.add_argument(
         '--headless',
+        dest='headless',
         action='store_true',
         default=True,
         help='Run browser in headless mode (default: True)'
     )
-    parser.add_argument(
+    headless_group.add_argument(
         '--no-headless',
-        action='store_true',
+        dest='headless',
+        action='store_false',
         help='Run browser with visible window (for manual reCAPTCHA solving)'
     )
     parser.add_argument(
@@ -1192,6 +1960,14 @@ def main():
         help='Enable debug logging'
     )
     
+    # Configure logging for command-line use (library imports leave this to the caller)
+    if not logging.getLogger().handlers:
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+    
     args = parser.parse_args()
     
     # Set logging level
@@ -1200,9 +1976,7 @@ def main():
         logger.setLevel(logging.DEBUG)
         logger.debug("Debug logging enabled")
     
-    # Determine headless mode
-    headless = args.headless and not args.no_headless
-    if args.no_headless:
+    if not args.headless:
         logger.info("Running in non-headless mode (visible browser window)")
     
     # Parse dates
@@ -1211,7 +1985,7 @@ def main():
             hour=23, minute=59, second=59
         )
     else:
-        date_to = datetime.now().replace(hour=23, minute=59, second=59)
+        date_to = datetime.now().replace(hour=23, minute=59, second=59, microsecond=0)
     
     if args.date_from:
         date_from = datetime.strptime(args.date_from, '%Y-%m-%d').replace(
@@ -1226,7 +2000,7 @@ def main():
     with MPWiKBrowserClient(
         login=args.login,
         password=args.password,
-        headless=headless,
+        headless=args.headless,
         log_dir=args.log_dir,
         debug=args.debug
     ) as client:
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Tests for the mpwik_client command-line pipeline
+Tests the shared list/fetch/save flow with mocked backend clients
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+from argparse import Namespace
+from datetime import datetime, timedelta
+import json
+import tempfile
+import os
+
+import mpwik_client
+
+
+def make_args(**overrides):
+    """Build parsed CLI arguments with defaults for the pipeline."""
+    args = Namespace(
+        login="test",
+        password="test",
+        podmiot_id="test",
+        punkt_sieci="0123-2021",
+        list_punkty_sieci=False,
+        type='daily',
+        output=None,
+        quiet=False,
+        method='direct',
+        headless=True,
+        log_dir=None,
+        capmonster_api_key=None,
+        recaptcha_version=None,
+        no_session_cache=True,
+        http2=False,
+        debug=False
+    )
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+class TestRunPipeline(unittest.TestCase):
+    """Test the backend-independent CLI pipeline."""
+    
+    def setUp(self):
+        """Set up a mocked backend client."""
+        self.client = Mock()
+        self.formatter = Mock()
+        self.adapter = mpwik_client._ClientAdapter(self.client, "test", self.formatter)
+        self.date_from = datetime(2024, 1, 1, 0, 0, 0)
+        self.date_to = datetime(2024, 1, 7, 23, 59, 59)
+    
+    def test_fetch_daily_readings(self):
+        """Test that daily readings are fetched and printed."""
+        readings = [{"data": "2024-01-01T00:00:00", "zuzycie": 1.0}]
+        self.client.get_daily_readings.return_value = readings
+        
+        result = mpwik_client._run_pipeline(self.adapter, make_args(), self.date_from, self.date_to)
+        
+        self.assertEqual(result, 0)
+        self.client.get_daily_readings.assert_called_once_with(
+            "test", "0123-2021", self.date_from, self.date_to
+        )
+        self.client.get_hourly_readings.assert_not_called()
+        self.formatter.print_readings.assert_called_once_with(readings, "daily")
+    
+    def test_fetch_both_uses_single_batch(self):
+        """Test that --type both fetches daily and last-day hourly readings in one batch."""
+        daily = [{"data": "2024-01-01T00:00:00", "zuzycie": 1.0}]
+        hourly = [{"data": "2024-01-07T01:00:00", "zuzycie": 0.1}]
+        self.client.get_readings_batch.return_value = [daily, hourly]
+        
+        mpwik_client._run_pipeline(self.adapter, make_args(type='both'), self.date_from, self.date_to)
+        
+        self.client.get_readings_batch.assert_called_once_with("test", "0123-2021", [
+            ('daily', self.date_from, self.date_to),
+            ('hourly', datetime(2024, 1, 7, 0, 0, 0), self.date_to),
+        ])
+        self.client.get_daily_readings.assert_not_called()
+        self.client.get_hourly_readings.assert_not_called()
+        self.formatter.print_readings.assert_any_call(daily, "daily")
+        self.formatter.print_readings.assert_any_call(hourly, "hourly")
+    
+    def test_auto_selects_first_punkt_sieci(self):
+        """Test that the first network point is used when none is given."""
+        self.client.get_punkty_sieci.return_value = [{"numer": "0456/2022", "adres": "Test"}]
+        self.client.get_daily_readings.return_value = []
+        
+        mpwik_client._run_pipeline(self.adapter, make_args(punkt_sieci=None), self.date_from, self.date_to)
+        
+        self.assertEqual(self.client.get_daily_readings.call_args[0][1], "0456-2022")
+    
+    def test_no_punkty_sieci_available(self):
+        """Test exit code when the account has no network points."""
+        self.client.get_punkty_sieci.return_value = []
+        
+        result = mpwik_client._run_pipeline(self.adapter, make_args(punkt_sieci=None), self.date_from, self.date_to)
+        
+        self.assertEqual(result, 1)
+        self.client.get_daily_readings.assert_not_called()
+    
+    def test_results_saved_to_output(self):
+        """Test that fetched readings are written to the --output file."""
+        readings = [{"data": "2024-01-01T00:00:00", "zuzycie": 1.0}]
+        self.client.get_daily_readings.return_value = readings
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "out.json")
+            mpwik_client._run_pipeline(self.adapter, make_args(output=output), self.date_from, self.date_to)
+            
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {"daily": readings})
+    
+    def test_results_saved_without_orjson(self):
+        """Test the stdlib JSON fallback keeps non-ASCII text readable."""
+        readings = [{"adres": "Wrocław", "zuzycie": 1.0}]
+        self.client.get_daily_readings.return_value = readings
+        
+        with tempfile.TemporaryDirectory() as tmpdir, patch.object(mpwik_client, 'orjson', None):
+            output = os.path.join(tmpdir, "out.json")
+            mpwik_client._run_pipeline(self.adapter, make_args(output=output), self.date_from, self.date_to)
+            
+            with open(output, encoding='utf-8') as f:
+                content = f.read()
+            self.assertIn("Wrocław", content)
+            self.assertEqual(json.loads(content), {"daily": readings})
+    
+    def test_save_failure_is_logged(self):
+        """Test that an unwritable --output path does not abort the run."""
+        self.client.get_daily_readings.return_value = [{"zuzycie": 1.0}]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "missing", "out.json")
+            with self.assertLogs('mpwik_client', level='ERROR'):
+                result = mpwik_client._run_pipeline(self.adapter, make_args(output=output), self.date_from, self.date_to)
+        
+        self.assertEqual(result, 0)
+    
+    def test_quiet_skips_printing(self):
+        """Test that results are still saved when printing is disabled."""
+        adapter = mpwik_client._ClientAdapter(self.client, "test", None)
+        readings = [{"data": "2024-01-01T00:00:00", "zuzycie": 1.0}]
+        self.client.get_daily_readings.return_value = readings
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "out.json")
+            result = mpwik_client._run_pipeline(adapter, make_args(quiet=True, output=output), self.date_from, self.date_to)
+            
+            with open(output, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), {"daily": readings})
+        
+        self.assertEqual(result, 0)
+    
+    def test_playwright_adapter_reading_types(self):
+        """Test that the Playwright adapter maps to API reading type names."""
+        adapter = mpwik_client._PlaywrightAdapter(self.client, "test", self.formatter)
+        self.client.get_readings_batch.return_value = [[], []]
+        
+        mpwik_client._run_pipeline(adapter, make_args(type='both'), self.date_from, self.date_to)
+        
+        # Both ranges go to the browser in one batched call
+        self.client.get_readings_batch.assert_called_once()
+        punkt_sieci, queries = self.client.get_readings_batch.call_args[0]
+        self.assertEqual([query[0] for query in queries], ['dobowe', 'godzinowe'])
+
+
+class TestBackendDispatch(unittest.TestCase):
+    """Test backend selection in the CLI."""
+    
+    def test_every_method_has_a_backend(self):
+        """Test that all --method choices are dispatchable."""
+        self.assertEqual(set(mpwik_client._BACKENDS), {'direct', 'selenium', 'playwright'})
+    
+    def test_main_dispatches_parsed_arguments(self):
+        """Test that main() parses argv and hands off to the selected backend."""
+        backend = Mock(return_value=0)
+        
+        with patch.dict(mpwik_client._BACKENDS, {'direct': backend}):
+            result = mpwik_client.main(['--login', 'test', '--password', 'secret', '--method', 'direct'])
+        
+        self.assertEqual(result, 0)
+        args = backend.call_args[0][0]
+        self.assertEqual(args.podmiot_id, 'test')
+        self.assertEqual(args.type, 'daily')
+    
+    def test_hourly_defaults_to_yesterday(self):
+        """Test that hourly readings default to the whole of yesterday."""
+        backend = Mock(return_value=0)
+        
+        with patch.dict(mpwik_client._BACKENDS, {'direct': backend}):
+            mpwik_client.main(['--login', 'test', '--password', 'secret', '--method', 'direct', '--type', 'hourly'])
+        
+        date_from, date_to = backend.call_args[0][1:]
+        yesterday = (datetime.now() - timedelta(days=1)).date()
+        self.assertEqual(date_from, datetime.combine(yesterday, datetime.min.time()))
+        self.assertEqual(date_to, datetime.combine(yesterday, datetime.max.time()).replace(microsecond=0))
+    
+    def test_explicit_dates_cover_whole_days(self):
+        """Test that --date-from/--date-to resolve to midnight and 23:59:59."""
+        backend = Mock(return_value=0)
+        
+        with patch.dict(mpwik_client._BACKENDS, {'direct': backend}):
+            mpwik_client.main([
+                '--login', 'test', '--password', 'secret', '--method', 'direct',
+                '--date-from', '2024-01-01', '--date-to', '2024-01-07'
+            ])
+        
+        self.assertEqual(backend.call_args[0][1:], (datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59, 59)))
+    
+    def test_list_only_with_capmonster_uses_direct(self):
+        """Test that listing meters with a CapMonster key skips the browser."""
+        direct, selenium = Mock(return_value=0), Mock(return_value=0)
+        argv = ['--login', 'test', '--password', 'secret', '--list-punkty-sieci', '--capmonster-api-key', 'key']
+        
+        with patch.dict(mpwik_client._BACKENDS, {'direct': direct, 'selenium': selenium}):
+            with self.assertLogs('mpwik_client', level='INFO') as logs:
+                mpwik_client.main(argv)
+            self.assertTrue(any("switching from --method selenium" in line for line in logs.output))
+            direct.assert_called_once()
+            selenium.assert_not_called()
+            
+            mpwik_client.main(argv + ['--force-browser-list'])
+            selenium.assert_called_once()
+    
+    def test_multi_day_hourly_range_rejected(self):
+        """Test that hourly readings spanning several days exit with an error."""
+        backend = Mock(return_value=0)
+        
+        with patch.dict(mpwik_client._BACKENDS, {'direct': backend}):
+            result = mpwik_client.main([
+                '--login', 'test', '--password', 'secret', '--method', 'direct', '--type', 'hourly',
+                '--date-from', '2024-01-01', '--date-to', '2024-01-03'
+            ])
+        
+        self.assertEqual(result, 1)
+        backend.assert_not_called()
+    
+    def test_headless_flags(self):
+        """Test that --headless/--no-headless resolve to one mutually exclusive setting."""
+        parser = mpwik_client._build_parser()
+        base = ['--login', 'test', '--password', 'secret']
+        
+        self.assertTrue(parser.parse_args(base).headless)
+        self.assertTrue(parser.parse_args(base + ['--headless']).headless)
+        self.assertFalse(parser.parse_args(base + ['--no-headless']).headless)
+        with self.assertRaises(SystemExit), patch('sys.stderr'):
+            parser.parse_args(base + ['--headless', '--no-headless'])
+    
+    @patch('mpwik_direct.MPWiKClient')
+    def test_direct_authentication_failure(self, mock_client_class):
+        """Test that a failed direct login exits before fetching."""
+        mock_client_class.return_value.authenticate.return_value = False
+        
+        with patch.dict(mpwik_client.__dict__):
+            mpwik_client.__dict__.pop('MPWiKClient', None)
+            result = mpwik_client._run_direct(make_args(), datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        self.assertEqual(result, 1)
+        mock_client_class.return_value.get_daily_readings.assert_not_called()
+        mock_client_class.return_value.close.assert_called_once_with()
+
+
+class TestSessionCache(unittest.TestCase):
+    """Test reuse of authenticated sessions between runs."""
+    
+    def setUp(self):
+        """Point the session cache at a temporary directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.object(mpwik_client, 'SESSION_CACHE_DIR', mpwik_client.Path(self.tmpdir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def test_cache_file_not_named_after_login(self):
+        """Test that the cache file name does not contain the login."""
+        path = mpwik_client._session_cache_file(make_args(login="123456", no_session_cache=False))
+        
+        self.assertEqual(path.parent, mpwik_client.SESSION_CACHE_DIR)
+        self.assertNotIn("123456", path.name)
+        self.assertIsNone(mpwik_client._session_cache_file(make_args()))
+    
+    def test_save_and_load_session(self):
+        """Test that a saved session is private to the user and loads back."""
+        path = mpwik_client._session_cache_file(make_args(no_session_cache=False))
+        mpwik_client._save_session(path, {"token": "abc"})
+        
+        self.assertEqual(mpwik_client._load_session(path), {"token": "abc"})
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+    
+    def test_expired_session_discarded(self):
+        """Test that a session older than the TTL is removed."""
+        args = make_args(no_session_cache=False)
+        path = mpwik_client._session_cache_file(args)
+        mpwik_client._save_session(path, {"token": "abc"})
+        old = path.stat().st_mtime - mpwik_client.SESSION_CACHE_TTL - 1
+        os.utime(path, (old, old))
+        
+        self.assertIsNone(mpwik_client._load_session(mpwik_client._session_cache_file(args)))
+        self.assertFalse(path.exists())
+    
+    def test_playwright_gets_state_path(self):
+        """Test that the Playwright backend is given the session cache file."""
+        mock_client_class = MagicMock()
+        client = mock_client_class.return_value.__enter__.return_value
+        client.get_readings_batch.return_value = [[]]
+        args = make_args(method='playwright', no_session_cache=False)
+        
+        with patch.object(mpwik_client, '_load_client', return_value=mock_client_class):
+            result = mpwik_client._run_playwright(args, datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        self.assertEqual(result, 0)
+        self.assertEqual(
+            mock_client_class.call_args_list[0][1]['state_path'],
+            mpwik_client._session_cache_file(args)
+        )
+        client.login_and_establish_session.assert_called_once()
+    
+    @patch('mpwik_direct.MPWiKClient')
+    def test_direct_restored_session_skips_login(self, mock_client_class):
+        """Test that a valid cached session is used instead of logging in."""
+        client = mock_client_class.return_value
+        client.restore_session.return_value = True
+        client.get_daily_readings.return_value = []
+        args = make_args(no_session_cache=False)
+        mpwik_client._save_session(mpwik_client._session_cache_file(args), {"token": "abc"})
+        
+        with patch.dict(mpwik_client.__dict__):
+            mpwik_client.__dict__.pop('MPWiKClient', None)
+            result = mpwik_client._run_direct(args, datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        self.assertEqual(result, 0)
+        client.restore_session.assert_called_once_with({"token": "abc"}, "test")
+        client.authenticate.assert_not_called()
+    
+    @patch('mpwik_direct.MPWiKClient')
+    def test_direct_login_saves_session(self, mock_client_class):
+        """Test that a fresh login is written to the cache."""
+        client = mock_client_class.return_value
+        client.authenticate.return_value = True
+        client.export_session.return_value = {"token": "new"}
+        client.get_daily_readings.return_value = []
+        args = make_args(no_session_cache=False)
+        
+        with patch.dict(mpwik_client.__dict__):
+            mpwik_client.__dict__.pop('MPWiKClient', None)
+            mpwik_client._run_direct(args, datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        client.restore_session.assert_not_called()
+        self.assertEqual(mpwik_client._load_session(mpwik_client._session_cache_file(args)), {"token": "new"})
+
+
+def main():
+    """Run all tests."""
+    # Create test suite
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    
+    # Add all test classes
+    suite.addTests(loader.loadTestsFromTestCase(TestRunPipeline))
+    suite.addTests(loader.loadTestsFromTestCase(TestBackendDispatch))
+    suite.addTests(loader.loadTestsFromTestCase(TestSessionCache))
+    
+    # Run tests with verbose output
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    
+    # Return exit code
+    return 0 if result.wasSuccessful() else 1
+
+
+class TestLazyBackendImports(unittest.TestCase):
+    """Test that backend clients are imported only when used."""
+    
+    def test_load_client_imports_once(self):
+        """Test that a backend module is imported on first use and the class cached."""
+        import importlib
+        import mpwik_direct
+        
+        with patch.dict(mpwik_client.__dict__):
+            mpwik_client.__dict__.pop('MPWiKClient', None)
+            with patch('mpwik_client.importlib.import_module', wraps=importlib.import_module) as mock_import:
+                first = mpwik_client._load_client('MPWiKClient')
+                second = mpwik_client.MPWiKClient
+        
+        self.assertIs(first, mpwik_direct.MPWiKClient)
+        self.assertIs(second, first)
+        mock_import.assert_called_once_with('mpwik_direct')
+    
+    def test_unknown_attribute_raises(self):
+        """Test that names outside the lazy table still raise AttributeError."""
+        with self.assertRaises(AttributeError):
+            mpwik_client.NoSuchClient
+    
+    def test_missing_backend_reports_install_hint(self):
+        """Test that a backend with missing optional dependencies exits with a hint."""
+        runners = [
+            (mpwik_client._run_selenium, "uv sync --extra selenium"),
+            (mpwik_client._run_playwright, "uv sync --extra playwright"),
+        ]
+        for runner, hint in runners:
+            with patch.object(mpwik_client, '_load_client', side_effect=ImportError("missing")):
+                with self.assertLogs('mpwik_client', level='ERROR') as logs:
+                    result = runner(make_args(), datetime(2024, 1, 1), datetime(2024, 1, 7))
+            
+            self.assertEqual(result, 1)
+            self.assertIn(hint, logs.output[0])
+    
+    @patch('mpwik_direct.MPWiKClient')
+    def test_direct_run_skips_browser_backends(self, mock_client_class):
+        """Test that a direct run imports only the direct client module."""
+        import importlib
+        
+        mock_client_class.return_value.authenticate.return_value = True
+        mock_client_class.return_value.get_daily_readings.return_value = []
+        with patch.dict(mpwik_client.__dict__):
+            for name in mpwik_client._LAZY_IMPORTS:
+                mpwik_client.__dict__.pop(name, None)
+            with patch('mpwik_client.importlib.import_module', wraps=importlib.import_module) as mock_import:
+                mpwik_client._run_direct(make_args(), datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        self.assertEqual([c.args[0] for c in mock_import.call_args_list], ['mpwik_direct'])
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -13,6 +13,7 @@ from pathlib import Path
 
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 
+import mpwik_selenium
 from mpwik_selenium import MPWiKBrowserClient
 
 
@@ -119,6 +120,138 @@ class TestMPWiKBrowserClientDriverSetup(unittest.TestCase):
         
         # Driver should remain the same
         self.assertEqual(client.driver, mock_driver)
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_reuses_chromedriver_path(self, mock_service, mock_manager, mock_chrome):
+        """Test that webdriver-manager is only asked once while the binary exists."""
+        with tempfile.NamedTemporaryFile() as driver_binary:
+            mock_manager.return_value.install.return_value = driver_binary.name
+            try:
+                for _ in range(2):
+                    client = MPWiKBrowserClient(login="test", password="test")
+                    client._setup_driver()
+            finally:
+                MPWiKBrowserClient._cached_driver_path = None
+        
+        mock_manager.return_value.install.assert_called_once()
+        mock_service.assert_called_with(driver_binary.name)
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_no_implicit_wait(self, mock_service, mock_manager, mock_chrome):
+        """Test that no implicit wait is configured on the driver."""
+        mock_driver_instance = Mock()
+        mock_chrome.return_value = mock_driver_instance
+        mock_manager.return_value.install.return_value = "/path/to/chromedriver"
+        
+        client = MPWiKBrowserClient(login="test", password="test")
+        client._setup_driver()
+        
+        mock_driver_instance.implicitly_wait.assert_not_called()
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_eager_page_load(self, mock_service, mock_manager, mock_chrome):
+        """Test eager page loading and explicit per-command timeouts."""
+        mock_driver_instance = Mock()
+        mock_chrome.return_value = mock_driver_instance
+        mock_manager.return_value.install.return_value = "/path/to/chromedriver"
+        
+        client = MPWiKBrowserClient(login="test", password="test")
+        client._setup_driver()
+        
+        options = mock_chrome.call_args[1]['options']
+        self.assertEqual(options.page_load_strategy, "eager")
+        mock_driver_instance.set_page_load_timeout.assert_called_once_with(
+            mpwik_selenium.PAGE_LOAD_TIMEOUT
+        )
+        mock_driver_instance.set_script_timeout.assert_called_once_with(
+            mpwik_selenium.SCRIPT_TIMEOUT
+        )
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_blocks_resources(self, mock_service, mock_manager, mock_chrome):
+        """Test that images, fonts and analytics are blocked by default."""
+        mock_driver_instance = Mock()
+        mock_chrome.return_value = mock_driver_instance
+        mock_manager.return_value.install.return_value = "/path/to/chromedriver"
+        
+        client = MPWiKBrowserClient(login="test", password="test")
+        client._setup_driver()
+        
+        options = mock_chrome.call_args[1]['options']
+        self.assertIn("--blink-settings=imagesEnabled=false", options.arguments)
+        mock_driver_instance.execute_cdp_cmd.assert_any_call(
+            "Network.setBlockedURLs", {"urls": mpwik_selenium.BLOCKED_URL_PATTERNS}
+        )
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_without_resource_blocking(self, mock_service, mock_manager, mock_chrome):
+        """Test that resource blocking can be disabled."""
+        mock_driver_instance = Mock()
+        mock_chrome.return_value = mock_driver_instance
+        mock_manager.return_value.install.return_value = "/path/to/chromedriver"
+        
+        client = MPWiKBrowserClient(login="test", password="test", block_resources=False)
+        client._setup_driver()
+        
+        options = mock_chrome.call_args[1]['options']
+        self.assertNotIn("--blink-settings=imagesEnabled=false", options.arguments)
+        mock_driver_instance.execute_cdp_cmd.assert_not_called()
+    
+    def test_build_chrome_options(self):
+        """Test that every session gets the shared Chrome switches."""
+        client = MPWiKBrowserClient(login="test", password="test", headless=False)
+        options = client._build_chrome_options()
+        
+        for arg in mpwik_selenium.CHROME_ARGS:
+            self.assertIn(arg, options.arguments)
+        self.assertIn(f"user-agent={mpwik_selenium.CHROME_USER_AGENT}", options.arguments)
+        self.assertNotIn("--headless=new", options.arguments)
+        self.assertIsNot(options, client._build_chrome_options())
+    
+    def test_logging_capability_only_in_debug(self):
+        """Test that Chrome performance logging is only requested in debug mode."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            quiet = MPWiKBrowserClient(login="test", password="test", log_dir=tmpdir)
+            verbose = MPWiKBrowserClient(login="test", password="test", log_dir=tmpdir, debug=True)
+            
+            self.assertNotIn("goog:loggingPrefs", quiet._build_chrome_options().to_capabilities())
+            self.assertEqual(
+                verbose._build_chrome_options().to_capabilities()["goog:loggingPrefs"],
+                {"performance": "ALL", "browser": "ALL"}
+            )
+            self.assertEqual(
+                verbose._build_chrome_options().experimental_options["perfLoggingPrefs"],
+                {"enableNetwork": True, "enablePage": False}
+            )
+    
+    @patch('mpwik_selenium.webdriver.Chrome')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    @patch('mpwik_selenium.Service')
+    def test_setup_driver_debug_enlarges_network_buffers(self, mock_service, mock_manager, mock_chrome):
+        """Test that debug mode enables the Network domain with large body buffers."""
+        mock_driver_instance = Mock()
+        mock_chrome.return_value = mock_driver_instance
+        mock_manager.return_value.install.return_value = "/path/to/chromedriver"
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(
+                login="test", password="test", log_dir=tmpdir, debug=True, block_resources=False
+            )
+            client._setup_driver()
+        
+        mock_driver_instance.execute_cdp_cmd.assert_called_once_with(
+            "Network.enable", mpwik_selenium.NETWORK_ENABLE_DEBUG_PARAMS
+        )
 
 
 class TestMPWiKBrowserClientLogging(unittest.TestCase):
@@ -259,6 +392,216 @@ class TestMPWiKBrowserClientAuthentication(unittest.TestCase):
         
         self.assertTrue(result)
         mock_driver.execute_script.assert_called_once()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_perform_login_dom_single_round_trip(self, mock_manager):
+        """Test that credentials and the click are sent in one script call."""
+        client = MPWiKBrowserClient(login="test_login", password="test_password")
+        mock_driver = Mock()
+        mock_driver.execute_async_script.return_value = {
+            "login": "success", "password": "success", "click": "success"
+        }
+        client.driver = mock_driver
+        
+        self.assertTrue(client._perform_login_dom("test_login", "test_password"))
+        mock_driver.execute_async_script.assert_called_once_with(
+            mpwik_selenium.PERFORM_LOGIN_JS, "test_login", "test_password"
+        )
+        mock_driver.execute_script.assert_not_called()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_perform_login_dom_reports_failed_step(self, mock_manager):
+        """Test that a failed step makes the combined login fail."""
+        client = MPWiKBrowserClient(login="test_login", password="test_password")
+        mock_driver = Mock()
+        mock_driver.execute_async_script.return_value = {
+            "login": "success", "password": "mwc_textfield_not_found"
+        }
+        client.driver = mock_driver
+        
+        self.assertFalse(client._perform_login_dom("test_login", "test_password"))
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_wait_for_overlay_dismissed(self, mock_manager):
+        """Test that the overlay wait runs one in-page observer with the timeout."""
+        client = MPWiKBrowserClient(login="test_login", password="test_password")
+        mock_driver = Mock()
+        mock_driver.execute_async_script.return_value = 'dismissed'
+        client.driver = mock_driver
+        
+        self.assertTrue(client._wait_for_overlay_dismissed(5000))
+        mock_driver.execute_async_script.assert_called_once_with(mpwik_selenium.OVERLAY_DISMISSED_JS, 5000)
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_wait_for_overlay_timeout(self, mock_manager):
+        """Test that an overlay still visible after the timeout is reported."""
+        client = MPWiKBrowserClient(login="test_login", password="test_password")
+        mock_driver = Mock()
+        mock_driver.execute_async_script.return_value = 'timeout'
+        client.driver = mock_driver
+        
+        self.assertFalse(client._wait_for_overlay_dismissed())
+        mock_driver.execute_async_script.assert_called_once_with(mpwik_selenium.OVERLAY_DISMISSED_JS, 10000)
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_authenticate_restores_saved_session(self, mock_manager):
+        """Test that a valid saved session skips the login flow."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_file = Path(tmpdir) / "session.json"
+            session_file.write_text(json.dumps([{"name": "SESSION", "value": "abc"}]))
+            
+            client = MPWiKBrowserClient(
+                login="test", password="test", log_dir=tmpdir, session_file=str(session_file)
+            )
+            
+            mock_driver = Mock()
+            mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=test"
+            mock_driver.execute_async_script.return_value = 200
+            client.driver = mock_driver
+            
+            self.assertTrue(client.authenticate())
+            self.assertTrue(client.authenticated)
+            mock_driver.add_cookie.assert_called_once_with({"name": "SESSION", "value": "abc"})
+            mock_driver.execute_script.assert_not_called()
+    
+    @patch('mpwik_selenium.requests.Session.get')
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_http_api_hands_session_over(self, mock_manager, mock_get):
+        """Test that http_api copies the cookies, quits the browser and fetches over HTTP."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_file = Path(tmpdir) / "session.json"
+            session_file.write_text(json.dumps([{"name": "SESSION", "value": "abc"}]))
+            
+            client = MPWiKBrowserClient(
+                login="test", password="test", log_dir=tmpdir,
+                session_file=str(session_file), http_api=True
+            )
+            
+            mock_driver = Mock()
+            mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=test"
+            mock_driver.execute_async_script.return_value = 200
+            mock_driver.get_cookies.return_value = [
+                {"name": "SESSION", "value": "abc", "domain": "ebok.mpwik.wroc.pl", "path": "/"}
+            ]
+            client.driver = mock_driver
+            
+            self.assertTrue(client.authenticate())
+            mock_driver.quit.assert_called_once()
+            self.assertIsNone(client.driver)
+            self.assertEqual(client._api_session.cookies.get("SESSION"), "abc")
+            
+            mock_get.return_value = Mock(status_code=200)
+            mock_get.return_value.json.return_value = {"odczyty": [{"id": 1}]}
+            readings = client.get_daily_readings("test", "0123-2021", datetime(2024, 1, 1), datetime(2024, 1, 7))
+            
+            self.assertEqual(readings, [{"id": 1}])
+            self.assertIn("/odczyty/dobowe?dataOd=2024-01-01T00%3A00%3A00", mock_get.call_args[0][0])
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_http_api_session_refers_to_queried_podmiot(self, mock_manager):
+        """Test that the handed-over HTTP session is set up for the podmiot being queried."""
+        client = MPWiKBrowserClient(login="test", password="test", http_api=True, podmiot_id="other")
+        mock_driver = Mock()
+        mock_driver.current_url = "https://ebok.mpwik.wroc.pl/"
+        mock_driver.get_cookies.return_value = []
+        client.driver = mock_driver
+        
+        with patch('mpwik_selenium.time.sleep'):
+            client._start_api_session()
+        
+        mock_driver.get.assert_called_once_with(f"{client.SITE_URL}/trust/zuzycie-wody?p=other")
+        self.assertEqual(client._api_session.headers['Referer'], f"{client.SITE_URL}/trust/zuzycie-wody?p=other")
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_probe_session_uses_queried_podmiot(self, mock_manager):
+        """Test that a restored or kept session is probed against the podmiot being queried."""
+        client = MPWiKBrowserClient(login="test", password="test", podmiot_id="other")
+        mock_driver = Mock()
+        mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=other"
+        mock_driver.execute_async_script.return_value = 200
+        client.driver = mock_driver
+        
+        self.assertEqual(client._probe_session(), 200)
+        mock_driver.get.assert_called_once_with(f"{client.SITE_URL}/trust/zuzycie-wody?p=other")
+        self.assertEqual(
+            mock_driver.execute_async_script.call_args[0][1],
+            f"{client.BASE_URL}/podmioty/other/punkty-sieci?status=AKTYWNE"
+        )
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_keep_browser_reuses_logged_in_driver(self, mock_manager):
+        """Test that a kept browser is reused by the next client without logging in."""
+        mock_driver = Mock()
+        mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=test"
+        mock_driver.execute_async_script.return_value = 200
+        try:
+            first = MPWiKBrowserClient(login="test", password="test", keep_browser=True)
+            first.driver = mock_driver
+            first.authenticated = True
+            first.close()
+            mock_driver.quit.assert_not_called()
+            
+            second = MPWiKBrowserClient(login="test", password="test", keep_browser=True)
+            self.assertTrue(second.authenticate())
+            
+            self.assertIs(second.driver, mock_driver)
+            mock_manager.return_value.install.assert_not_called()
+            mock_driver.execute_script.assert_not_called()
+        finally:
+            mpwik_selenium._browser_pool.clear()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_keep_browser_not_reused_with_other_password(self, mock_manager):
+        """Test that a kept browser is not handed to a client with a different password."""
+        mock_driver = Mock()
+        try:
+            first = MPWiKBrowserClient(login="test", password="right", keep_browser=True)
+            first.driver = mock_driver
+            first.authenticated = True
+            first.close()
+            
+            second = MPWiKBrowserClient(login="test", password="wrong", keep_browser=True)
+            self.assertNotIn(second._pool_key(), mpwik_selenium._browser_pool)
+            self.assertNotIn("right", first._pool_key())
+        finally:
+            mpwik_selenium._browser_pool.clear()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_restore_session_expired(self, mock_manager):
+        """Test that an expired saved session is rejected."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_file = Path(tmpdir) / "session.json"
+            session_file.write_text(json.dumps([{"name": "SESSION", "value": "abc"}]))
+            
+            client = MPWiKBrowserClient(
+                login="test", password="test", log_dir=tmpdir, session_file=str(session_file)
+            )
+            
+            mock_driver = Mock()
+            mock_driver.current_url = "https://ebok.mpwik.wroc.pl/login"
+            mock_driver.execute_async_script.return_value = 401
+            client.driver = mock_driver
+            
+            self.assertFalse(client._restore_session())
+            self.assertFalse(client.authenticated)
+            mock_driver.delete_all_cookies.assert_called_once()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_save_session_writes_cookies(self, mock_manager):
+        """Test that session cookies are written to the session file."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_file = Path(tmpdir) / "session.json"
+            client = MPWiKBrowserClient(
+                login="test", password="test", log_dir=tmpdir, session_file=str(session_file)
+            )
+            
+            mock_driver = Mock()
+            mock_driver.get_cookies.return_value = [{"name": "SESSION", "value": "abc"}]
+            client.driver = mock_driver
+            
+            client._save_session()
+            
+            self.assertEqual(json.loads(session_file.read_text()), [{"name": "SESSION", "value": "abc"}])
 
 
 class TestMPWiKBrowserClientDataFetching(unittest.TestCase):
@@ -347,6 +690,82 @@ class TestMPWiKBrowserClientDataFetching(unittest.TestCase):
         self.assertEqual(len(punkty), 1)
         self.assertTrue(punkty[0]['aktywny'])
 
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_get_readings_from_api_recovers_lost_session(self, mock_manager):
+        """Test that a lost WebDriver session is re-established once."""
+        from selenium.common.exceptions import InvalidSessionIdException
+        
+        client = MPWiKBrowserClient(login="test", password="test")
+        client.authenticated = True
+        
+        dead_driver = Mock()
+        dead_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=123"
+        dead_driver.execute_async_script.side_effect = InvalidSessionIdException("invalid session id")
+        client.driver = dead_driver
+        
+        new_driver = Mock()
+        new_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=123"
+        new_driver.execute_async_script.return_value = {
+            "success": True,
+            "data": {"odczyty": [{"data": "2024-01-01", "zuzycie": 2.3}]}
+        }
+        new_driver.get_log.return_value = []
+        
+        def reauthenticate():
+            client.driver = new_driver
+            client.authenticated = True
+            return True
+        
+        with patch.object(client, 'authenticate', side_effect=reauthenticate) as mock_auth:
+            readings = client.get_readings_from_api(
+                "123", "0123-2021", datetime(2024, 1, 1), datetime(2024, 1, 2), "daily"
+            )
+        
+        mock_auth.assert_called_once()
+        dead_driver.quit.assert_called_once()
+        self.assertEqual(len(readings), 1)
+
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_get_readings_from_api_skips_browser_logs_without_debug(self, mock_manager):
+        """Test that browser console logs are only fetched in debug mode."""
+        client = MPWiKBrowserClient(login="test", password="test", debug=False)
+        client.authenticated = True
+        
+        mock_driver = Mock()
+        mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=123"
+        mock_driver.execute_async_script.return_value = {"success": True, "data": {"odczyty": []}}
+        client.driver = mock_driver
+        
+        client.get_readings_from_api("123", "0123-2021", datetime(2024, 1, 1), datetime(2024, 1, 2))
+        
+        mock_driver.get_log.assert_not_called()
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_get_readings_batch_single_round_trip(self, mock_manager):
+        """Test that several reading ranges are fetched with one script call."""
+        client = MPWiKBrowserClient(login="test", password="test")
+        client.authenticated = True
+        
+        mock_driver = Mock()
+        mock_driver.current_url = "https://ebok.mpwik.wroc.pl/trust/zuzycie-wody?p=123"
+        mock_driver.execute_async_script.return_value = [
+            {"success": True, "data": {"odczyty": [{"data": "2024-01-01", "zuzycie": 2.3}]}},
+            {"success": False, "error": "HTTP error 400"}
+        ]
+        client.driver = mock_driver
+        
+        daily, hourly = client.get_readings_batch("123", "0123-2021", [
+            ("daily", datetime(2024, 1, 1), datetime(2024, 1, 2)),
+            ("hourly", datetime(2024, 1, 2), datetime(2024, 1, 2, 23, 59, 59)),
+        ])
+        
+        mock_driver.execute_async_script.assert_called_once()
+        urls = mock_driver.execute_async_script.call_args[0][1]
+        self.assertIn("/odczyty/dobowe?", urls[0])
+        self.assertIn("/odczyty/godzinowe?", urls[1])
+        self.assertEqual(len(daily), 1)
+        self.assertIsNone(hourly)
+
 
 class TestMPWiKBrowserClientConvenienceMethods(unittest.TestCase):
     """Test convenience wrapper methods."""
@@ -513,6 +932,141 @@ class TestMPWiKBrowserClientNetworkLogs(unittest.TestCase):
                 self.assertEqual(content[0]['method'], "Network.requestWillBeSent")
 
 
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_network_log_savers_share_drained_events(self, mock_manager):
+        """Test that both network log savers see events drained from Chrome once."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            mock_driver = Mock()
+            mock_driver.get_log.side_effect = [
+                [
+                    {"timestamp": 1, "level": "INFO", "message": json.dumps({"message": {
+                        "method": "Network.requestWillBeSent",
+                        "params": {"requestId": "1", "request": {"url": "https://ebok.mpwik.wroc.pl/login", "method": "GET"}}
+                    }})},
+                    {"timestamp": 2, "level": "INFO", "message": json.dumps({"message": {
+                        "method": "Page.frameNavigated", "params": {}
+                    }})},
+                ],
+                [],
+            ]
+            client.driver = mock_driver
+            
+            summary = client._save_network_logs("test")
+            detailed = client._save_detailed_network_logs("test")
+            
+            with open(summary, 'r') as f:
+                self.assertEqual([e['method'] for e in json.load(f)], ["Network.requestWillBeSent"])
+            self.assertEqual(len(detailed), 1)
+            self.assertEqual(client._network_events, [])
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_detailed_network_logs_store_body_separately(self, mock_manager):
+        """Test that API response bodies are written to their own file and referenced."""
+        url = "https://ebok.mpwik.wroc.pl/frontend-api/v1/podmioty/test/punkty-sieci"
+        events = [
+            ("Network.requestWillBeSent", {"requestId": "7", "request": {"url": url, "method": "GET"}}),
+            ("Network.responseReceived", {"requestId": "7", "response": {"url": url, "status": 200, "mimeType": "application/json"}}),
+            ("Network.loadingFinished", {"requestId": "7"}),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            mock_driver = Mock()
+            mock_driver.get_log.return_value = [
+                {"timestamp": 1, "level": "INFO", "message": json.dumps({"message": {"method": m, "params": p}})}
+                for m, p in events
+            ]
+            mock_driver.execute_cdp_cmd.return_value = {"body": '{"punkty": []}', "base64Encoded": False}
+            client.driver = mock_driver
+            
+            saved = client._save_detailed_network_logs("test")
+            
+            self.assertEqual(len(saved), 1)
+            with open(saved[0], 'r') as f:
+                record = json.load(f)
+            self.assertNotIn("response_body", record)
+            self.assertEqual(record["response_body_size"], len(b'{"punkty": []}'))
+            body_file = client.requests_log_dir / record["response_body_ref"]
+            self.assertEqual(body_file.read_bytes(), b'{"punkty": []}')
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_detailed_network_logs_skip_failed_body(self, mock_manager):
+        """Test that an unexpected error fetching one body does not drop the other logs."""
+        urls = {
+            "7": "https://ebok.mpwik.wroc.pl/frontend-api/v1/podmioty/test/punkty-sieci",
+            "8": "https://ebok.mpwik.wroc.pl/frontend-api/v1/session/info",
+        }
+        events = []
+        for request_id, url in urls.items():
+            events += [
+                ("Network.requestWillBeSent", {"requestId": request_id, "request": {"url": url, "method": "GET"}}),
+                ("Network.responseReceived", {"requestId": request_id, "response": {"url": url, "status": 200, "mimeType": "application/json"}}),
+                ("Network.loadingFinished", {"requestId": request_id}),
+            ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            mock_driver = Mock()
+            mock_driver.get_log.return_value = [
+                {"timestamp": 1, "level": "INFO", "message": json.dumps({"message": {"method": m, "params": p}})}
+                for m, p in events
+            ]
+            mock_driver.execute_cdp_cmd.side_effect = [ValueError("bad body"), {"body": "{}", "base64Encoded": False}]
+            client.driver = mock_driver
+            
+            saved = client._save_detailed_network_logs("test")
+            
+            self.assertEqual(len(saved), 2)
+            records = []
+            for path in saved:
+                with open(path, 'r') as f:
+                    records.append(json.load(f))
+            self.assertEqual(sum("response_body_ref" in record for record in records), 1)
+    
+    @staticmethod
+    def _site_request_log_entries(count):
+        """Build performance log entries for count site requests without bodies."""
+        return [
+            {"timestamp": i, "level": "INFO", "message": json.dumps({"message": {
+                "method": "Network.requestWillBeSent",
+                "params": {"requestId": str(i), "request": {"url": f"https://ebok.mpwik.wroc.pl/page{i}", "method": "GET"}}
+            }})}
+            for i in range(count)
+        ]
+    
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_detailed_network_logs_numbered_in_order(self, mock_manager):
+        """Test that concurrently written request logs keep their counters in event order."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            mock_driver = Mock()
+            mock_driver.get_log.return_value = self._site_request_log_entries(5)
+            client.driver = mock_driver
+            
+            saved = client._save_detailed_network_logs("test")
+            
+            self.assertEqual(
+                [path.name.split("_", 3)[2] for path in saved],
+                ["0001", "0002", "0003", "0004", "0005"]
+            )
+            for i, path in enumerate(saved):
+                with open(path, 'r') as f:
+                    self.assertEqual(json.load(f)["url"], f"https://ebok.mpwik.wroc.pl/page{i}")
+    
+    @patch('mpwik_selenium._write_log_file', side_effect=OSError("disk full"))
+    @patch('mpwik_selenium.ChromeDriverManager')
+    def test_detailed_network_logs_failed_write(self, mock_manager, mock_write):
+        """Test that a failed concurrent write is reported as no saved logs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKBrowserClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            mock_driver = Mock()
+            mock_driver.get_log.return_value = self._site_request_log_entries(3)
+            client.driver = mock_driver
+            
+            with self.assertLogs('mpwik_selenium', level='ERROR'):
+                self.assertEqual(client._save_detailed_network_logs("test"), [])
+            self.assertEqual(mock_write.call_count, 3)
+
+
 class TestMPWiKBrowserClientErrorHandling(unittest.TestCase):
     """Test error handling in browser client."""
     
@@ -568,6 +1122,24 @@ class TestMPWiKBrowserClientErrorHandling(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestMPWiKBrowserPool(unittest.TestCase):
+    """Test concurrent multi-account authentication."""
+    
+    @patch.object(MPWiKBrowserClient, 'authenticate', autospec=True)
+    def test_authenticate_accounts(self, mock_authenticate):
+        """Test that every account gets its own client and failures map to None."""
+        mock_authenticate.side_effect = lambda client: client.login != "bad"
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pool = mpwik_selenium.MPWiKBrowserPool(max_browsers=2, log_dir=tmpdir)
+            clients = pool.authenticate_accounts({"a": "pa", "b": "pb", "bad": "px"})
+        
+        self.assertEqual(set(clients), {"a", "b", "bad"})
+        self.assertIsNone(clients["bad"])
+        self.assertEqual(clients["a"].login, "a")
+        self.assertIsNot(clients["a"], clients["b"])
+        self.assertTrue(clients["b"].http_api)
+
 class TestMPWiKBrowserClientPrintMethods(unittest.TestCase):
     """Test print/display methods."""
     
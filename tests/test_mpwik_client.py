@@ -7,13 +7,14 @@ Tests all functionality of the API client with mocked HTTP requests
 import unittest
 from unittest.mock import Mock, patch, MagicMock, call
 from datetime import datetime, timedelta
+import asyncio
 import json
 import requests
 from pathlib import Path
 import tempfile
 import os
 
-from mpwik_direct import MPWiKClient
+from mpwik_direct import MPWiKClient, CSRF_PATTERN, SITEKEY_PATTERN, _search_preferred
 
 
 class TestMPWiKClientInitialization(unittest.TestCase):
@@ -65,6 +66,30 @@ class TestMPWiKClientInitialization(unittest.TestCase):
         self.assertIn('Referer', client.session.headers)
         self.assertEqual(client.session.headers['Content-Type'], 'application/json')
         self.assertEqual(client.session.headers['Origin'], MPWiKClient.SITE_URL)
+    
+    def test_session_adapter_retries_idempotent_gets(self):
+        """Test that the e-BOK adapter retries only GETs on gateway errors."""
+        client = MPWiKClient(login="test_login", password="test_password")
+        
+        adapter = client.session.get_adapter(f"{MPWiKClient.BASE_URL}/session/info")
+        retry = adapter.max_retries
+        self.assertEqual(retry.total, 3)
+        self.assertEqual(tuple(retry.status_forcelist), (502, 503, 504))
+        self.assertEqual(retry.allowed_methods, frozenset(['GET']))
+    
+    def test_session_adapter_ignores_long_retry_after(self):
+        """Test that a huge Retry-After does not block a GET for its full duration."""
+        from urllib3.response import HTTPResponse
+        
+        client = MPWiKClient(login="test_login", password="test_password")
+        retry = client.session.get_adapter(f"{MPWiKClient.BASE_URL}/session/info").max_retries
+        response = HTTPResponse(status=503, headers={"Retry-After": "3600"})
+        
+        with patch('urllib3.util.retry.time.sleep') as mock_sleep:
+            retry.increment(method="GET", url="/session/info", response=response).sleep(response)
+        
+        for sleep_call in mock_sleep.call_args_list:
+            self.assertLessEqual(sleep_call.args[0], client.retry_max_delay)
 
 
 class TestMPWiKClientAuthentication(unittest.TestCase):
@@ -81,7 +106,7 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
         # Mock the login page response
         mock_login_page = Mock()
         mock_login_page.status_code = 200
-        mock_login_page.text = '<html><meta name="csrf" content="test_csrf_token"></html>'
+        mock_login_page.iter_content.return_value = [b'<html><meta name="csrf" content="test_csrf_token"></html>']
         mock_login_page.raise_for_status = Mock()
         
         # Mock the session info response
@@ -108,14 +133,15 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
         self.assertIn('Authorization', self.client.session.headers)
         self.assertEqual(self.client.session.headers['Authorization'], 'Bearer test_auth_token')
     
+    @patch('mpwik_direct.time.sleep')
     @patch('mpwik_direct.requests.Session.get')
     @patch('mpwik_direct.requests.Session.post')
-    def test_authenticate_failure(self, mock_post, mock_get):
+    def test_authenticate_failure(self, mock_post, mock_get, mock_sleep):
         """Test authentication failure."""
         # Mock the login page response
         mock_login_page = Mock()
         mock_login_page.status_code = 200
-        mock_login_page.text = '<html></html>'
+        mock_login_page.iter_content.return_value = [b'<html></html>']
         mock_login_page.raise_for_status = Mock()
         
         # Mock the session info response
@@ -138,6 +164,47 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
         self.assertFalse(result)
         self.assertIsNone(self.client.token)
     
+    def _authenticate_with_session_cookie(self, mock_post, mock_get):
+        """Run a successful login that has to search the session cookies for a CSRF token."""
+        self.client.session.cookies.set("SESSION", "0123456789abcdefghijklmnop")
+        
+        mock_login_page = Mock()
+        mock_login_page.status_code = 200
+        mock_login_page.iter_content.return_value = [b'<html><meta name="csrf" content="test_csrf_token"></html>']
+        
+        mock_session_info = Mock()
+        mock_session_info.status_code = 200
+        mock_session_info.json.return_value = {}
+        
+        mock_login_response = Mock()
+        mock_login_response.status_code = 200
+        mock_login_response.json.return_value = {"token": "test_auth_token"}
+        mock_login_response.headers = {}
+        
+        mock_get.side_effect = [mock_login_page, mock_session_info]
+        mock_post.return_value = mock_login_response
+        
+        self.assertTrue(self.client.authenticate())
+    
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_cookie_debug_log_when_debug_enabled(self, mock_post, mock_get):
+        """Test that session cookies are logged, truncated, when DEBUG is enabled."""
+        with self.assertLogs('mpwik_direct', level='DEBUG') as logs:
+            self._authenticate_with_session_cookie(mock_post, mock_get)
+        
+        self.assertIn("DEBUG:mpwik_direct:Cookie: SESSION = 0123456789abcdefghij...", logs.output)
+    
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_cookie_debug_log_skipped_when_debug_disabled(self, mock_post, mock_get):
+        """Test that cookie log lines are not even built when DEBUG is disabled."""
+        with self.assertLogs('mpwik_direct', level='INFO'), \
+                patch('mpwik_direct.logger.debug') as mock_debug:
+            self._authenticate_with_session_cookie(mock_post, mock_get)
+        
+        self.assertNotIn("Cookie: %s = %s", [c.args[0] for c in mock_debug.call_args_list])
+    
     @patch('mpwik_direct.requests.Session.get')
     @patch('mpwik_direct.requests.Session.post')
     def test_authenticate_with_csrf_token(self, mock_post, mock_get):
@@ -145,7 +212,7 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
         # Mock responses
         mock_login_page = Mock()
         mock_login_page.status_code = 200
-        mock_login_page.text = '<html></html>'
+        mock_login_page.iter_content.return_value = [b'<html></html>']
         mock_login_page.raise_for_status = Mock()
         
         mock_session_info = Mock()
@@ -167,12 +234,102 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
     
     @patch('mpwik_direct.requests.Session.get')
     @patch('mpwik_direct.requests.Session.post')
-    def test_authenticate_retry_mechanism(self, mock_post, mock_get):
+    def test_authenticate_loads_login_page_before_session_info(self, mock_post, mock_get):
+        """Test that session/info follows the login page and its token beats the HTML one."""
+        mock_login_page = Mock()
+        mock_login_page.status_code = 200
+        mock_login_page.iter_content.return_value = [b'<html><meta name="csrf" content="html_csrf_token"></html>']
+        mock_login_page.raise_for_status = Mock()
+        
+        mock_session_info = Mock()
+        mock_session_info.status_code = 200
+        mock_session_info.json.return_value = {"csrfToken": "session_csrf_token"}
+        
+        mock_login_response = Mock()
+        mock_login_response.status_code = 200
+        mock_login_response.json.return_value = {"token": "test_auth_token"}
+        mock_login_response.headers = {}
+        
+        mock_get.side_effect = [mock_login_page, mock_session_info]
+        mock_post.return_value = mock_login_response
+        
+        self.assertTrue(self.client.authenticate())
+        
+        urls = [call.args[0] for call in mock_get.call_args_list]
+        self.assertEqual(urls, [f"{MPWiKClient.SITE_URL}/login", f"{MPWiKClient.BASE_URL}/session/info"])
+        self.assertEqual(self.client.csrf_token, "session_csrf_token")
+    
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_authenticate_with_csrf_token_from_html(self, mock_post, mock_get):
+        """Test CSRF token extraction from HTML prefers the meta tag."""
+        mock_login_page = Mock()
+        mock_login_page.status_code = 200
+        mock_login_page.iter_content.return_value = [
+            b'<script>var cfg = {csrf: "inline_csrf_token"};</script>'
+            b'<meta name="csrf" content="meta_csrf_token">'
+        ]
+        mock_login_page.raise_for_status = Mock()
+        
+        mock_session_info = Mock()
+        mock_session_info.status_code = 200
+        mock_session_info.json.return_value = {}
+        
+        mock_login_response = Mock()
+        mock_login_response.status_code = 200
+        mock_login_response.json.return_value = {"token": "test_auth_token"}
+        mock_login_response.headers = {}
+        
+        mock_get.side_effect = [mock_login_page, mock_session_info]
+        mock_post.return_value = mock_login_response
+        
+        result = self.client.authenticate()
+        
+        self.assertTrue(result)
+        self.assertEqual(self.client.csrf_token, "meta_csrf_token")
+    
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_authenticate_skips_recaptcha_when_page_has_none(self, mock_post, mock_get):
+        """Test that no site key lookup or solve happens without ReCAPTCHA on the page."""
+        client = MPWiKClient(
+            login="test_login",
+            password="test_password",
+            recaptcha_api_key="test_capmonster_key"
+        )
+        
+        mock_session_info = Mock()
+        mock_session_info.status_code = 200
+        mock_session_info.json.return_value = {"csrfToken": "test_csrf_token"}
+        
+        mock_login_page = Mock()
+        mock_login_page.status_code = 200
+        mock_login_page.iter_content.return_value = [b'<html><div data-sitekey="other_captcha_key"></div></html>']
+        mock_login_page.raise_for_status = Mock()
+        
+        mock_login_response = Mock()
+        mock_login_response.status_code = 200
+        mock_login_response.json.return_value = {"token": "test_auth_token"}
+        mock_login_response.headers = {}
+        
+        mock_get.side_effect = [mock_login_page, mock_session_info]
+        mock_post.return_value = mock_login_response
+        
+        with patch.object(client, 'solve_recaptcha') as mock_solve:
+            result = client.authenticate()
+        
+        self.assertTrue(result)
+        mock_solve.assert_not_called()
+    
+    @patch('mpwik_direct.time.sleep')
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_authenticate_retry_mechanism(self, mock_post, mock_get, mock_sleep):
         """Test authentication retry on failure."""
         # Mock login page and session info
         mock_login_page = Mock()
         mock_login_page.status_code = 200
-        mock_login_page.text = '<html></html>'
+        mock_login_page.iter_content.return_value = [b'<html></html>']
         mock_login_page.raise_for_status = Mock()
         
         mock_session_info = Mock()
@@ -197,6 +354,54 @@ class TestMPWiKClientAuthentication(unittest.TestCase):
         
         self.assertTrue(result)
         self.assertEqual(mock_post.call_count, 2)
+        
+        # One backoff before the retry, within [base, base * (1 + jitter)]
+        mock_sleep.assert_called_once()
+        delay = mock_sleep.call_args[0][0]
+        self.assertGreaterEqual(delay, self.client.retry_base_delay)
+        self.assertLessEqual(delay, self.client.retry_base_delay * (1 + self.client.retry_jitter))
+
+    
+    @patch('mpwik_direct.time.sleep')
+    @patch('mpwik_direct.requests.Session.get')
+    @patch('mpwik_direct.requests.Session.post')
+    def test_authenticate_honors_retry_after_on_429(self, mock_post, mock_get, mock_sleep):
+        """Test that a rate-limited login waits for the server's Retry-After."""
+        mock_login_page = Mock()
+        mock_login_page.status_code = 200
+        mock_login_page.iter_content.return_value = [b'<html></html>']
+        mock_login_page.raise_for_status = Mock()
+        
+        mock_session_info = Mock()
+        mock_session_info.status_code = 200
+        mock_session_info.json.return_value = {"csrfToken": "test_csrf_token"}
+        
+        mock_login_limited = Mock()
+        mock_login_limited.status_code = 429
+        mock_login_limited.json.return_value = {}
+        mock_login_limited.headers = {"Retry-After": "7"}
+        
+        mock_login_success = Mock()
+        mock_login_success.status_code = 200
+        mock_login_success.json.return_value = {"token": "test_auth_token"}
+        mock_login_success.headers = {}
+        
+        mock_get.side_effect = [mock_login_page, mock_session_info]
+        mock_post.side_effect = [mock_login_limited, mock_login_success]
+        
+        result = self.client.authenticate(max_retries=2)
+        
+        self.assertTrue(result)
+        mock_sleep.assert_called_once_with(7.0)
+    
+    def test_retry_after_seconds(self):
+        """Test Retry-After parsing for delta-seconds, HTTP-dates and junk."""
+        from mpwik_direct import _retry_after_seconds
+        
+        self.assertEqual(_retry_after_seconds("12"), 12.0)
+        self.assertEqual(_retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(_retry_after_seconds("soon"))
+        self.assertIsNone(_retry_after_seconds(None))
 
 
 class TestMPWiKClientReCAPTCHA(unittest.TestCase):
@@ -211,7 +416,7 @@ class TestMPWiKClientReCAPTCHA(unittest.TestCase):
             recaptcha_version=3
         )
     
-    @patch('mpwik_direct.requests.post')
+    @patch('mpwik_direct.requests.Session.post')
     @patch('mpwik_direct.time.sleep')
     def test_solve_recaptcha_v3_success(self, mock_sleep, mock_post):
         """Test successful ReCAPTCHA v3 solving."""
@@ -240,7 +445,7 @@ class TestMPWiKClientReCAPTCHA(unittest.TestCase):
         self.assertEqual(token, "test_recaptcha_token")
         self.assertEqual(mock_post.call_count, 2)
     
-    @patch('mpwik_direct.requests.post')
+    @patch('mpwik_direct.requests.Session.post')
     @patch('mpwik_direct.time.sleep')
     def test_solve_recaptcha_v2_success(self, mock_sleep, mock_post):
         """Test successful ReCAPTCHA v2 solving."""
@@ -266,7 +471,37 @@ class TestMPWiKClientReCAPTCHA(unittest.TestCase):
         
         self.assertEqual(token, "test_recaptcha_token_v2")
     
-    @patch('mpwik_direct.requests.post')
+    @patch('mpwik_direct.requests.Session.post')
+    @patch('mpwik_direct.time.sleep')
+    def test_solve_recaptcha_polls_with_backoff(self, mock_sleep, mock_post):
+        """Test that the first result poll is delayed, then polling backs off to 2 seconds."""
+        mock_create_response = Mock()
+        mock_create_response.json.return_value = {"errorId": 0, "taskId": "test_task_id"}
+        mock_create_response.raise_for_status = Mock()
+        
+        mock_processing = Mock()
+        mock_processing.json.return_value = {"status": "processing"}
+        mock_processing.raise_for_status = Mock()
+        
+        mock_ready = Mock()
+        mock_ready.json.return_value = {
+            "status": "ready",
+            "solution": {"gRecaptchaResponse": "test_recaptcha_token"}
+        }
+        mock_ready.raise_for_status = Mock()
+        
+        mock_post.side_effect = [mock_create_response] + [mock_processing] * 9 + [mock_ready]
+        
+        token = self.client.solve_recaptcha("test_site_key", recaptcha_version=3)
+        
+        self.assertEqual(token, "test_recaptcha_token")
+        delays = [c[0][0] for c in mock_sleep.call_args_list]
+        self.assertEqual(delays[0], MPWiKClient.RECAPTCHA_FIRST_POLL_DELAY)
+        self.assertEqual(delays[1], 0.5)
+        self.assertEqual(delays[1:], sorted(delays[1:]))
+        self.assertEqual(max(delays[1:]), 2.0)
+    
+    @patch('mpwik_direct.requests.Session.post')
     def test_solve_recaptcha_capmonster_error(self, mock_post):
         """Test ReCAPTCHA solving with CapMonster error."""
         mock_response = Mock()
@@ -283,6 +518,32 @@ class TestMPWiKClientReCAPTCHA(unittest.TestCase):
         
         self.assertIsNone(token)
     
+    @patch('mpwik_direct.requests.Session.post')
+    @patch('mpwik_direct.time.sleep')
+    def test_solve_recaptcha_reuses_capmonster_session(self, mock_sleep, mock_post):
+        """Test that CapMonster calls share one session without e-BOK credentials."""
+        self.client.session.headers['Authorization'] = 'Bearer secret'
+        mock_create_response = Mock()
+        mock_create_response.json.return_value = {"errorId": 0, "taskId": "test_task_id"}
+        mock_create_response.raise_for_status = Mock()
+        mock_ready = Mock()
+        mock_ready.json.return_value = {
+            "status": "ready",
+            "solution": {"gRecaptchaResponse": "test_recaptcha_token"}
+        }
+        mock_ready.raise_for_status = Mock()
+        mock_post.side_effect = [mock_create_response, mock_ready]
+        
+        self.client.solve_recaptcha("test_site_key", recaptcha_version=3)
+        
+        self.assertIsNot(self.client._capmonster_session, self.client.session)
+        self.assertNotIn('Authorization', self.client._capmonster_session.headers)
+        urls = [c[0][0] for c in mock_post.call_args_list]
+        self.assertEqual(urls, [
+            "https://api.capmonster.cloud/createTask",
+            "https://api.capmonster.cloud/getTaskResult",
+        ])
+    
     def test_solve_recaptcha_no_api_key(self):
         """Test ReCAPTCHA solving without API key."""
         client = MPWiKClient(login="test", password="test")
@@ -311,6 +572,7 @@ class TestMPWiKClientDataFetching(unittest.TestCase):
                 {"data": "2024-01-02", "wskazanie": 102.8, "zuzycie": 2.3}
             ]
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -347,6 +609,7 @@ class TestMPWiKClientDataFetching(unittest.TestCase):
                 {"data": "2024-01-01T01:00:00", "wskazanie": 100.1, "zuzycie": 0.1}
             ]
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -358,6 +621,183 @@ class TestMPWiKClientDataFetching(unittest.TestCase):
         self.assertIsNotNone(readings)
         self.assertEqual(len(readings), 2)
     
+    @patch('mpwik_direct.requests.Session.get')
+    def test_get_readings_batch(self, mock_get):
+        """Test fetching daily and hourly readings in one batch call."""
+        def respond(url, params=None, **kwargs):
+            mock_response = Mock()
+            mock_response.json.return_value = {"odczyty": [{"typ": url.rsplit('/', 1)[-1]}]}
+            mock_response.content = json.dumps(mock_response.json.return_value).encode()
+            mock_response.raise_for_status = Mock()
+            return mock_response
+        mock_get.side_effect = respond
+        
+        date_from = datetime(2024, 1, 1)
+        date_to = datetime(2024, 1, 7, 23, 59, 59)
+        results = self.client.get_readings_batch("12345", "0123-2021", [
+            ('daily', date_from, date_to),
+            ('hourly', date_to.replace(hour=0, minute=0, second=0), date_to),
+        ])
+        
+        # Requests run concurrently, but results keep the query order
+        self.assertEqual(results, [[{"typ": "dobowe"}], [{"typ": "godzinowe"}]])
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_identical_readings_requests_fetch_once(self, mock_get):
+        """Test that a repeated identical readings request reuses the recent result."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"odczyty": [{"id": 1}]}
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
+        mock_get.return_value = mock_response
+        date_from, date_to = datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59, 59)
+        
+        first = self.client.get_daily_readings("12345", "0123-2021", date_from, date_to)
+        second = self.client.get_daily_readings("12345", "0123-2021", date_from, date_to)
+        self.client.get_hourly_readings("12345", "0123-2021", date_from, date_to)
+        
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(mock_get.call_count, 2)
+        
+        self.client.invalidate_readings()
+        self.client.get_daily_readings("12345", "0123-2021", date_from, date_to)
+        self.assertEqual(mock_get.call_count, 3)
+    
+    def test_cached_readings_not_shared_between_callers(self):
+        """Test that changing returned readings does not affect the cache or other callers."""
+        key = ('dobowe', "12345", "0123-2021")
+        first = self.client._fetch_readings_coalesced(key, lambda: [{"id": 1}])
+        first[0]["id"] = 99
+        second = self.client._fetch_readings_coalesced(key, lambda: [{"id": 2}])
+        
+        self.assertEqual(second, [{"id": 1}])
+        second[0]["id"] = 42
+        self.assertEqual(self.client._fetch_readings_coalesced(key, lambda: []), [{"id": 1}])
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_restore_session_drops_cached_readings(self, mock_get):
+        """Test that a new session does not see readings cached for the previous one."""
+        mock_get.return_value = Mock(status_code=200)
+        key = ('dobowe', "12345", "0123-2021")
+        self.client._fetch_readings_coalesced(key, lambda: [{"id": 1}])
+        
+        self.client.restore_session(self.client.export_session())
+        
+        self.assertEqual(self.client._fetch_readings_coalesced(key, lambda: [{"id": 2}]), [{"id": 2}])
+    
+    def test_concurrent_identical_readings_share_fetch(self):
+        """Test that a request already in flight is joined instead of sent again."""
+        import threading
+        started, release = threading.Event(), threading.Event()
+        fetch = Mock()
+        
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            fetch()
+            return [{"id": 1}]
+        
+        key = ('dobowe', "12345", "0123-2021")
+        results = []
+        first = threading.Thread(target=lambda: results.append(self.client._fetch_readings_coalesced(key, slow_fetch)))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=lambda: results.append(self.client._fetch_readings_coalesced(key, slow_fetch)))
+        second.start()
+        release.set()
+        first.join(5)
+        second.join(5)
+        
+        self.assertEqual(results, [[{"id": 1}], [{"id": 1}]])
+        fetch.assert_called_once()
+    
+    def test_http2_requires_httpx(self):
+        """Test that asking for HTTP/2 without httpx installed fails early."""
+        with patch('mpwik_direct.httpx', None):
+            with self.assertRaises(ImportError):
+                MPWiKClient(login="test_login", password="test_password", http2=True)
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_http2_readings(self, mock_get):
+        """Test that readings go through the HTTP/2 client with the session's cookies."""
+        with patch('mpwik_direct.httpx') as mock_httpx:
+            client = MPWiKClient(login="test_login", password="test_password", http2=True)
+            http2_client = mock_httpx.Client.return_value
+            http2_client.get.return_value.content = json.dumps({"odczyty": [{"id": 1}]}).encode()
+            http2_client.get.return_value.json.return_value = {"odczyty": [{"id": 1}]}
+            
+            readings = client.get_daily_readings(
+                "12345", "0123-2021", datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59, 59)
+            )
+        
+        self.assertEqual(readings, [{"id": 1}])
+        mock_get.assert_not_called()
+        self.assertIs(mock_httpx.Client.call_args[1]['cookies'], client.session.cookies)
+        self.assertEqual(http2_client.get.call_args[1]['params']['dataOd'], '2024-01-01T00:00:00')
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_get_readings_bulk(self, mock_get):
+        """Test fetching the same range for several meters concurrently."""
+        def respond(url, params=None, **kwargs):
+            mock_response = Mock()
+            mock_response.json.return_value = {"odczyty": [{"punkt": url.split('/')[-3]}]}
+            mock_response.content = json.dumps(mock_response.json.return_value).encode()
+            mock_response.raise_for_status = Mock()
+            return mock_response
+        mock_get.side_effect = respond
+        
+        results = self.client.get_readings_bulk(
+            "12345", ["0123-2021", "0456-2022"], 'daily',
+            datetime(2024, 1, 1), datetime(2024, 1, 7, 23, 59, 59)
+        )
+        
+        self.assertEqual(results, {
+            "0123-2021": [{"punkt": "0123-2021"}],
+            "0456-2022": [{"punkt": "0456-2022"}],
+        })
+        self.assertEqual(mock_get.call_count, 2)
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_restore_session_valid(self, mock_get):
+        """Test restoring an exported session into a new client."""
+        self.client.csrf_token = "test_csrf"
+        self.client.session.cookies.set("SESSION", "cookie_value")
+        state = self.client.export_session()
+        mock_get.return_value = Mock(status_code=200)
+        
+        restored = MPWiKClient(login="test_login", password="test_password")
+        
+        self.assertTrue(restored.restore_session(state))
+        self.assertEqual(restored.token, "test_auth_token")
+        self.assertEqual(restored.csrf_token, "test_csrf")
+        self.assertEqual(restored.session.headers['Authorization'], 'Bearer test_auth_token')
+        self.assertEqual(restored.session.cookies.get("SESSION"), "cookie_value")
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_restore_session_probes_given_podmiot(self, mock_get):
+        """Test that the session probe queries the podmiot that will be used."""
+        mock_get.return_value = Mock(status_code=200)
+        
+        restored = MPWiKClient(login="test_login", password="test_password")
+        
+        self.assertTrue(restored.restore_session(self.client.export_session(), "other_podmiot"))
+        self.assertEqual(
+            mock_get.call_args[0][0],
+            f"{MPWiKClient.BASE_URL}/podmioty/other_podmiot/punkty-sieci"
+        )
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_restore_session_expired(self, mock_get):
+        """Test that a rejected session leaves the client unauthenticated."""
+        mock_get.return_value = Mock(status_code=401)
+        
+        restored = MPWiKClient(login="test_login", password="test_password")
+        
+        self.assertFalse(restored.restore_session(self.client.export_session()))
+        self.assertIsNone(restored.token)
+        self.assertNotIn('Authorization', restored.session.headers)
+    
     @patch('mpwik_direct.requests.Session.get')
     def test_get_punkty_sieci_success(self, mock_get):
         """Test successful network points fetch."""
@@ -373,6 +813,7 @@ class TestMPWiKClientDataFetching(unittest.TestCase):
                 }
             ]
         }
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
         mock_response.raise_for_status = Mock()
         mock_get.return_value = mock_response
         
@@ -398,6 +839,25 @@ class TestMPWiKClientDataFetching(unittest.TestCase):
         call_args = mock_get.call_args
         self.assertIn('params', call_args[1])
         self.assertEqual(call_args[1]['params']['status'], "NIEAKTYWNE")
+    
+    @patch('mpwik_direct.requests.Session.get')
+    def test_get_punkty_sieci_cached(self, mock_get):
+        """Test that network points are cached until invalidated."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"punkty": [{"numer": "0123/2021"}]}
+        mock_response.content = json.dumps(mock_response.json.return_value).encode()
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+        
+        first = self.client.get_punkty_sieci("123")
+        second = self.client.get_punkty_sieci("123")
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 1)
+        
+        self.client.invalidate_points()
+        self.client.get_punkty_sieci("123")
+        self.assertEqual(mock_get.call_count, 2)
 
 
 class TestMPWiKClientLogging(unittest.TestCase):
@@ -458,6 +918,7 @@ class TestMPWiKClientLogging(unittest.TestCase):
                 None,
                 mock_response
             )
+            client.flush_logs()
             
             # Check that log file was created
             log_dir = Path(tmpdir) / "requests"
@@ -502,6 +963,7 @@ class TestMPWiKClientLogging(unittest.TestCase):
                 payload,
                 mock_response
             )
+            client.flush_logs()
             
             # Check that password was sanitized
             log_dir = Path(tmpdir) / "requests"
@@ -511,7 +973,89 @@ class TestMPWiKClientLogging(unittest.TestCase):
                 log_data = json.load(f)
                 self.assertEqual(log_data['payload']['password'], '***')
                 self.assertNotEqual(log_data['payload']['password'], 'secret_password')
+    
+    def test_save_request_log_leaves_payload_untouched(self):
+        """Test that masking the logged password does not change the caller's payload."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKClient(login="test", password="secret_password", debug=True, log_dir=tmpdir)
+            
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {}
+            mock_response.headers = {}
+            mock_response.elapsed.total_seconds.return_value = 0.5
+            mock_response.reason = "OK"
+            
+            payload = {"login": "test", "password": "secret_password"}
+            client._save_request_log("login", "https://test.com/login", "POST", {}, payload, mock_response)
+            client.flush_logs()
+            
+            self.assertEqual(payload, {"login": "test", "password": "secret_password"})
+            log_file = next((Path(tmpdir) / "requests").glob("*.json"))
+            with open(log_file, 'r') as f:
+                self.assertEqual(json.load(f)['payload'], {"login": "test", "password": "***"})
+    
+    def test_save_request_log_masks_sensitive_headers(self):
+        """Test that cookies and tokens in request headers are masked in logs."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client = MPWiKClient(login="test", password="test", debug=True, log_dir=tmpdir)
+            
+            mock_response = Mock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {}
+            mock_response.headers = {}
+            mock_response.elapsed.total_seconds.return_value = 0.5
+            mock_response.reason = "OK"
+            
+            headers = {
+                "Cookie": "SESSION=live_session",
+                "X-RECAPTCHA-TOKEN": "captcha_token",
+                "Origin": "https://ebok.mpwik.wroc.pl",
+            }
+            client._save_request_log("login", "https://test.com/login", "POST", headers, None, mock_response)
+            client.flush_logs()
+            
+            log_file = next((Path(tmpdir) / "requests").glob("*.json"))
+            with open(log_file, 'r') as f:
+                logged = json.load(f)['headers']
+            self.assertEqual(logged["Cookie"], "***")
+            self.assertEqual(logged["X-RECAPTCHA-TOKEN"], "***")
+            self.assertEqual(logged["Origin"], "https://ebok.mpwik.wroc.pl")
 
+    
+    def test_close_releases_resources(self):
+        """Test that close() flushes logs and closes the loop and sessions."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with MPWiKClient(login="test", password="test", debug=True, log_dir=tmpdir) as client:
+                client._loop = asyncio.new_event_loop()
+                loop = client._loop
+                log_executor = client._log_executor
+                with patch.object(client.session, 'close') as mock_session_close, \
+                        patch.object(client._capmonster_session, 'close') as mock_capmonster_close:
+                    client.close()
+            
+            self.assertTrue(loop.is_closed())
+            self.assertIsNone(client._log_executor)
+            with self.assertRaises(RuntimeError):
+                log_executor.submit(lambda: None)
+            mock_session_close.assert_called_once_with()
+            mock_capmonster_close.assert_called_once_with()
+    
+    def test_close_closes_capmonster_client_before_loop(self):
+        """Test that the CapMonster client is closed on its loop before the loop is closed."""
+        client = MPWiKClient(login="test", password="test")
+        loop = client._loop = asyncio.new_event_loop()
+        closed_on_open_loop = []
+        
+        async def close_capmonster():
+            closed_on_open_loop.append(asyncio.get_running_loop() is loop)
+        
+        client._capmonster_client = Mock(close=close_capmonster)
+        client.close()
+        
+        self.assertEqual(closed_on_open_loop, [True])
+        self.assertTrue(loop.is_closed())
+        self.assertIsNone(client._capmonster_client)
 
 class TestMPWiKClientPrintMethods(unittest.TestCase):
     """Test print/display methods."""
@@ -567,8 +1111,38 @@ class TestMPWiKClientPrintMethods(unittest.TestCase):
         
         self.client.print_readings(readings, "daily")
         
-        # Verify print was called multiple times
-        self.assertGreater(mock_print.call_count, 5)
+        # Verify the whole table, one row per reading, is printed in one call
+        mock_print.assert_called_once()
+        output = mock_print.call_args[0][0]
+        self.assertIn("DAILY WATER CONSUMPTION READINGS", output)
+        self.assertIn("2024-01-01", output)
+        self.assertIn("2024-01-02", output)
+
+    @patch('builtins.print')
+    def test_print_helpers_need_no_client(self, mock_print):
+        """Test that the print helpers can be called on the class without credentials."""
+        MPWiKClient.print_readings([{"data": "2024-01-01", "zuzycie": 1.0}], "hourly")
+        MPWiKClient.print_punkty_sieci([{"id_punktu": "123"}])
+        
+        self.assertIn("HOURLY WATER CONSUMPTION READINGS", mock_print.call_args_list[0][0][0])
+        self.assertEqual(mock_print.call_count, 2)
+    
+    def test_print_readings_total_usage(self):
+        """Test that the total usage line sums all readings."""
+        import io
+        from contextlib import redirect_stdout
+        
+        readings = [
+            {"data": "2024-01-01", "licznik": "0123/2021", "wskazanie": 100.5, "zuzycie": 1.25, "typ": "DAILY"},
+            {"data": "2024-01-02", "licznik": "0123/2021", "wskazanie": 101.75, "zuzycie": 2.5, "typ": "DAILY"},
+            {"data": "2024-01-03", "licznik": "0123/2021", "wskazanie": 101.75, "typ": "DAILY"}
+        ]
+        
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.client.print_readings(readings, "daily")
+        
+        self.assertIn("Total usage: 3.750 m³", output.getvalue())
 
 
 class TestMPWiKClientAttemptLogin(unittest.TestCase):
@@ -623,6 +1197,30 @@ class TestMPWiKClientAttemptLogin(unittest.TestCase):
         self.assertNotIn('X-CSRF-TOKEN', headers)
 
 
+class TestMPWiKClientPagePatterns(unittest.TestCase):
+    """Test the precompiled login page patterns."""
+    
+    def test_csrf_prefers_earlier_pattern(self):
+        """Test that an earlier listed pattern wins even when it appears later in the page."""
+        html = (
+            "<script>var cfg = {csrf: 'from-script'};</script>"
+            '<meta name="csrf-token" content="from-token-meta">'
+            '<meta name="csrf" content="from-csrf-meta">'
+        )
+        
+        self.assertEqual(_search_preferred(CSRF_PATTERN, html), ("from-csrf-meta", 1))
+    
+    def test_sitekey_rank_reported(self):
+        """Test that the matching alternative is reported as a 1-based rank."""
+        html = "grecaptcha.execute('key-exec'); <div data-sitekey=\"key-attr\"></div>"
+        
+        self.assertEqual(_search_preferred(SITEKEY_PATTERN, html), ("key-attr", 2))
+    
+    def test_no_match(self):
+        """Test that a page without any candidate yields no value and no rank."""
+        self.assertEqual(_search_preferred(CSRF_PATTERN, "<html></html>"), (None, None))
+
+
 def main():
     """Run all tests."""
     # Create test suite
@@ -637,6 +1235,7 @@ def main():
     suite.addTests(loader.loadTestsFromTestCase(TestMPWiKClientLogging))
     suite.addTests(loader.loadTestsFromTestCase(TestMPWiKClientPrintMethods))
     suite.addTests(loader.loadTestsFromTestCase(TestMPWiKClientAttemptLogin))
+    suite.addTests(loader.loadTestsFromTestCase(TestMPWiKClientPagePatterns))
     
     # Run tests with verbose output
     runner = unittest.TextTestRunner(verbosity=2)
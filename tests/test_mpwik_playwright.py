@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Tests for MPWikPlaywrightClient (Playwright browser automation mode)
+Tests the client with a mocked browser context; playwright.sync_api is stubbed
+when Playwright is not installed
+"""
+
+import unittest
+from unittest.mock import Mock, MagicMock, patch
+from datetime import datetime
+import json
+import os
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+try:
+    import playwright.sync_api  # noqa: F401
+except ImportError:
+    _sync_api = types.ModuleType('playwright.sync_api')
+    _sync_api.sync_playwright = Mock()
+    _sync_api.Browser = _sync_api.BrowserContext = _sync_api.Page = object
+    _sync_api.TimeoutError = type('TimeoutError', (Exception,), {})
+    _playwright = types.ModuleType('playwright')
+    _playwright.sync_api = _sync_api
+    sys.modules.setdefault('playwright', _playwright)
+    sys.modules.setdefault('playwright.sync_api', _sync_api)
+
+import mpwik_playwright
+from mpwik_playwright import MPWikPlaywrightClient
+
+
+def make_response(status, body=None, headers=None):
+    """Build a mocked APIResponse."""
+    response = Mock()
+    response.status = status
+    response.ok = 200 <= status < 300
+    response.headers = headers or {}
+    response.json.return_value = body if body is not None else {}
+    return response
+
+
+class TestSharedBrowser(unittest.TestCase):
+    """Test the process-wide shared browser."""
+    
+    @patch('mpwik_playwright.atexit.register')
+    @patch('mpwik_playwright.sync_playwright')
+    def test_browser_launched_once(self, mock_sync_playwright, mock_register):
+        """Test that clients reuse one connected browser per (type, headless)."""
+        driver = mock_sync_playwright.return_value.start.return_value
+        driver.chromium.launch.return_value.is_connected.return_value = True
+        
+        with patch.dict(mpwik_playwright._shared_browsers, clear=True), \
+                patch.object(mpwik_playwright, '_shared_playwright', None):
+            first = mpwik_playwright._get_browser('chromium', True)
+            second = mpwik_playwright._get_browser('chromium', True)
+        
+        self.assertIs(first, second)
+        driver.chromium.launch.assert_called_once_with(headless=True)
+        mock_sync_playwright.return_value.start.assert_called_once_with()
+        mock_register.assert_called_once_with(mpwik_playwright._close_shared_browsers)
+    
+    @patch('mpwik_playwright.atexit.register')
+    @patch('mpwik_playwright.sync_playwright')
+    def test_disconnected_browser_relaunched(self, mock_sync_playwright, mock_register):
+        """Test that a shared browser that lost its connection is replaced."""
+        driver = mock_sync_playwright.return_value.start.return_value
+        dead, alive = Mock(), Mock()
+        dead.is_connected.return_value = False
+        alive.is_connected.return_value = True
+        driver.chromium.launch.side_effect = [dead, alive]
+        
+        with patch.dict(mpwik_playwright._shared_browsers, clear=True), \
+                patch.object(mpwik_playwright, '_shared_playwright', None):
+            first = mpwik_playwright._get_browser('chromium', True)
+            second = mpwik_playwright._get_browser('chromium', True)
+        
+        self.assertIs(first, dead)
+        self.assertIs(second, alive)
+        self.assertEqual(driver.chromium.launch.call_count, 2)
+        mock_sync_playwright.return_value.start.assert_called_once_with()
+    
+    @patch('mpwik_playwright._get_browser')
+    def test_exit_keeps_shared_browser(self, mock_get_browser):
+        """Test that leaving the client closes its page and context but not the browser."""
+        browser = mock_get_browser.return_value
+        context = browser.new_context.return_value
+        page = context.new_page.return_value
+        page.is_closed.return_value = False
+        
+        with MPWikPlaywrightClient(login="test", password="test") as client:
+            client._get_api_page()
+        
+        page.close.assert_called_once_with()
+        context.close.assert_called_once_with()
+        browser.close.assert_not_called()
+        self.assertIsNone(client.context)
+        self.assertIsNone(client.browser)
+
+
+class TestFetchApiData(unittest.TestCase):
+    """Test API calls through the browser context."""
+    
+    def setUp(self):
+        """Set up a client with a mocked browser context."""
+        self.client = MPWikPlaywrightClient(login="test", password="test")
+        self.client.context = Mock()
+        self.request = self.client.context.request
+    
+    @patch('mpwik_playwright.time.sleep')
+    def test_retries_after_rate_limit(self, mock_sleep):
+        """Test that a 429 is retried after the server's Retry-After."""
+        self.request.get.side_effect = [
+            make_response(429, headers={'retry-after': '2'}),
+            make_response(200, {"punkty": []}),
+        ]
+        
+        result = self.client._fetch_api_data("https://example.com/api", {"a": "1"})
+        
+        self.assertEqual(result, {"punkty": []})
+        mock_sleep.assert_called_once_with(2.0)
+        self.assertEqual(self.request.get.call_count, 2)
+        self.assertEqual(self.request.get.call_args[1]['params'], {"a": "1"})
+    
+    @patch('mpwik_playwright.time.sleep')
+    def test_gives_up_after_max_retries(self, mock_sleep):
+        """Test that a persistently unavailable API raises after the last retry."""
+        self.request.get.return_value = make_response(503)
+        
+        with self.assertRaises(ConnectionError):
+            self.client._fetch_api_data("https://example.com/api")
+        
+        self.assertEqual(self.request.get.call_count, mpwik_playwright.FETCH_MAX_RETRIES + 1)
+        self.assertEqual(mock_sleep.call_count, mpwik_playwright.FETCH_MAX_RETRIES)
+    
+    def test_retry_delay_capped(self):
+        """Test that Retry-After is capped and junk falls back to backoff."""
+        self.assertEqual(mpwik_playwright._retry_delay_seconds("3600", 0), mpwik_playwright.FETCH_MAX_RETRY_DELAY_MS / 1000)
+        self.assertGreaterEqual(mpwik_playwright._retry_delay_seconds("soon", 1), 2.0)
+    
+    def test_retry_delay_http_date(self):
+        """Test that an HTTP-date Retry-After waits until that time, and past dates not at all."""
+        from email.utils import format_datetime
+        from datetime import timedelta, timezone
+        
+        soon = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+        
+        self.assertAlmostEqual(mpwik_playwright._retry_delay_seconds(soon, 0), 20, delta=2)
+        self.assertEqual(mpwik_playwright._retry_delay_seconds("Wed, 21 Oct 2015 07:28:00 GMT", 0), 0.0)
+        self.assertEqual(mpwik_playwright._retry_delay_seconds("Wed, 21 Oct 2015 07:28:00 -0000", 0), 0.0)
+
+
+class TestPointsAndReadings(unittest.TestCase):
+    """Test the single-request points and readings calls."""
+    
+    def setUp(self):
+        """Set up a logged-in client with a mocked browser context."""
+        self.client = MPWikPlaywrightClient(login="test", password="test")
+        self.client.context = Mock()
+        self.client._podmiot_id = "test"
+        self.request = self.client.context.request
+    
+    def test_readings_sent_as_query_params(self):
+        """Test that readings go through the request context with the range as params."""
+        self.request.get.return_value = make_response(200, {"odczyty": [{"wskazanie": 1}]})
+        
+        readings = self.client.get_readings("0123/2021", 'dobowe', datetime(2024, 1, 1), datetime(2024, 1, 7))
+        
+        self.assertEqual(readings, [{"wskazanie": 1}])
+        url = self.request.get.call_args[0][0]
+        self.assertEqual(url, f"{mpwik_playwright.API_BASE_URL}/podmioty/test/punkty-sieci/0123-2021/odczyty/dobowe")
+        self.assertEqual(self.request.get.call_args[1]['params'], {
+            'dataOd': "2024-01-01T00:00:00",
+            'dataDo': "2024-01-07T00:00:00",
+        })
+        self.client.context.new_page.assert_not_called()
+    
+    @patch('mpwik_playwright.time.monotonic')
+    def test_points_cached_until_invalidated(self, mock_monotonic):
+        """Test that points are reused within the TTL and refetched after invalidation."""
+        mock_monotonic.return_value = 1000.0
+        self.request.get.return_value = make_response(200, {"punkty": [{"numer": "0123/2021"}]})
+        
+        first = self.client.get_points()
+        mock_monotonic.return_value = 1000.0 + mpwik_playwright.POINTS_CACHE_TTL - 1
+        second = self.client.get_points()
+        self.assertEqual(self.request.get.call_count, 1)
+        
+        self.client.invalidate_points()
+        third = self.client.get_points()
+        
+        self.assertEqual(self.request.get.call_count, 2)
+        self.assertEqual(first, second)
+        self.assertEqual(third, [{"numer": "0123/2021"}])
+    
+    @patch('mpwik_playwright.time.monotonic')
+    def test_points_refetched_after_ttl(self, mock_monotonic):
+        """Test that cached points expire after the TTL."""
+        mock_monotonic.return_value = 1000.0
+        self.request.get.return_value = make_response(200, {"punkty": []})
+        
+        self.client.get_points()
+        mock_monotonic.return_value = 1000.0 + mpwik_playwright.POINTS_CACHE_TTL
+        self.client.get_points()
+        
+        self.assertEqual(self.request.get.call_count, 2)
+
+
+class TestSessionState(unittest.TestCase):
+    """Test saving and restoring the browser storage state."""
+    
+    def test_save_state_private_file(self):
+        """Test that the storage state is written readable only by the user."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "cache" / "state.json"
+            client = MPWikPlaywrightClient(login="test", password="test", state_path=path)
+            client.context = Mock()
+            client.context.storage_state.return_value = {"cookies": [{"name": "SESSION"}]}
+            
+            client.save_state()
+            
+            self.assertEqual(json.loads(path.read_text()), {"cookies": [{"name": "SESSION"}]})
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+    
+    @patch('mpwik_playwright._get_browser')
+    def test_restored_state_skips_login(self, mock_get_browser):
+        """Test that a saved state accepted by the API skips the login form."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            path.write_text("{}")
+            browser = mock_get_browser.return_value
+            context = browser.new_context.return_value
+            context.request.get.return_value = make_response(200, {"punkty": [{"numer": "0123/2021"}]})
+            
+            with MPWikPlaywrightClient(login="test", password="test", state_path=path) as client:
+                client.login_and_establish_session()
+                points = client.get_points()
+            
+            browser.new_context.assert_called_once_with(storage_state=path)
+            context.new_page.assert_not_called()
+            context.request.get.assert_called_once()
+            self.assertEqual(points, [{"numer": "0123/2021"}])
+            context.close.assert_called_once_with()
+    
+    @patch('mpwik_playwright._get_browser')
+    def test_rejected_state_probe(self, mock_get_browser):
+        """Test that a rejected saved session is reported as invalid."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "state.json"
+            path.write_text("{}")
+            context = mock_get_browser.return_value.new_context.return_value
+            context.request.get.return_value = make_response(401)
+            
+            with MPWikPlaywrightClient(login="test", password="test", state_path=path) as client:
+                self.assertFalse(client._probe_session())
+                self.assertEqual(client._points_cache, {})
+
+
+class TestLogin(unittest.TestCase):
+    """Test the login and session establishment flow."""
+    
+    def setUp(self):
+        """Set up a client whose page reaches the portal after submitting the form."""
+        self.client = MPWikPlaywrightClient(login="test", password="test")
+        self.client.context = Mock()
+        self.page = self.client.context.new_page.return_value
+        self.page.is_closed.return_value = False
+        self.response_wait = MagicMock()
+        self.page.expect_response.return_value = self.response_wait
+    
+    @patch.object(MPWikPlaywrightClient, 'save_state')
+    def test_missing_api_response_tolerated(self, mock_save_state):
+        """Test that a page that loads without the expected API call still logs in."""
+        self.response_wait.__exit__.side_effect = mpwik_playwright.PlaywrightTimeoutError("no response")
+        
+        self.client.login_and_establish_session()
+        
+        self.assertEqual(self.client._podmiot_id, "test")
+        mock_save_state.assert_called_once_with()
+    
+    @patch.object(MPWikPlaywrightClient, 'save_state')
+    def test_consumption_page_timeout_raises(self, mock_save_state):
+        """Test that a timeout loading the consumption page fails the login."""
+        self.page.goto.side_effect = [None, mpwik_playwright.PlaywrightTimeoutError("navigation")]
+        
+        with self.assertRaises(ConnectionError):
+            self.client.login_and_establish_session()
+        
+        mock_save_state.assert_not_called()
+
+
+class TestReadingsBatch(unittest.TestCase):
+    """Test fetching several reading ranges in one browser round trip."""
+    
+    def setUp(self):
+        """Set up a logged-in client with a mocked session page."""
+        self.client = MPWikPlaywrightClient(login="test", password="test")
+        self.client.context = Mock()
+        self.client._podmiot_id = "test"
+        self.page = self.client.context.new_page.return_value
+        self.page.is_closed.return_value = False
+        self.page.url = mpwik_playwright.BASE_URL + "/"
+    
+    def test_batch_fans_out_in_one_evaluate(self):
+        """Test that every query becomes one URL of a single evaluate call."""
+        self.page.evaluate.return_value = [{"odczyty": [1]}, {"odczyty": [2]}]
+        queries = [
+            ('dobowe', datetime(2024, 1, 1), datetime(2024, 1, 7)),
+            ('godzinowe', datetime(2024, 1, 6), datetime(2024, 1, 7)),
+        ]
+        
+        result = self.client.get_readings_batch("0123/2021", queries)
+        
+        self.assertEqual(result, [[1], [2]])
+        self.page.evaluate.assert_called_once()
+        script, args = self.page.evaluate.call_args[0]
+        self.assertEqual(script, mpwik_playwright.CALL_FETCH_MANY_JS)
+        self.assertEqual(args['urls'], [
+            f"{mpwik_playwright.API_BASE_URL}/podmioty/test/punkty-sieci/0123-2021/odczyty/dobowe"
+            "?dataOd=2024-01-01T00:00:00&dataDo=2024-01-07T00:00:00",
+            f"{mpwik_playwright.API_BASE_URL}/podmioty/test/punkty-sieci/0123-2021/odczyty/godzinowe"
+            "?dataOd=2024-01-06T00:00:00&dataDo=2024-01-07T00:00:00",
+        ])
+        self.page.goto.assert_not_called()
+    
+    def test_batch_sends_full_script_without_helper(self):
+        """Test the fallback to the full fetch script when the page lacks the helper."""
+        self.page.evaluate.side_effect = [None, [{"odczyty": []}]]
+        
+        result = self.client.get_readings_batch(
+            "0123/2021", [('dobowe', datetime(2024, 1, 1), datetime(2024, 1, 7))]
+        )
+        
+        self.assertEqual(result, [[]])
+        self.assertEqual(self.page.evaluate.call_args[0][0], mpwik_playwright.FETCH_MANY_JS)
+    
+    def test_batch_requires_login(self):
+        """Test that batch fetches need an established session."""
+        self.client._podmiot_id = None
+        
+        with self.assertRaises(ValueError):
+            self.client.get_readings_batch("0123/2021", [])
+
+
+if __name__ == '__main__':
+    unittest.main()